@@ -1,13 +1,34 @@
 """Core Synchron AI Hub primitives."""
 
+from .agent_index import AgentIndex
 from .context_manager import ContextManager
-from .hub_router import HubRouter
-from .metrics_collector import MetricsCollector
+from .hub_router import AgentUnavailableError, HubRouter
+from .hub_worker import HubWorker
+from .local_cache import LocalCache
+from .metrics_collector import CachedExposition, MetricsCollector
+from .metrics_multiprocess import (
+    cleanup_dead_workers,
+    mark_worker_dead,
+    multiprocess_dir,
+    multiprocess_registry,
+)
 from .registry_client import RegistryClient
+from .single_flight import SingleFlight, should_refresh_early
 
 __all__ = [
+    "AgentIndex",
+    "AgentUnavailableError",
+    "CachedExposition",
     "ContextManager",
     "HubRouter",
+    "HubWorker",
+    "LocalCache",
     "MetricsCollector",
     "RegistryClient",
+    "SingleFlight",
+    "cleanup_dead_workers",
+    "mark_worker_dead",
+    "multiprocess_dir",
+    "multiprocess_registry",
+    "should_refresh_early",
 ]
@@ -0,0 +1,95 @@
+"""Inverted index over registered agents for capability and channel routing."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+
+# Ordered sets: dict keys keep registration order, so lookups are deterministic.
+_Names = Dict[str, None]
+
+
+class AgentIndex:
+    """Agents of one registry map keyed by capability name, channel and tenant.
+
+    The index is an immutable snapshot built from a list of agents; rebuild it
+    whenever the list changes. Each single-key lookup is a dict access, and
+    :meth:`find` intersects the selected keys starting from the smallest set,
+    so routing cost does not grow with the number of registered agents.
+    Results keep the order in which agents were given.
+    """
+
+    def __init__(self, agents: Iterable[AgentSchema] = ()) -> None:
+        self._agents: Dict[str, AgentSchema] = {}
+        self._capabilities: Dict[str, _Names] = {}
+        self._channels: Dict[str, _Names] = {}
+        self._tenants: Dict[str, _Names] = {}
+        self._unrestricted: _Names = {}
+        self._position: Dict[str, int] = {}
+        for agent in agents:
+            if agent.name in self._agents:
+                continue
+            self._agents[agent.name] = agent
+            self._position[agent.name] = len(self._position)
+            for capability in agent.capabilities:
+                self._capabilities.setdefault(capability.name, {})[agent.name] = None
+            for channel in agent.supported_channels:
+                self._channels.setdefault(channel, {})[agent.name] = None
+            for tenant in agent.tenants:
+                self._tenants.setdefault(tenant, {})[agent.name] = None
+            if not agent.tenants:
+                self._unrestricted[agent.name] = None
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def by_capability(self, capability: str) -> List[AgentSchema]:
+        return self._resolve(self._capabilities.get(capability, {}))
+
+    def by_channel(self, channel: str) -> List[AgentSchema]:
+        return self._resolve(self._channels.get(channel, {}))
+
+    def by_tenant(self, tenant_id: str) -> List[AgentSchema]:
+        """Agents that list ``tenant_id`` in ``tenants``."""
+
+        return self._resolve(self._tenants.get(tenant_id, {}))
+
+    def find(
+        self,
+        *,
+        capability: Optional[str] = None,
+        channel: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+    ) -> List[AgentSchema]:
+        """Agents matching every given key; with no key, every agent.
+
+        ``tenant_id`` matches agents that list the tenant and agents with no
+        ``tenants`` restriction.
+        """
+
+        keyed: List[_Names] = []
+        if capability is not None:
+            keyed.append(self._capabilities.get(capability, {}))
+        if channel is not None:
+            keyed.append(self._channels.get(channel, {}))
+        tenant_names = self._tenants.get(tenant_id, {}) if tenant_id is not None else {}
+        if not keyed:
+            if tenant_id is None:
+                return list(self._agents.values())
+            merged = {**tenant_names, **self._unrestricted}
+            return self._resolve(sorted(merged, key=self._position.__getitem__))
+        # Every set is filled in agent order, so scanning the smallest keeps that order.
+        smallest = min(keyed, key=len)
+        others = [names for names in keyed if names is not smallest]
+        return self._resolve(
+            name
+            for name in smallest
+            if all(name in names for names in others)
+            and (
+                tenant_id is None or name in tenant_names or name in self._unrestricted
+            )
+        )
+
+    def _resolve(self, names: Iterable[str]) -> List[AgentSchema]:
+        return [self._agents[name] for name in names]
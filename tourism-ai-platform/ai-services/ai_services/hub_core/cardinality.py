@@ -0,0 +1,70 @@
+"""Bounds on the label values and series a metric may create."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+OTHER_LABEL = "other"
+
+
+class LabelGuard:
+    """Admit at most ``max_values`` distinct values for one label.
+
+    Allow-listed values always pass. Other values are admitted first come,
+    first served until the budget is spent, and fold into ``other`` after
+    that. Admitted values are never evicted, because a series that has
+    already been exported cannot be renamed.
+    """
+
+    def __init__(self, max_values: int, allow: Iterable[str] = ()) -> None:
+        self._max_values = max(0, max_values)
+        self._allow = frozenset(allow)
+        self._admitted: Set[str] = set()
+
+    def __call__(self, value: Optional[str]) -> str:
+        if value is None:
+            return OTHER_LABEL
+        if value in self._allow or value in self._admitted:
+            return value
+        if len(self._admitted) < self._max_values:
+            self._admitted.add(value)
+            return value
+        return OTHER_LABEL
+
+    @property
+    def admitted(self) -> int:
+        return len(self._admitted)
+
+
+class SeriesGuard:
+    """Cap the number of label combinations recorded for one metric.
+
+    Once ``max_series`` combinations exist, a new combination is folded by
+    replacing its ``foldable`` labels with ``other``; the folded combination
+    is always accepted, so the metric grows to at most ``max_series`` plus
+    the folded variants.
+    """
+
+    def __init__(self, max_series: int, foldable: Iterable[str]) -> None:
+        self._max_series = max(1, max_series)
+        self._foldable = tuple(foldable)
+        self._series: Set[Tuple[Tuple[str, str], ...]] = set()
+
+    def __call__(self, labels: Dict[str, str]) -> Tuple[Dict[str, str], bool]:
+        """Return the labels to record and whether they were folded."""
+
+        key = tuple(sorted(labels.items()))
+        if key in self._series:
+            return labels, False
+        if len(self._series) < self._max_series:
+            self._series.add(key)
+            return labels, False
+        folded = {
+            name: OTHER_LABEL if name in self._foldable else value
+            for name, value in labels.items()
+        }
+        self._series.add(tuple(sorted(folded.items())))
+        return folded, True
+
+    def __len__(self) -> int:
+        return len(self._series)
@@ -10,22 +10,116 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import uuid4
 
 from redis.asyncio import Redis
 
+from .local_cache import LocalCache
+from .metrics_collector import MetricsCollector
+
 logger = logging.getLogger(__name__)
 
+SESSION_STORAGE_JSON = "json"
+SESSION_STORAGE_HASH = "hash"
+
+# KEYS[1]=session hash; ARGV: field, JSON item, max items (0 = unbounded), ttl seconds.
+APPEND_FIELD_SCRIPT = """
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+local items = {}
+if raw then
+  local decoded = cjson.decode(raw)
+  if type(decoded) == 'table' then items = decoded else items = {decoded} end
+end
+table.insert(items, cjson.decode(ARGV[2]))
+local limit = tonumber(ARGV[3])
+while limit > 0 and #items > limit do table.remove(items, 1) end
+redis.call('HSET', KEYS[1], ARGV[1], cjson.encode(items))
+if tonumber(ARGV[4]) > 0 then redis.call('EXPIRE', KEYS[1], ARGV[4]) end
+return #items
+"""
+
+# KEYS[1]=session hash, KEYS[2]=JSON session document; ARGV: the document as
+# read, then field/value pairs. Moves a document written in JSON mode into the
+# hash unless the hash already exists; returns -1 if the document changed.
+MIGRATE_SESSION_SCRIPT = """
+local raw = redis.call('GET', KEYS[2])
+if not raw then return 0 end
+if raw ~= ARGV[1] then return -1 end
+if redis.call('EXISTS', KEYS[1]) == 0 and #ARGV > 1 then
+  redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+  local ttl = redis.call('PTTL', KEYS[2])
+  if ttl > 0 then redis.call('PEXPIRE', KEYS[1], ttl) end
+end
+redis.call('DEL', KEYS[2])
+return 1
+"""
+
+# KEYS[1]=stream, KEYS[2]=event index key; ARGV: max length (0 = unbounded),
+# JSON payload, index ttl seconds. The index keeps the first entry written for
+# an event id so re-publishes and correlated responses do not repoint it.
+APPEND_INDEXED_EVENT_SCRIPT = """
+local entry_id
+if tonumber(ARGV[1]) > 0 then
+  entry_id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[2])
+else
+  entry_id = redis.call('XADD', KEYS[1], '*', 'data', ARGV[2])
+end
+redis.call('SET', KEYS[2], KEYS[1] .. ' ' .. entry_id, 'EX', ARGV[3], 'NX')
+return entry_id
+"""
+
 
 class ContextManager:
-    """Handles tenant and session scoped context using Redis."""
+    """Handles tenant and session scoped context using Redis.
+
+    With ``local_cache_size > 0`` reads are served from an in-process LRU
+    (L1) in front of Redis (L2). Writes and deletes publish the affected key
+    on ``{namespace}:context:invalidate`` so every replica evicts it; the L1
+    TTL bounds staleness if an invalidation is missed.
 
-    def __init__(self, redis_url: str, namespace: str = "hub") -> None:
+    ``session_storage="hash"`` keeps each session as a Redis hash with one
+    JSON-encoded value per field, enabling field-level patches and atomic
+    increment/append helpers. ``session_sliding_ttl`` refreshes the session
+    TTL on every Redis read (EXPIRE/GETEX) instead of rewriting it.
+    Sessions still stored as JSON documents are read as before and moved
+    into the hash atomically on their first field-level write.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        namespace: str = "hub",
+        *,
+        local_cache_size: int = 0,
+        local_cache_ttl: float = 30.0,
+        metrics: Optional[MetricsCollector] = None,
+        session_storage: str = SESSION_STORAGE_JSON,
+        session_sliding_ttl: Optional[int] = None,
+        event_index_ttl: int = 86400,
+    ) -> None:
+        if session_storage not in (SESSION_STORAGE_JSON, SESSION_STORAGE_HASH):
+            raise ValueError(f"Unsupported session storage {session_storage!r}")
         self._redis_url = redis_url
         self._namespace = namespace.rstrip(":") or "hub"
         self._redis: Optional[Redis] = None
         self._lock = asyncio.Lock()
         self._default_ttl = 60 * 60 * 24
+        self._metrics = metrics
+        self._instance_id = uuid4().hex
+        self._local_cache: Optional[LocalCache[Dict[str, Any]]] = (
+            LocalCache(local_cache_size, local_cache_ttl)
+            if local_cache_size > 0
+            else None
+        )
+        self._invalidation_channel = f"{self._namespace}:context:invalidate"
+        self._invalidation_task: Optional[asyncio.Task[None]] = None
+        self._session_storage = session_storage
+        self._session_sliding_ttl = session_sliding_ttl
+        self._append_script: Any = None
+        self._migrate_script: Any = None
+        self._event_index_ttl = event_index_ttl
+        self._append_event_script: Any = None
 
     async def _get_client(self) -> Redis:
         if self._redis is None:
@@ -37,6 +131,10 @@ class ContextManager:
                         decode_responses=True,
                     )
                     logger.debug("ContextManager connected to %s", self._redis_url)
+        if self._local_cache is not None and self._invalidation_task is None:
+            self._invalidation_task = asyncio.create_task(
+                self._listen_for_invalidations(self._redis)  # type: ignore[arg-type]
+            )
         return self._redis  # type: ignore[return-value]
 
     async def connect(self) -> Redis:
@@ -45,20 +143,103 @@ class ContextManager:
         return await self._get_client()
 
     async def close(self) -> None:
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+            try:
+                await self._invalidation_task
+            except asyncio.CancelledError:
+                pass
+            self._invalidation_task = None
+        if self._local_cache is not None:
+            self._local_cache.clear()
         if self._redis:
             await self._redis.close()
             self._redis = None
 
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return L1 statistics (hit ratio, size); empty when the L1 tier is disabled."""
+
+        if self._local_cache is None:
+            return {}
+        return self._local_cache.stats()
+
     async def get_tenant_context(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        key = self._tenant_key(tenant_id)
+        cached, token = self._cache_lookup(key, "tenant")
+        if cached is not None:
+            return cached
         redis = await self._get_client()
-        payload = await redis.get(self._tenant_key(tenant_id))
+        payload = await redis.get(key)
         if not payload:
             return None
         try:
-            return json.loads(payload)
+            context = json.loads(payload)
         except json.JSONDecodeError:
             logger.warning("Invalid tenant context for %s", tenant_id)
             return None
+        self._cache_fill(key, context, token)
+        return context
+
+    async def get_tenant_contexts(
+        self, tenant_ids: Iterable[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Tenant contexts for ``tenant_ids`` from L1, then one ``MGET``; missing tenants are omitted."""
+
+        found: Dict[str, Dict[str, Any]] = {}
+        pending: List[Tuple[str, str, Optional[int]]] = []
+        for tenant_id in dict.fromkeys(tenant_ids):
+            key = self._tenant_key(tenant_id)
+            cached, token = self._cache_lookup(key, "tenant")
+            if cached is not None:
+                found[tenant_id] = cached
+            else:
+                pending.append((tenant_id, key, token))
+        if not pending:
+            return found
+        redis = await self._get_client()
+        payloads = await redis.mget([key for _, key, _ in pending])
+        for (tenant_id, key, token), payload in zip(pending, payloads):
+            if not payload:
+                continue
+            try:
+                context = json.loads(payload)
+            except json.JSONDecodeError:
+                logger.warning("Invalid tenant context for %s", tenant_id)
+                continue
+            self._cache_fill(key, context, token)
+            found[tenant_id] = context
+        return found
+
+    async def set_tenant_contexts(
+        self,
+        contexts: Dict[str, Dict[str, Any]],
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Write several tenant contexts (and one invalidation) in a single round-trip."""
+
+        if not contexts:
+            return
+        ttl = ttl or self._default_ttl
+        keys = {tenant_id: self._tenant_key(tenant_id) for tenant_id in contexts}
+        redis = await self._get_client()
+        pipeline = redis.pipeline(transaction=False)
+        for tenant_id, context in contexts.items():
+            pipeline.set(
+                keys[tenant_id], json.dumps(context, ensure_ascii=False), ex=ttl
+            )
+        if self._local_cache is not None:
+            for key in keys.values():
+                self._local_cache.invalidate(key)
+            pipeline.publish(
+                self._invalidation_channel,
+                json.dumps({"origin": self._instance_id, "keys": list(keys.values())}),
+            )
+        await pipeline.execute()
+        if self._local_cache is not None:
+            for tenant_id, context in contexts.items():
+                self._local_cache.put(
+                    keys[tenant_id], context, ttl=min(ttl, self._local_cache.ttl)
+                )
 
     async def set_tenant_context(
         self,
@@ -66,31 +247,38 @@ class ContextManager:
         context: Dict[str, Any],
         ttl: Optional[int] = None,
     ) -> None:
-        redis = await self._get_client()
         data = json.dumps(context, ensure_ascii=False)
         ttl = ttl or self._default_ttl
-        await redis.set(self._tenant_key(tenant_id), data, ex=ttl)
+        await self._write(self._tenant_key(tenant_id), data, ttl)
 
     async def delete_tenant_context(self, tenant_id: str) -> None:
-        redis = await self._get_client()
-        await redis.delete(self._tenant_key(tenant_id))
+        await self._delete(self._tenant_key(tenant_id))
 
     async def get_session_context(
         self,
         tenant_id: str,
         session_id: str,
     ) -> Optional[Dict[str, Any]]:
+        if self._session_storage == SESSION_STORAGE_HASH:
+            return await self._get_session_hash(tenant_id, session_id)
+        key = self._session_key(tenant_id, session_id)
+        cached, token = self._cache_lookup(key, "session")
+        if cached is not None:
+            return cached
         redis = await self._get_client()
-        payload = await redis.get(self._session_key(tenant_id, session_id))
+        if self._session_sliding_ttl:
+            payload = await redis.getex(key, ex=self._session_sliding_ttl)
+        else:
+            payload = await redis.get(key)
         if not payload:
             return None
         try:
-            return json.loads(payload)
+            context = json.loads(payload)
         except json.JSONDecodeError:
-            logger.warning(
-                "Invalid session context for %s/%s", tenant_id, session_id
-            )
+            logger.warning("Invalid session context for %s/%s", tenant_id, session_id)
             return None
+        self._cache_fill(key, context, token)
+        return context
 
     async def set_session_context(
         self,
@@ -99,14 +287,342 @@ class ContextManager:
         context: Dict[str, Any],
         ttl: Optional[int] = None,
     ) -> None:
-        redis = await self._get_client()
-        data = json.dumps(context, ensure_ascii=False)
+        """Replace the whole session document."""
+
         ttl = ttl or self._default_ttl
-        await redis.set(self._session_key(tenant_id, session_id), data, ex=ttl)
+        if self._session_storage != SESSION_STORAGE_HASH:
+            data = json.dumps(context, ensure_ascii=False)
+            await self._write(self._session_key(tenant_id, session_id), data, ttl)
+            return
+        key = self._session_hash_key(tenant_id, session_id)
+        fields = self._encode_fields(context)
+
+        def build(pipeline: Any) -> None:
+            pipeline.delete(key, self._session_key(tenant_id, session_id))
+            if fields:
+                pipeline.hset(key, mapping=fields)
+                pipeline.expire(key, ttl)
+
+        await self._write_pipeline(key, build)
+        if self._local_cache is not None and fields:
+            self._local_cache.put(
+                key, self._decode_fields(fields), ttl=min(ttl, self._local_cache.ttl)
+            )
+
+    async def patch_session_context(
+        self,
+        tenant_id: str,
+        session_id: str,
+        changes: Dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Merge ``changes`` into the session; ``None`` values remove the field.
+
+        In hash mode only the changed fields are written (HSET/HDEL), so
+        concurrent writers touching different fields do not overwrite each
+        other. In JSON mode this is a non-atomic read-modify-write.
+        """
+
+        if not changes:
+            return
+        ttl = self._session_write_ttl(ttl)
+        if self._session_storage != SESSION_STORAGE_HASH:
+            current = await self._read_session_document(tenant_id, session_id)
+            for field, value in changes.items():
+                if value is None:
+                    current.pop(field, None)
+                else:
+                    current[field] = value
+            await self.set_session_context(tenant_id, session_id, current, ttl=ttl)
+            return
+        await self._migrate_session_document(tenant_id, session_id)
+        key = self._session_hash_key(tenant_id, session_id)
+        updates = self._encode_fields(
+            {k: v for k, v in changes.items() if v is not None}
+        )
+        removals = [field for field, value in changes.items() if value is None]
+
+        def build(pipeline: Any) -> None:
+            if updates:
+                pipeline.hset(key, mapping=updates)
+            if removals:
+                pipeline.hdel(key, *removals)
+            pipeline.expire(key, ttl)
+
+        await self._write_pipeline(key, build)
+
+    async def increment_session_field(
+        self,
+        tenant_id: str,
+        session_id: str,
+        field: str,
+        amount: int | float = 1,
+        ttl: Optional[int] = None,
+    ) -> int | float:
+        """Atomically add ``amount`` to a numeric session field and return the new value."""
+
+        ttl = self._session_write_ttl(ttl)
+        if self._session_storage != SESSION_STORAGE_HASH:
+            current = await self._read_session_document(tenant_id, session_id)
+            value = (current.get(field) or 0) + amount
+            current[field] = value
+            await self.set_session_context(tenant_id, session_id, current, ttl=ttl)
+            return value
+        await self._migrate_session_document(tenant_id, session_id)
+        key = self._session_hash_key(tenant_id, session_id)
+
+        def build(pipeline: Any) -> None:
+            if isinstance(amount, float):
+                pipeline.hincrbyfloat(key, field, amount)
+            else:
+                pipeline.hincrby(key, field, amount)
+            pipeline.expire(key, ttl)
+
+        results = await self._write_pipeline(key, build)
+        value = results[0]
+        return float(value) if isinstance(amount, float) else int(value)
+
+    async def append_session_field(
+        self,
+        tenant_id: str,
+        session_id: str,
+        field: str,
+        item: Any,
+        *,
+        max_items: Optional[int] = None,
+        ttl: Optional[int] = None,
+    ) -> int:
+        """Atomically append ``item`` to a list field, keeping the last ``max_items``.
+
+        Returns the resulting list length.
+        """
+
+        ttl = self._session_write_ttl(ttl)
+        if self._session_storage != SESSION_STORAGE_HASH:
+            current = await self._read_session_document(tenant_id, session_id)
+            items = list(current.get(field) or [])
+            items.append(item)
+            if max_items:
+                items = items[-max_items:]
+            current[field] = items
+            await self.set_session_context(tenant_id, session_id, current, ttl=ttl)
+            return len(items)
+        await self._migrate_session_document(tenant_id, session_id)
+        key = self._session_hash_key(tenant_id, session_id)
+        redis = await self._get_client()
+        if self._append_script is None:
+            self._append_script = redis.register_script(APPEND_FIELD_SCRIPT)
+        pipeline = redis.pipeline(transaction=False)
+        await self._append_script(
+            keys=[key],
+            args=[field, json.dumps(item, ensure_ascii=False), max_items or 0, ttl],
+            client=pipeline,
+        )
+        self._queue_invalidation(pipeline, key)
+        results = await pipeline.execute()
+        return int(results[0])
+
+    async def touch_session_context(
+        self,
+        tenant_id: str,
+        session_id: str,
+        ttl: Optional[int] = None,
+    ) -> bool:
+        """Extend the session TTL without rewriting it. Returns ``False`` if it does not exist."""
+
+        if self._session_storage == SESSION_STORAGE_HASH:
+            await self._migrate_session_document(tenant_id, session_id)
+            key = self._session_hash_key(tenant_id, session_id)
+        else:
+            key = self._session_key(tenant_id, session_id)
+        redis = await self._get_client()
+        return bool(await redis.expire(key, self._session_write_ttl(ttl)))
 
     async def delete_session_context(self, tenant_id: str, session_id: str) -> None:
+        if self._session_storage == SESSION_STORAGE_HASH:
+            hash_key = self._session_hash_key(tenant_id, session_id)
+            legacy_key = self._session_key(tenant_id, session_id)
+            await self._write_pipeline(
+                hash_key, lambda pipeline: pipeline.delete(hash_key, legacy_key)
+            )
+            return
+        await self._delete(self._session_key(tenant_id, session_id))
+
+    async def _get_session_hash(
+        self, tenant_id: str, session_id: str
+    ) -> Optional[Dict[str, Any]]:
+        key = self._session_hash_key(tenant_id, session_id)
+        cached, token = self._cache_lookup(key, "session")
+        if cached is not None:
+            return cached
+        redis = await self._get_client()
+        pipeline = redis.pipeline(transaction=False)
+        pipeline.hgetall(key)
+        pipeline.get(self._session_key(tenant_id, session_id))
+        if self._session_sliding_ttl:
+            pipeline.expire(key, self._session_sliding_ttl)
+        fields, legacy = (await pipeline.execute())[:2]
+        if fields:
+            context = self._decode_fields(fields)
+        elif legacy:
+            # Sessions written before switching to hash storage.
+            try:
+                context = json.loads(legacy)
+            except json.JSONDecodeError:
+                logger.warning(
+                    "Invalid session context for %s/%s", tenant_id, session_id
+                )
+                return None
+        else:
+            return None
+        self._cache_fill(key, context, token)
+        return context
+
+    async def _migrate_session_document(self, tenant_id: str, session_id: str) -> None:
+        """Move a session written in JSON mode into its hash before a field write.
+
+        Without this the first field write would create the hash, and reads,
+        which prefer the hash, would no longer see the document's fields.
+        """
+
+        legacy_key = self._session_key(tenant_id, session_id)
+        redis = await self._get_client()
+        if self._migrate_script is None:
+            self._migrate_script = redis.register_script(MIGRATE_SESSION_SCRIPT)
+        while True:
+            raw = await redis.get(legacy_key)
+            if not raw:
+                return
+            try:
+                document = json.loads(raw)
+            except json.JSONDecodeError:
+                document = None
+            if not isinstance(document, dict):
+                logger.warning(
+                    "Dropping invalid session context for %s/%s", tenant_id, session_id
+                )
+                document = {}
+            fields = self._encode_fields(document)
+            migrated = await self._migrate_script(
+                keys=[self._session_hash_key(tenant_id, session_id), legacy_key],
+                args=[raw, *(item for pair in fields.items() for item in pair)],
+            )
+            if int(migrated) >= 0:
+                return
+
+    async def _read_session_document(
+        self, tenant_id: str, session_id: str
+    ) -> Dict[str, Any]:
+        current = await self.get_session_context(tenant_id, session_id)
+        return dict(current) if current else {}
+
+    def _session_write_ttl(self, ttl: Optional[int]) -> int:
+        return ttl or self._session_sliding_ttl or self._default_ttl
+
+    @staticmethod
+    def _encode_fields(context: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            field: json.dumps(value, ensure_ascii=False)
+            for field, value in context.items()
+        }
+
+    @staticmethod
+    def _decode_fields(fields: Dict[str, str]) -> Dict[str, Any]:
+        decoded: Dict[str, Any] = {}
+        for field, raw in fields.items():
+            try:
+                decoded[field] = json.loads(raw)
+            except json.JSONDecodeError:
+                decoded[field] = raw
+        return decoded
+
+    async def _write(self, key: str, data: str, ttl: int) -> None:
+        await self._write_pipeline(
+            key, lambda pipeline: pipeline.set(key, data, ex=ttl)
+        )
+        if self._local_cache is not None:
+            self._local_cache.put(
+                key, json.loads(data), ttl=min(ttl, self._local_cache.ttl)
+            )
+
+    async def _delete(self, key: str) -> None:
+        await self._write_pipeline(key, lambda pipeline: pipeline.delete(key))
+
+    async def _write_pipeline(self, key: str, build: Callable[[Any], Any]) -> List[Any]:
+        """Run the commands queued by ``build`` in one round-trip, invalidating ``key``."""
+
         redis = await self._get_client()
-        await redis.delete(self._session_key(tenant_id, session_id))
+        pipeline = redis.pipeline(transaction=False)
+        build(pipeline)
+        self._queue_invalidation(pipeline, key)
+        return await pipeline.execute()
+
+    def _queue_invalidation(self, pipeline: Any, key: str) -> None:
+        if self._local_cache is None:
+            return
+        self._local_cache.invalidate(key)
+        pipeline.publish(self._invalidation_channel, self._invalidation_message(key))
+
+    def _cache_lookup(
+        self, key: str, scope: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        if self._local_cache is None:
+            return None, None
+        cached = self._local_cache.get(key)
+        self._record_cache(scope, "hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached, None
+        return None, self._local_cache.fill_token()
+
+    def _cache_fill(
+        self, key: str, value: Dict[str, Any], token: Optional[int]
+    ) -> None:
+        if self._local_cache is not None:
+            self._local_cache.put(key, value, token=token)
+
+    def _record_cache(self, scope: str, result: str) -> None:
+        if self._metrics is not None:
+            self._metrics.context_cache_requests_total.labels(
+                scope=scope, result=result
+            ).inc()
+
+    def _invalidation_message(self, key: str) -> str:
+        return json.dumps({"origin": self._instance_id, "keys": [key]})
+
+    def _apply_invalidation(self, raw: Any) -> None:
+        if self._local_cache is None:
+            return
+        try:
+            message = json.loads(raw)
+        except (TypeError, json.JSONDecodeError):
+            logger.debug("Ignoring malformed context invalidation %r", raw)
+            return
+        if message.get("origin") == self._instance_id:
+            return
+        for key in message.get("keys") or []:
+            self._local_cache.invalidate(key)
+
+    async def _listen_for_invalidations(self, redis: Redis) -> None:
+        backoff = 0.5
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self._invalidation_channel)
+                backoff = 0.5
+                async for message in pubsub.listen():
+                    if message and message.get("type") == "message":
+                        self._apply_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Context invalidation listener failed: %s", exc)
+            finally:
+                await pubsub.aclose()
+            # Invalidations may have been missed while disconnected.
+            if self._local_cache is not None:
+                self._local_cache.clear()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
 
     async def append_stream(
         self,
@@ -127,14 +643,127 @@ class ContextManager:
         logger.debug("Appended event to %s/%s", stream_key, entry_id)
         return entry_id
 
+    async def append_streams(
+        self,
+        entries: Sequence[Tuple[str, Dict[str, Any]]],
+        max_length: Optional[int] = 1000,
+    ) -> List[str]:
+        """Append many ``(stream_name, payload)`` pairs in one pipelined round-trip."""
+
+        if not entries:
+            return []
+        redis = await self._get_client()
+        pipeline = redis.pipeline(transaction=False)
+        for stream_name, payload in entries:
+            pipeline.xadd(
+                self._stream_key(stream_name),
+                {"data": json.dumps(payload, ensure_ascii=False)},
+                maxlen=max_length,
+                approximate=True,
+            )
+        entry_ids = await pipeline.execute()
+        logger.debug("Appended %s events in one pipeline", len(entry_ids))
+        return list(entry_ids)
+
     async def read_stream(
         self,
         stream_name: str,
-        last_id: str = "$",
+        last_id: str = "+",
         count: int = 100,
     ) -> list[tuple[str, Dict[bytes, bytes]]]:
         redis = await self._get_client()
-        return await redis.xrevrange(self._stream_key(stream_name), max=last_id, count=count)
+        return await redis.xrevrange(
+            self._stream_key(stream_name), max=last_id, count=count
+        )
+
+    async def append_events(
+        self,
+        entries: Sequence[Tuple[str, str, str, Dict[str, Any]]],
+        max_length: Optional[int] = 1000,
+    ) -> List[str]:
+        """Append ``(tenant_id, stream_name, event_id, payload)`` entries and index them.
+
+        Each XADD and its event-id index write run in one script, so the index
+        never points at an entry that was not written. Index keys expire after
+        ``event_index_ttl``; entries trimmed from the stream before then are
+        detected and cleaned up by :meth:`read_event`.
+        """
+
+        if not entries:
+            return []
+        redis = await self._get_client()
+        if self._append_event_script is None:
+            self._append_event_script = redis.register_script(
+                APPEND_INDEXED_EVENT_SCRIPT
+            )
+        pipeline = redis.pipeline(transaction=False)
+        for tenant_id, stream_name, event_id, payload in entries:
+            await self._append_event_script(
+                keys=[
+                    self._stream_key(stream_name),
+                    self._event_index_key(tenant_id, event_id),
+                ],
+                args=[
+                    max_length or 0,
+                    json.dumps(payload, ensure_ascii=False),
+                    self._event_index_ttl,
+                ],
+                client=pipeline,
+            )
+        entry_ids = await pipeline.execute()
+        return list(entry_ids)
+
+    async def locate_event(
+        self, tenant_id: str, event_id: str
+    ) -> Optional[Tuple[str, str]]:
+        """Return ``(stream key, entry id)`` for an indexed event."""
+
+        redis = await self._get_client()
+        location = await redis.get(self._event_index_key(tenant_id, event_id))
+        if not location:
+            return None
+        stream_key, _, entry_id = location.rpartition(" ")
+        return stream_key, entry_id
+
+    async def read_event(
+        self, tenant_id: str, event_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch an indexed event payload with a single ``XRANGE`` on its entry id."""
+
+        location = await self.locate_event(tenant_id, event_id)
+        if location is None:
+            return None
+        stream_key, entry_id = location
+        redis = await self._get_client()
+        entries = await redis.xrange(stream_key, min=entry_id, max=entry_id, count=1)
+        if not entries:
+            # Trimmed from the stream before the index expired.
+            await redis.delete(self._event_index_key(tenant_id, event_id))
+            return None
+        return self.decode_stream_entry(entries[0][1])
+
+    async def read_stream_range(
+        self,
+        stream_name: str,
+        start: str = "-",
+        end: str = "+",
+        count: int = 100,
+    ) -> list[tuple[str, Dict[str, Any]]]:
+        """Read entries oldest-first between two stream ids (inclusive)."""
+
+        redis = await self._get_client()
+        return await redis.xrange(
+            self._stream_key(stream_name), min=start, max=end, count=count
+        )
+
+    @staticmethod
+    def decode_stream_entry(fields: Dict[Any, Any]) -> Optional[Dict[str, Any]]:
+        raw = fields.get(b"data") or fields.get("data")
+        if not raw:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        return json.loads(raw)
 
     def _tenant_key(self, tenant_id: str) -> str:
         return f"{tenant_id}:{self._namespace}:context"
@@ -142,6 +771,12 @@ class ContextManager:
     def _session_key(self, tenant_id: str, session_id: str) -> str:
         return f"{tenant_id}:{self._namespace}:session:{session_id}"
 
+    def _session_hash_key(self, tenant_id: str, session_id: str) -> str:
+        return f"{tenant_id}:{self._namespace}:session:{session_id}:fields"
+
+    def _event_index_key(self, tenant_id: str, event_id: str) -> str:
+        return f"{tenant_id}:{self._namespace}:event-index:{event_id}"
+
     def _stream_key(self, stream_name: str) -> str:
         if ":" in stream_name:
             return stream_name
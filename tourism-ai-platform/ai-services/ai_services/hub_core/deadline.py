@@ -0,0 +1,95 @@
+"""Request deadlines shared by every hop of a hub request.
+
+The deadline for the current request lives in a context variable, so it
+follows the request through ``await`` chains and into tasks spawned from it.
+It is an absolute wall-clock time, which lets it travel with queued events
+and as the ``X-Request-Timeout`` header (remaining seconds) sent to agents.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import time
+from typing import Iterator, Optional
+
+TIMEOUT_HEADER = "X-Request-Timeout"
+DEADLINE_METADATA_KEY = "deadline"
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed before the work finished."""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time())
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at <= time()
+
+    def cap(self, timeout: float) -> float:
+        return min(timeout, self.remaining())
+
+    def header_value(self) -> str:
+        return f"{self.remaining():.3f}"
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar(
+    "hub_request_deadline", default=None
+)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+def cap_timeout(timeout: float) -> float:
+    """``timeout`` limited to the time left on the current deadline, if any."""
+
+    deadline = _current.get()
+    return timeout if deadline is None else deadline.cap(timeout)
+
+
+def check_deadline(operation: str = "request") -> None:
+    deadline = _current.get()
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceeded(f"deadline exceeded before {operation}")
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Apply ``deadline`` for the block; an earlier enclosing deadline still wins."""
+
+    outer = _current.get()
+    if deadline is None or (
+        outer is not None and outer.expires_at <= deadline.expires_at
+    ):
+        yield outer
+        return
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def parse_timeout(value: Optional[str]) -> Optional[float]:
+    """Parse a relative timeout header in seconds; invalid or non-positive values are ignored."""
+
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    return seconds if seconds > 0 else None
@@ -2,26 +2,68 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-from typing import Any, Dict, Optional, Protocol
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Set, Tuple
+
+from pydantic import TypeAdapter, ValidationError
 
 from ai_services.interfaces.dto.channel_message_dto import ChannelMessageDTO
 from ai_services.interfaces.schemas.agent_schema import AgentSchema
 from ai_services.interfaces.schemas.event_schema import HubEvent
 
 from .context_manager import ContextManager
+from .deadline import (
+    DEADLINE_METADATA_KEY,
+    Deadline,
+    cap_timeout,
+    check_deadline,
+    current_deadline,
+    deadline_scope,
+)
+from .merge_strategies import MERGE_STRATEGIES, AgentResults, MergeStrategy
 from .metrics_collector import MetricsCollector
 
 logger = logging.getLogger(__name__)
 
+# ("agent", name), ("intent", capability, channel) or ("channel", channel).
+Route = Tuple[str, ...]
+
+# Set on the stream copy of events dispatched inline; consumers skip them.
+DISPATCHED_METADATA_KEY = "dispatchedInline"
+
+
+class AgentUnavailableError(RuntimeError):
+    """Raised by agent executors that refuse a call (open breaker, concurrency limit).
+
+    :class:`HubRouter` queues the event on the bus instead of failing it.
+    """
+
+    def __init__(self, agent_name: str, reason: str) -> None:
+        super().__init__(f"agent {agent_name} unavailable: {reason}")
+        self.agent_name = agent_name
+        self.reason = reason
+
 
 class HubRegistryProtocol(Protocol):
-    async def get_agent(self, name: str) -> Optional[AgentSchema]:
-        ...
 
-    async def list_agents(self) -> list[AgentSchema]:
-        ...
+    async def get_agent(
+        self, name: str, tenant_id: Optional[str] = None
+    ) -> Optional[AgentSchema]: ...
+
+    async def list_agents(
+        self, tenant_id: Optional[str] = None
+    ) -> list[AgentSchema]: ...
+
+    async def find_agents(
+        self,
+        tenant_id: Optional[str] = None,
+        *,
+        capability: Optional[str] = None,
+        channel: Optional[str] = None,
+    ) -> list[AgentSchema]: ...
 
 
 class AgentExecutorProtocol(Protocol):
@@ -34,17 +76,46 @@ class AgentExecutorProtocol(Protocol):
         event: HubEvent,
         session_context: Optional[Dict[str, Any]] = None,
         channel: Optional[str] = None,
-    ) -> Dict[str, Any]:
-        ...
+    ) -> Dict[str, Any]: ...
 
 
 class EventBusProtocol(Protocol):
-    async def publish(self, event: HubEvent) -> None:
-        ...
+
+    async def publish(
+        self, event: HubEvent, *, persist_stream: Optional[str] = None
+    ) -> None: ...
+
+    async def publish_many(
+        self,
+        events: Sequence[HubEvent],
+        *,
+        persist_stream: Optional[str] = None,
+    ) -> List[Optional[BaseException]]: ...
+
+    async def record(
+        self,
+        events: Sequence[HubEvent],
+        *,
+        persist_stream: Optional[str] = None,
+    ) -> None: ...
+
+
+_EVENT_LIST_ADAPTER = TypeAdapter(List[HubEvent])
 
 
 class HubRouter:
-    """Coordinate routing of hub events between orchestrator and agents."""
+    """Coordinate routing of hub events between orchestrator and agents.
+
+    Events naming an agent go to it. Otherwise, with ``route_by_intent`` the
+    first agent advertising ``payload.intent`` as a capability (preferring one
+    that serves the event's channel) takes the event, and with
+    ``route_by_channel`` the first agent serving the event's channel does.
+    Events that resolve to no agent are queued for the orchestrator.
+
+    Events dispatched inline are still written to the event streams and the
+    event-id index before the agent runs, marked so stream consumers do not
+    dispatch them again, so they can be replayed like queued events.
+    """
 
     def __init__(
         self,
@@ -55,42 +126,292 @@ class HubRouter:
         agent_executor: AgentExecutorProtocol,
         event_bus: EventBusProtocol,
         persist_stream: str = "hub:events",
+        dispatch_mode: str = "inline",
+        scatter_timeout: float = 10.0,
+        merge_strategies: Optional[Dict[str, MergeStrategy]] = None,
+        default_merge: str = "byAgent",
+        route_by_intent: bool = False,
+        route_by_channel: bool = False,
     ) -> None:
+        if dispatch_mode not in ("inline", "queue"):
+            raise ValueError(f"Unsupported dispatch mode {dispatch_mode!r}")
+        strategies = {**MERGE_STRATEGIES, **(merge_strategies or {})}
+        if default_merge not in strategies:
+            raise ValueError(f"Unknown merge strategy {default_merge!r}")
         self._registry = registry
         self._context_manager = context_manager
         self._metrics = metrics
         self._agent_executor = agent_executor
         self._event_bus = event_bus
         self._persist_stream = persist_stream
+        self._dispatch_mode = dispatch_mode
+        self._scatter_timeout = scatter_timeout
+        self._merge_strategies = strategies
+        self._default_merge = default_merge
+        self._route_by_intent = route_by_intent
+        self._route_by_channel = route_by_channel
 
-    async def route_event(self, event: HubEvent, *, persist: bool = True) -> Dict[str, Any]:
+    async def route_event(
+        self, event: HubEvent, *, persist: bool = True
+    ) -> Dict[str, Any]:
         logger.debug("Routing event %s for tenant %s", event.id, event.tenant_id)
+        check_deadline(f"routing event {event.id}")
+        if event.is_scatter and self._dispatch_mode == "inline":
+            _stamp_deadline(event)
+            if persist:
+                await self._record_dispatched([event])
+            return await self.scatter_event(event)
         agent_name = event.resolved_agent
-        if agent_name:
-            agent = await self._registry.get_agent(agent_name, event.tenant_id)
+        route = self._route(event)
+        if route is not None and self._dispatch_mode == "inline":
+            agent = await self._resolve_route(event.tenant_id, route)
             if agent is None:
-                logger.warning("Agent %s not registered; falling back to event bus", agent_name)
+                _log_unrouted(route)
             else:
-                return await self._dispatch_agent(agent, event)
-        await self._event_bus.publish(event)
-        if persist:
-            await self._context_manager.append_stream(
-                f"{event.tenant_id}:{self._persist_stream}",
-                event.model_dump(mode="json", by_alias=True),
-            )
+                stamped = _stamp_deadline(event)
+                if persist:
+                    await self._record_dispatched([event])
+                try:
+                    return await self._dispatch_agent(agent, event)
+                except AgentUnavailableError as exc:
+                    logger.warning(
+                        "%s; queueing event %s on the event bus", exc, event.id
+                    )
+                    if stamped:
+                        event.metadata.pop(DEADLINE_METADATA_KEY, None)
+                    await self._publish_deferred(event, persist=persist)
+                    return {
+                        "status": "queued",
+                        "eventId": event.id,
+                        "reason": exc.reason,
+                    }
+        await self._event_bus.publish(
+            event,
+            persist_stream=self._persist_stream if persist else None,
+        )
         self._metrics.tenant_request_count.labels(
-            tenant_id=event.tenant_id,
-            agent_name=agent_name or "orchestrator",
-            channel=event.channel or "system",
-            event_type=event.event_type,
+            **self._metrics.bounded_labels(
+                "tenant_request_count",
+                tenant_id=event.tenant_id,
+                agent_name=agent_name or "orchestrator",
+                channel=event.channel or "system",
+                event_type=event.event_type,
+            )
         ).inc()
         return {"status": "queued", "eventId": event.id}
 
+    async def _record_dispatched(self, events: Sequence[HubEvent]) -> None:
+        marked = [
+            event.model_copy(
+                update={"metadata": {**event.metadata, DISPATCHED_METADATA_KEY: True}}
+            )
+            for event in events
+        ]
+        await self._event_bus.record(marked, persist_stream=self._persist_stream)
+
+    async def _publish_deferred(self, event: HubEvent, *, persist: bool) -> None:
+        # Whoever consumes the stream (hub workers, replay) retries the dispatch.
+        await self._event_bus.publish(
+            event,
+            persist_stream=self._persist_stream if persist else None,
+        )
+
     async def handle_rest_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         event = HubEvent.model_validate(payload)
         return await self.route_event(event)
 
-    async def handle_channel_message(self, message: ChannelMessageDTO) -> Dict[str, Any]:
+    async def route_events(
+        self,
+        events: Sequence[HubEvent],
+        *,
+        persist: bool = True,
+        max_concurrency: int = 16,
+    ) -> List[Dict[str, Any]]:
+        """Route a batch of events and return one status per event, in order.
+
+        Events are grouped by ``(tenant, agent)`` so each agent is resolved once;
+        agent dispatches run concurrently (bounded by ``max_concurrency``) while
+        every queued event is published through a single ``publish_many`` call.
+        """
+
+        results: List[Dict[str, Any]] = [{} for _ in events]
+        agent_groups: Dict[Tuple[str, Route], List[int]] = defaultdict(list)
+        queued: List[int] = []
+        scattered: List[int] = []
+        check_deadline("routing batch")
+        for index, event in enumerate(events):
+            route = self._route(event)
+            if event.is_scatter and self._dispatch_mode == "inline":
+                scattered.append(index)
+            elif route is not None and self._dispatch_mode == "inline":
+                agent_groups[(event.tenant_id, route)].append(index)
+            else:
+                queued.append(index)
+
+        group_keys = list(agent_groups)
+        agents = await asyncio.gather(
+            *(self._resolve_route(tenant_id, route) for tenant_id, route in group_keys)
+        )
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        deferred: List[int] = []
+        stamped: Set[int] = set()
+
+        async def dispatch(agent: AgentSchema, index: int) -> None:
+            event = events[index]
+            async with semaphore:
+                try:
+                    outcome = await self._dispatch_agent(agent, event)
+                except AgentUnavailableError as exc:
+                    logger.warning(
+                        "%s; queueing event %s on the event bus", exc, event.id
+                    )
+                    if index in stamped:
+                        event.metadata.pop(DEADLINE_METADATA_KEY, None)
+                    deferred.append(index)
+                    return
+                except Exception as exc:
+                    logger.warning(
+                        "Batch dispatch of event %s to %s failed: %s",
+                        event.id,
+                        agent.name,
+                        exc,
+                    )
+                    outcome = {
+                        "status": "failed",
+                        "agent": agent.name,
+                        "error": str(exc),
+                    }
+            results[index] = {"eventId": event.id, **outcome}
+
+        dispatches = []
+        inline = list(scattered)
+        for (tenant_id, route), agent in zip(group_keys, agents):
+            indexes = agent_groups[(tenant_id, route)]
+            if agent is None:
+                _log_unrouted(route)
+                queued.extend(indexes)
+                continue
+            inline.extend(indexes)
+            dispatches.extend(dispatch(agent, index) for index in indexes)
+
+        async def scatter(index: int) -> None:
+            event = events[index]
+            async with semaphore:
+                try:
+                    results[index] = await self.scatter_event(event)
+                except Exception as exc:
+                    logger.warning(
+                        "Batch scatter of event %s failed: %s", event.id, exc
+                    )
+                    results[index] = {
+                        "eventId": event.id,
+                        "status": "failed",
+                        "error": str(exc),
+                    }
+
+        dispatches.extend(scatter(index) for index in scattered)
+
+        stamped.update(index for index in inline if _stamp_deadline(events[index]))
+        if persist and inline:
+            inline.sort()
+            await self._record_dispatched([events[index] for index in inline])
+
+        queued.sort()
+        await asyncio.gather(
+            self._queue_events(events, queued, results, persist=persist), *dispatches
+        )
+        if deferred:
+            deferred.sort()
+            await self._queue_events(events, deferred, results, persist=persist)
+        return results
+
+    async def _queue_events(
+        self,
+        events: Sequence[HubEvent],
+        indexes: List[int],
+        results: List[Dict[str, Any]],
+        *,
+        persist: bool,
+    ) -> None:
+        if not indexes:
+            return
+        batch = [events[index] for index in indexes]
+        errors = await self._event_bus.publish_many(
+            batch,
+            persist_stream=self._persist_stream if persist else None,
+        )
+        label_counts: Counter[Tuple[str, str, str, str]] = Counter()
+        for index, event, error in zip(indexes, batch, errors):
+            if error is None:
+                results[index] = {"status": "queued", "eventId": event.id}
+            else:
+                results[index] = {
+                    "status": "failed",
+                    "eventId": event.id,
+                    "error": str(error),
+                }
+            label_counts[
+                (
+                    event.tenant_id,
+                    event.resolved_agent or "orchestrator",
+                    event.channel or "system",
+                    event.event_type,
+                )
+            ] += 1
+        for (tenant_id, agent_name, channel, event_type), count in label_counts.items():
+            self._metrics.tenant_request_count.labels(
+                **self._metrics.bounded_labels(
+                    "tenant_request_count",
+                    tenant_id=tenant_id,
+                    agent_name=agent_name,
+                    channel=channel,
+                    event_type=event_type,
+                )
+            ).inc(count)
+
+    async def handle_rest_batch(
+        self, payloads: Sequence[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Validate and route a batch of REST payloads with per-event statuses."""
+
+        valid, rejected = self._validate_batch(payloads)
+        routed = await self.route_events([event for _, event in valid])
+        results: List[Dict[str, Any]] = [{} for _ in payloads]
+        for (index, _), outcome in zip(valid, routed):
+            results[index] = {"index": index, **outcome}
+        for index, errors in rejected:
+            results[index] = {"index": index, "status": "rejected", "errors": errors}
+        return {"accepted": len(valid), "rejected": len(rejected), "results": results}
+
+    @staticmethod
+    def _validate_batch(
+        payloads: Sequence[Dict[str, Any]],
+    ) -> Tuple[List[Tuple[int, HubEvent]], List[Tuple[int, List[str]]]]:
+        try:
+            events = _EVENT_LIST_ADAPTER.validate_python(list(payloads))
+            return list(enumerate(events)), []
+        except ValidationError:
+            pass
+        valid: List[Tuple[int, HubEvent]] = []
+        rejected: List[Tuple[int, List[str]]] = []
+        for index, payload in enumerate(payloads):
+            try:
+                valid.append((index, HubEvent.model_validate(payload)))
+            except ValidationError as exc:
+                rejected.append(
+                    (
+                        index,
+                        [
+                            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                            for error in exc.errors()
+                        ],
+                    )
+                )
+        return valid, rejected
+
+    async def handle_channel_message(
+        self, message: ChannelMessageDTO
+    ) -> Dict[str, Any]:
         event_dict = {
             "id": message.id,
             "tenantId": message.tenant_id,
@@ -105,13 +426,188 @@ class HubRouter:
         }
         return await self.handle_rest_payload(event_dict)
 
-    async def _dispatch_agent(self, agent: AgentSchema, event: HubEvent) -> Dict[str, Any]:
-        session_context: Optional[Dict[str, Any]] = None
-        if event.session_id:
-            session_context = await self._context_manager.get_session_context(
-                event.tenant_id, event.session_id
+    async def dispatch_event(self, event: HubEvent) -> Optional[Dict[str, Any]]:
+        """Dispatch ``event`` to its agent inline; ``None`` when no agent is registered.
+
+        Used by stream consumers, which must not re-queue the event. A deadline
+        the client set in ``metadata.deadline`` applies to the dispatch and
+        raises :class:`DeadlineExceeded` once passed; queued events carry no
+        deadline of their own.
+        """
+
+        with deadline_scope(event_deadline(event)):
+            check_deadline(f"dispatching event {event.id}")
+            if event.is_scatter:
+                return await self.scatter_event(event)
+            agent = await self._resolve_agent(event)
+            if agent is None:
+                return None
+            return await self._dispatch_agent(agent, event)
+
+    async def scatter_event(self, event: HubEvent) -> Dict[str, Any]:
+        """Run ``event`` on several agents concurrently and merge their answers.
+
+        Targets are ``targetAgents`` plus every agent advertising
+        ``targetCapability``. ``metadata.scatter`` may set ``timeout`` (one
+        deadline shared by all agents), ``quorum`` (stop once that many agents
+        have answered) and ``merge`` (a registered merge strategy). Agents still
+        running at the deadline or quorum are cancelled and reported as
+        ``timeout``/``cancelled``; the event is then ``partial``.
+        """
+
+        options = event.metadata.get("scatter")
+        options = options if isinstance(options, dict) else {}
+        merge_name = options.get("merge") or self._default_merge
+        strategy = self._merge_strategies.get(merge_name)
+        if strategy is None:
+            raise ValueError(f"Unknown merge strategy {merge_name!r}")
+        timeout = cap_timeout(
+            _positive_float(options.get("timeout"), self._scatter_timeout)
+        )
+
+        agents, outcomes = await self._scatter_targets(event)
+        quorum = min(
+            len(agents), int(_positive_float(options.get("quorum"), len(agents) or 1))
+        )
+        session_context = await self._session_context(event)
+        tasks = {
+            asyncio.create_task(
+                self._execute_agent(agent, event, session_context)
+            ): agent.name
+            for agent in agents
+        }
+        completed: AgentResults = []
+        pending = set(tasks)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            while pending and len(completed) < quorum:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    agent_name = tasks[task]
+                    error = task.exception()
+                    if error is None:
+                        completed.append((agent_name, task.result()))
+                        outcomes[agent_name] = {
+                            "status": "completed",
+                            "result": task.result(),
+                        }
+                    elif isinstance(error, AgentUnavailableError):
+                        outcomes[agent_name] = {
+                            "status": "unavailable",
+                            "reason": error.reason,
+                        }
+                    else:
+                        logger.warning(
+                            "Scatter dispatch of %s to %s failed: %s",
+                            event.id,
+                            agent_name,
+                            error,
+                        )
+                        outcomes[agent_name] = {"status": "failed", "error": str(error)}
+        finally:
+            for task in pending:
+                task.cancel()
+                outcomes[tasks[task]] = {
+                    "status": "cancelled" if len(completed) >= quorum else "timeout"
+                }
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if completed and len(completed) == len(outcomes):
+            status = "completed"
+        elif completed:
+            status = "partial"
+        else:
+            status = "failed"
+        return {
+            "status": status,
+            "eventId": event.id,
+            "merge": merge_name,
+            "agents": outcomes,
+            "result": strategy(completed),
+        }
+
+    async def _scatter_targets(
+        self, event: HubEvent
+    ) -> Tuple[List[AgentSchema], Dict[str, Dict[str, Any]]]:
+        names = list(dict.fromkeys(event.target_agents))
+        resolved = await asyncio.gather(
+            *(self._registry.get_agent(name, event.tenant_id) for name in names)
+        )
+        agents: Dict[str, AgentSchema] = {}
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        for name, agent in zip(names, resolved):
+            if agent is None:
+                outcomes[name] = {"status": "unknown"}
+            else:
+                agents[name] = agent
+        if event.target_capability:
+            capable = await self._registry.find_agents(
+                event.tenant_id, capability=event.target_capability
             )
-        response = await self._agent_executor.execute(
+            for agent in capable:
+                agents.setdefault(agent.name, agent)
+        for name in agents:
+            outcomes[name] = {"status": "pending"}
+        return list(agents.values()), outcomes
+
+    async def _resolve_agent(self, event: HubEvent) -> Optional[AgentSchema]:
+        route = self._route(event)
+        if route is None:
+            return None
+        return await self._resolve_route(event.tenant_id, route)
+
+    def _route(self, event: HubEvent) -> Optional[Route]:
+        """How ``event`` picks its agent; ``None`` when it goes to the orchestrator."""
+
+        if event.resolved_agent:
+            return ("agent", event.resolved_agent)
+        intent = event.payload.get("intent") if self._route_by_intent else None
+        if isinstance(intent, str) and intent:
+            return ("intent", intent, event.channel or "")
+        if self._route_by_channel and event.channel:
+            return ("channel", event.channel)
+        return None
+
+    async def _resolve_route(
+        self, tenant_id: str, route: Route
+    ) -> Optional[AgentSchema]:
+        kind, key = route[0], route[1]
+        if kind == "agent":
+            return await self._registry.get_agent(key, tenant_id)
+        candidates: List[AgentSchema] = []
+        if kind == "intent":
+            channel = route[2]
+            if channel:
+                candidates = await self._registry.find_agents(
+                    tenant_id, capability=key, channel=channel
+                )
+            if not candidates:
+                candidates = await self._registry.find_agents(tenant_id, capability=key)
+        else:
+            candidates = await self._registry.find_agents(tenant_id, channel=key)
+        return candidates[0] if candidates else None
+
+    async def _session_context(self, event: HubEvent) -> Optional[Dict[str, Any]]:
+        if not event.session_id:
+            return None
+        return await self._context_manager.get_session_context(
+            event.tenant_id, event.session_id
+        )
+
+    async def _execute_agent(
+        self,
+        agent: AgentSchema,
+        event: HubEvent,
+        session_context: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        return await self._agent_executor.execute(
             agent=agent,
             tenant_id=event.tenant_id,
             payload=event.payload,
@@ -119,6 +615,13 @@ class HubRouter:
             session_context=session_context,
             channel=event.channel,
         )
+
+    async def _dispatch_agent(
+        self, agent: AgentSchema, event: HubEvent
+    ) -> Dict[str, Any]:
+        response = await self._execute_agent(
+            agent, event, await self._session_context(event)
+        )
         logger.debug(
             "Dispatched event %s to %s for tenant %s",
             event.id,
@@ -131,16 +634,148 @@ class HubRouter:
             "result": response,
         }
 
-    async def replay_event(self, event_id: str) -> Optional[Dict[str, Any]]:
-        entries = await self._context_manager.read_stream(self._persist_stream, last_id=event_id, count=1)
-        if not entries:
-            return None
-        _, fields = entries[0]
-        payload = fields.get(b"data") or fields.get("data")
-        if not payload:
+    async def replay_event(
+        self, event_id: str, tenant_id: str = "system"
+    ) -> Optional[Dict[str, Any]]:
+        """Re-route one event located through the event-id index."""
+
+        payload = await self._context_manager.read_event(tenant_id, event_id)
+        if payload is None:
             return None
-        if isinstance(payload, bytes):
-            payload = payload.decode("utf-8")
-        event_dict = json.loads(payload)
-        event = HubEvent.model_validate(event_dict)
-        return await self.route_event(event, persist=False)
+        return await self.route_event(_replayable(payload), persist=False)
+
+    async def replay_range(
+        self,
+        tenant_id: str,
+        start: datetime,
+        end: datetime,
+        *,
+        limit: int = 1000,
+        rate: float = 50.0,
+        page_size: int = 100,
+        event_types: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """Re-route persisted events written between ``start`` and ``end``.
+
+        Stream ids are millisecond timestamps, so the range maps directly onto
+        ``XRANGE``. Events are replayed in order at no more than ``rate`` per
+        second. Without ``event_types`` agent responses (``agent.*``) are
+        skipped, since replaying the triggering events produces them again.
+        """
+
+        stream = f"{tenant_id}:{self._persist_stream}"
+        cursor = str(int(start.timestamp() * 1000))
+        upper = str(int(end.timestamp() * 1000))
+        # Replays are re-published onto the same stream; stop at the entry that
+        # was newest when the replay started so they are not replayed again.
+        newest = await self._context_manager.read_stream(stream, last_id="+", count=1)
+        if not newest:
+            return {
+                "tenantId": tenant_id,
+                "replayed": 0,
+                "failed": 0,
+                "skipped": 0,
+                "lastId": None,
+            }
+        if _stream_id_key(newest[0][0]) < _stream_id_key(upper + "-0"):
+            upper = newest[0][0]
+        replayed = failed = skipped = 0
+        last_id: Optional[str] = None
+        interval = 1.0 / rate if rate > 0 else 0.0
+        loop = asyncio.get_running_loop()
+        next_slot = loop.time()
+        while replayed + failed < limit:
+            entries = await self._context_manager.read_stream_range(
+                stream, cursor, upper, count=min(page_size, limit - replayed - failed)
+            )
+            if not entries:
+                break
+            for entry_id, fields in entries:
+                last_id = entry_id
+                payload = self._context_manager.decode_stream_entry(fields)
+                event_type = (payload or {}).get("type", "")
+                if (
+                    payload is None
+                    or (event_types is not None and event_type not in event_types)
+                    or (event_types is None and event_type.startswith("agent."))
+                ):
+                    skipped += 1
+                    continue
+                delay = next_slot - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_slot = max(next_slot, loop.time()) + interval
+                try:
+                    await self.route_event(_replayable(payload), persist=False)
+                    replayed += 1
+                except Exception as exc:  # noqa: BLE001 - keep replaying the range
+                    logger.warning("Replay of %s/%s failed: %s", stream, entry_id, exc)
+                    failed += 1
+            cursor = _next_stream_id(entries[-1][0])
+        return {
+            "tenantId": tenant_id,
+            "replayed": replayed,
+            "failed": failed,
+            "skipped": skipped,
+            "lastId": last_id,
+        }
+
+
+def _log_unrouted(route: Route) -> None:
+    if route[0] == "agent":
+        logger.warning("Agent %s not registered; falling back to event bus", route[1])
+    else:
+        logger.debug(
+            "No agent for %s %r; falling back to event bus", route[0], route[1]
+        )
+
+
+def event_deadline(event: HubEvent) -> Optional[Deadline]:
+    """Deadline carried in ``event.metadata``, if any."""
+
+    value = event.metadata.get(DEADLINE_METADATA_KEY)
+    try:
+        return Deadline(float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _replayable(payload: Dict[str, Any]) -> HubEvent:
+    # A replay is a new request; the original caller's deadline no longer applies.
+    event = HubEvent.model_validate(payload)
+    event.metadata.pop(DEADLINE_METADATA_KEY, None)
+    event.metadata.pop(DISPATCHED_METADATA_KEY, None)
+    return event
+
+
+def _stamp_deadline(event: HubEvent) -> bool:
+    """Put the waiting caller's deadline on an event dispatched inline.
+
+    Only inline dispatches are stamped: queued and deferred events outlive the
+    request, so they keep only a deadline the client asked for explicitly.
+    Returns whether the event was stamped.
+    """
+
+    deadline = current_deadline()
+    if deadline is None or DEADLINE_METADATA_KEY in event.metadata:
+        return False
+    event.metadata[DEADLINE_METADATA_KEY] = deadline.expires_at
+    return True
+
+
+def _positive_float(value: Any, default: float) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number > 0 else default
+
+
+def _stream_id_key(entry_id: str) -> Tuple[int, int]:
+    millis, _, sequence = entry_id.partition("-")
+    return int(millis), int(sequence or 0)
+
+
+def _next_stream_id(entry_id: str) -> str:
+    millis, _, sequence = entry_id.partition("-")
+    return f"{millis}-{int(sequence or 0) + 1}"
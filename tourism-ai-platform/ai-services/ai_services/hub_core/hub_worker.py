@@ -0,0 +1,381 @@
+"""Consumer-group workers dispatching hub events from tenant Redis streams."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from redis.exceptions import ResponseError
+
+from ai_services.interfaces.schemas.event_schema import HubEvent
+
+from .context_manager import ContextManager
+from .deadline import DeadlineExceeded
+from .hub_router import DISPATCHED_METADATA_KEY, AgentUnavailableError, HubRouter
+from .metrics_collector import MetricsCollector
+
+logger = logging.getLogger(__name__)
+
+TenantSource = Callable[[], Awaitable[Iterable[str]]]
+
+
+class HubWorker:
+    """Read ``{tenant}:{stream}`` with ``XREADGROUP`` and dispatch through the hub router.
+
+    One reader task fetches batches for every known tenant stream into a
+    bounded queue drained by ``concurrency`` dispatch tasks. Successful and
+    skipped entries are acknowledged; failed ones stay pending and are
+    reclaimed with ``XAUTOCLAIM`` once idle for ``claim_idle`` seconds, by
+    any worker in the group. Entries that cannot be parsed, or that were
+    delivered ``max_deliveries`` times, are copied to
+    ``{stream}:dead-letter`` and acknowledged.
+
+    Consumer groups are created at ``start_id`` (``"0"``: from the start of
+    the stream) the first time a tenant stream is seen, so events written
+    before a worker discovered the tenant are still delivered. :meth:`stop`
+    waits up to ``stop_timeout`` seconds for running dispatches.
+    """
+
+    def __init__(
+        self,
+        *,
+        context_manager: ContextManager,
+        hub_router: HubRouter,
+        tenant_source: TenantSource,
+        metrics: Optional[MetricsCollector] = None,
+        stream: str = "hub:events",
+        group: str = "hub-workers",
+        consumer: Optional[str] = None,
+        concurrency: int = 8,
+        batch_size: int = 32,
+        block_ms: int = 2000,
+        claim_idle: float = 60.0,
+        max_deliveries: int = 5,
+        streams_refresh_interval: float = 30.0,
+        start_id: str = "0",
+        stop_timeout: float = 10.0,
+    ) -> None:
+        self._context_manager = context_manager
+        self._hub_router = hub_router
+        self._tenant_source = tenant_source
+        self._metrics = metrics
+        self._stream = stream
+        self._group = group
+        self._consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self._concurrency = max(1, concurrency)
+        self._batch_size = batch_size
+        self._block_ms = block_ms
+        self._claim_idle_ms = int(claim_idle * 1000)
+        self._max_deliveries = max_deliveries
+        self._streams_refresh_interval = streams_refresh_interval
+        self._start_id = start_id
+        self._stop_timeout = stop_timeout
+        self._streams: Dict[str, str] = {}
+        self._streams_refreshed_at = 0.0
+        self._groups: Set[str] = set()
+        self._queue: "asyncio.Queue[Tuple[str, str, Dict[str, Any]]]" = asyncio.Queue(
+            maxsize=self._concurrency * 2
+        )
+        self._tasks: List[asyncio.Task[None]] = []
+        self._busy: Set["asyncio.Task[Any]"] = set()
+        self._stopping = asyncio.Event()
+
+    @property
+    def consumer(self) -> str:
+        return self._consumer
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._stopping.clear()
+        await self._refresh_streams(force=True)
+        self._tasks = [
+            asyncio.create_task(self._read_loop()),
+            asyncio.create_task(self._reclaim_loop()),
+        ]
+        self._tasks.extend(
+            asyncio.create_task(self._dispatch_loop()) for _ in range(self._concurrency)
+        )
+        logger.info(
+            "Hub worker %s started on %s streams with concurrency %s",
+            self._consumer,
+            len(self._streams),
+            self._concurrency,
+        )
+
+    async def stop(self) -> None:
+        """Stop reading and let in-flight dispatches finish; unacked entries stay pending."""
+
+        if not self._tasks:
+            return
+        self._stopping.set()
+        readers, dispatchers = self._tasks[:2], self._tasks[2:]
+        for task in readers:
+            task.cancel()
+        for task in dispatchers:
+            if task not in self._busy:
+                task.cancel()
+        # Busy dispatchers exit after their current entry; queued ones stay pending.
+        _, unfinished = await asyncio.wait(dispatchers, timeout=self._stop_timeout)
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if unfinished:
+            logger.warning(
+                "Hub worker %s cancelled %s dispatches still running after %ss",
+                self._consumer,
+                len(unfinished),
+                self._stop_timeout,
+            )
+        self._tasks = []
+
+    async def run_once(self) -> int:
+        """Read, reclaim and dispatch a single batch inline; returns entries handled."""
+
+        await self._refresh_streams()
+        entries = await self._claim_stale()
+        entries.extend(await self._read_batch(block=False))
+        for stream_key, entry_id, fields in entries:
+            await self._process(stream_key, entry_id, fields)
+        return len(entries)
+
+    async def _read_loop(self) -> None:
+        backoff = 0.5
+        while not self._stopping.is_set():
+            try:
+                await self._refresh_streams()
+                for entry in await self._read_batch(block=True):
+                    await self._queue.put(entry)
+                backoff = 0.5
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - keep the worker alive
+                logger.warning("Hub worker read failed: %s", exc)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    async def _reclaim_loop(self) -> None:
+        interval = max(self._claim_idle_ms / 2000, 0.5)
+        while not self._stopping.is_set():
+            await asyncio.sleep(interval)
+            try:
+                for entry in await self._claim_stale():
+                    await self._queue.put(entry)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - retried on the next tick
+                logger.warning("Hub worker reclaim failed: %s", exc)
+
+    async def _dispatch_loop(self) -> None:
+        task = asyncio.current_task()
+        while not self._stopping.is_set():
+            stream_key, entry_id, fields = await self._queue.get()
+            if self._stopping.is_set():
+                self._queue.task_done()
+                break
+            self._busy.add(task)  # type: ignore[arg-type]
+            try:
+                await self._process(stream_key, entry_id, fields)
+            finally:
+                self._busy.discard(task)  # type: ignore[arg-type]
+                self._queue.task_done()
+
+    async def _refresh_streams(self, *, force: bool = False) -> None:
+        now = monotonic()
+        if (
+            not force
+            and now - self._streams_refreshed_at < self._streams_refresh_interval
+        ):
+            return
+        tenants = set(await self._tenant_source())
+        tenants.add("system")
+        streams = {f"{tenant}:{self._stream}": tenant for tenant in tenants}
+        redis = await self._context_manager.connect()
+        for stream_key in streams.keys() - self._groups:
+            await self._ensure_group(redis, stream_key)
+        self._streams = streams
+        self._streams_refreshed_at = now
+
+    async def _ensure_group(self, redis: Any, stream_key: str) -> None:
+        try:
+            await redis.xgroup_create(
+                stream_key, self._group, id=self._start_id, mkstream=True
+            )
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._groups.add(stream_key)
+
+    async def _read_batch(
+        self, *, block: bool
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        if not self._streams:
+            return []
+        redis = await self._context_manager.connect()
+        try:
+            response = await redis.xreadgroup(
+                self._group,
+                self._consumer,
+                {stream_key: ">" for stream_key in self._streams},
+                count=self._batch_size,
+                block=self._block_ms if block else None,
+            )
+        except ResponseError as exc:
+            if "NOGROUP" not in str(exc):
+                raise
+            # A stream was deleted; recreate groups on the next refresh.
+            self._groups.clear()
+            self._streams_refreshed_at = 0.0
+            return []
+        return [
+            (stream_key, entry_id, fields)
+            for stream_key, entries in response or []
+            for entry_id, fields in entries
+            if fields is not None
+        ]
+
+    async def _claim_stale(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        redis = await self._context_manager.connect()
+        claimed: List[Tuple[str, str, Dict[str, Any]]] = []
+        for stream_key in list(self._streams):
+            pending = await redis.xpending_range(
+                stream_key,
+                self._group,
+                min="-",
+                max="+",
+                count=self._batch_size,
+                idle=self._claim_idle_ms,
+            )
+            exhausted = [
+                item
+                for item in pending
+                if int(item["times_delivered"]) >= self._max_deliveries
+            ]
+            for item in exhausted:
+                await self._dead_letter_pending(redis, stream_key, item)
+            if len(exhausted) == len(pending):
+                continue
+            response = await redis.xautoclaim(
+                stream_key,
+                self._group,
+                self._consumer,
+                self._claim_idle_ms,
+                start_id="0-0",
+                count=self._batch_size,
+            )
+            entries = response[1] if len(response) > 1 else []
+            for entry_id, fields in entries:
+                if fields is None:
+                    continue
+                claimed.append((stream_key, entry_id, fields))
+                self._record(stream_key, "reclaimed")
+        return claimed
+
+    async def _process(
+        self, stream_key: str, entry_id: str, fields: Dict[str, Any]
+    ) -> None:
+        try:
+            await self._handle(stream_key, entry_id, fields)
+        except AgentUnavailableError as exc:
+            logger.info("Deferring %s/%s: %s", stream_key, entry_id, exc)
+            self._record(stream_key, "deferred")
+        except Exception as exc:  # noqa: BLE001 - entry stays pending for reclaim
+            logger.warning(
+                "Hub worker failed to handle %s/%s: %s", stream_key, entry_id, exc
+            )
+            self._record(stream_key, "failed")
+
+    async def _handle(
+        self, stream_key: str, entry_id: str, fields: Dict[str, Any]
+    ) -> None:
+        try:
+            payload = ContextManager.decode_stream_entry(fields)
+            event = HubEvent.model_validate(payload)
+        except (ValueError, ValidationError, TypeError) as exc:
+            await self._dead_letter(
+                stream_key, entry_id, fields, f"invalid event: {exc}", deliveries=1
+            )
+            return
+        if event.event_type.startswith("agent.") or event.metadata.get(
+            DISPATCHED_METADATA_KEY
+        ):
+            # Agent responses and events the router already dispatched inline
+            # are written to the same stream; nothing to dispatch.
+            await self._ack(stream_key, entry_id, "skipped")
+            return
+        try:
+            result = await self._hub_router.dispatch_event(event)
+        except DeadlineExceeded:
+            # Nobody is waiting for the answer any more.
+            await self._ack(stream_key, entry_id, "expired")
+            return
+        await self._ack(
+            stream_key, entry_id, "skipped" if result is None else "dispatched"
+        )
+
+    async def _ack(self, stream_key: str, entry_id: str, outcome: str) -> None:
+        redis = await self._context_manager.connect()
+        await redis.xack(stream_key, self._group, entry_id)
+        self._record(stream_key, outcome)
+
+    async def _dead_letter_pending(
+        self, redis: Any, stream_key: str, item: Dict[str, Any]
+    ) -> None:
+        entry_id = item["message_id"]
+        entries = await redis.xrange(stream_key, min=entry_id, max=entry_id, count=1)
+        fields = entries[0][1] if entries else {}
+        await self._dead_letter(
+            stream_key,
+            entry_id,
+            fields,
+            "max deliveries exceeded",
+            deliveries=int(item["times_delivered"]),
+        )
+
+    async def _dead_letter(
+        self,
+        stream_key: str,
+        entry_id: str,
+        fields: Dict[str, Any],
+        reason: str,
+        *,
+        deliveries: int,
+    ) -> None:
+        redis = await self._context_manager.connect()
+        pipeline = redis.pipeline(transaction=True)
+        pipeline.xadd(
+            f"{stream_key}:dead-letter",
+            {
+                "data": fields.get("data") or json.dumps(fields, ensure_ascii=False),
+                "entryId": entry_id,
+                "reason": reason,
+                "deliveries": deliveries,
+                "consumer": self._consumer,
+            },
+            maxlen=1000,
+            approximate=True,
+        )
+        pipeline.xack(stream_key, self._group, entry_id)
+        await pipeline.execute()
+        logger.warning("Dead-lettered %s/%s: %s", stream_key, entry_id, reason)
+        self._record(stream_key, "dead_lettered")
+
+    def _record(self, stream_key: str, outcome: str) -> None:
+        if self._metrics is None:
+            return
+        tenant_id = self._streams.get(stream_key) or stream_key.split(":", 1)[0]
+        self._metrics.hub_worker_events_total.labels(
+            **self._metrics.bounded_labels(
+                "hub_worker_events_total", tenant_id=tenant_id, outcome=outcome
+            )
+        ).inc()
@@ -0,0 +1,108 @@
+"""Size-bounded in-process LRU cache with per-entry TTL.
+
+Used as an L1 tier in front of Redis-backed hub state. Cached values are
+shared between callers and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class LocalCache(Generic[V]):
+    """LRU + TTL cache with hit/miss accounting and fill tokens.
+
+    ``fill_token()`` / ``put(..., token=...)`` guard against caching a value
+    read from the backing store while an invalidation for it was in flight:
+    the fill is dropped if any invalidation happened after the token was taken.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 30.0) -> None:
+        self._max_size = max(1, max_size)
+        self._ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry  # type: ignore[misc]
+        if expires_at <= monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def fill_token(self) -> int:
+        return self._generation
+
+    def put(
+        self,
+        key: Hashable,
+        value: V,
+        *,
+        ttl: Optional[float] = None,
+        token: Optional[int] = None,
+    ) -> bool:
+        """Store ``value``; returns ``False`` when a stale ``token`` rejected the fill."""
+
+        if token is not None and token != self._generation:
+            return False
+        self._entries[key] = (monotonic() + (self._ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        self._generation += 1
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every key matching ``predicate``; returns how many were dropped."""
+
+        self._generation += 1
+        stale = [key for key in self._entries if predicate(key)]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "size": len(self._entries),
+            "maxSize": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRatio": self.hit_ratio,
+        }
@@ -0,0 +1,43 @@
+"""Merge strategies for scatter-gather dispatches.
+
+A strategy receives the ``(agent_name, result)`` pairs of the agents that
+completed, in completion order, and returns the merged payload.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Tuple
+
+AgentResults = List[Tuple[str, Dict[str, Any]]]
+MergeStrategy = Callable[[AgentResults], Dict[str, Any]]
+
+
+def merge_by_agent(results: AgentResults) -> Dict[str, Any]:
+    """Key every result by the agent that produced it."""
+
+    return {agent_name: result for agent_name, result in results}
+
+
+def merge_first(results: AgentResults) -> Dict[str, Any]:
+    """Return the result of the agent that answered first."""
+
+    if not results:
+        return {}
+    agent_name, result = results[0]
+    return {"agent": agent_name, **result}
+
+
+def merge_shallow(results: AgentResults) -> Dict[str, Any]:
+    """Overlay results key by key; later answers win on conflicts."""
+
+    merged: Dict[str, Any] = {}
+    for _, result in results:
+        merged.update(result)
+    return merged
+
+
+MERGE_STRATEGIES: Dict[str, MergeStrategy] = {
+    "byAgent": merge_by_agent,
+    "first": merge_first,
+    "shallow": merge_shallow,
+}
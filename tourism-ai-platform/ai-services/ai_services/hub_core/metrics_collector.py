@@ -5,23 +5,75 @@ from __future__ import annotations
 import asyncio
 import logging
 from functools import wraps
-from time import perf_counter
-from typing import Any, Callable, Optional, Protocol
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, Iterable, Optional, Protocol
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+from .cardinality import LabelGuard, SeriesGuard
 
 logger = logging.getLogger(__name__)
 
 
 class LabelsResolver(Protocol):
-    def __call__(self, *args: Any, **kwargs: Any) -> tuple[str, str, str | None, str | None]:
+    def __call__(
+        self, *args: Any, **kwargs: Any
+    ) -> tuple[str, str, str | None, str | None]:
         """Return ``(agent_name, tenant_id, channel, event_type)``."""
 
 
 class MetricsCollector:
-    """Centralised Prometheus metrics handling with helpful decorators."""
+    """Centralised Prometheus metrics handling with helpful decorators.
+
+    Client-controlled labels are bounded: ``tenant_id``, ``agent_name``,
+    ``event_type`` and ``channel`` each admit a limited number of distinct
+    values (allow-listed tenants always pass) and fold the rest into
+    ``other``, and each metric recorded through :meth:`bounded_labels` keeps
+    at most ``max_series`` label combinations.
+
+    The limits are per process. When ``workers`` processes export through one
+    multi-process directory, each admits ``1/workers`` of every limit so the
+    aggregate on ``/metrics`` stays within them.
+
+    Gauges declare how they aggregate across workers in Prometheus
+    multi-process mode (see :mod:`.metrics_multiprocess`); the mode is
+    ignored in single-process deployments.
+    """
 
-    def __init__(self, registry=None) -> None:
+    def __init__(
+        self,
+        registry=None,
+        *,
+        max_tenants: int = 500,
+        tenant_allowlist: Iterable[str] = (),
+        max_agents: int = 200,
+        max_event_types: int = 50,
+        max_channels: int = 32,
+        max_series: int = 10000,
+        workers: int = 1,
+    ) -> None:
+        self.registry = registry
+        workers = max(1, workers)
+        self._label_guards: Dict[str, LabelGuard] = {
+            "tenant_id": LabelGuard(max_tenants // workers, tenant_allowlist),
+            "agent_name": LabelGuard(max_agents // workers),
+            "event_type": LabelGuard(max_event_types // workers),
+            "channel": LabelGuard(max_channels // workers),
+        }
+        self._max_series = max_series // workers
+        self._series_guards: Dict[str, SeriesGuard] = {}
+        self.metrics_folded_total = Counter(
+            "metrics_folded_total",
+            "Samples recorded with labels folded into 'other' by the cardinality guard",
+            labelnames=("metric",),
+            registry=registry,
+        )
         self.agent_latency_seconds = Histogram(
             "agent_latency_seconds",
             "Latency distribution for agent executions",
@@ -40,8 +92,152 @@ class MetricsCollector:
             labelnames=("agent_name", "tenant_id", "event_type", "error_type"),
             registry=registry,
         )
+        self.context_cache_requests_total = Counter(
+            "context_cache_requests_total",
+            "In-process context cache lookups by scope and result (hit/miss)",
+            labelnames=("scope", "result"),
+            registry=registry,
+        )
+        self.hub_worker_events_total = Counter(
+            "hub_worker_events_total",
+            "Stream entries handled by hub workers by outcome",
+            labelnames=("tenant_id", "outcome"),
+            registry=registry,
+        )
+        self.rate_limit_decisions_total = Counter(
+            "rate_limit_decisions_total",
+            "Tenant rate limiter decisions by route class",
+            labelnames=("tenant_id", "route_class", "decision"),
+            registry=registry,
+        )
+        self.agent_pool_in_flight = Gauge(
+            "agent_pool_in_flight",
+            "Agent requests in flight per agent connection pool",
+            labelnames=("pool",),
+            multiprocess_mode="livesum",
+            registry=registry,
+        )
+        self.agent_pool_saturation = Gauge(
+            "agent_pool_saturation",
+            "In-flight agent requests as a fraction of the pool's max connections",
+            labelnames=("pool",),
+            multiprocess_mode="livemax",
+            registry=registry,
+        )
+        self.agent_pool_wait_seconds = Histogram(
+            "agent_pool_wait_seconds",
+            "Time agent requests waited for a pooled connection",
+            labelnames=("pool",),
+            buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+            registry=registry,
+        )
+        self.agent_pool_connections_opened_total = Counter(
+            "agent_pool_connections_opened_total",
+            "New TCP connections opened per agent connection pool",
+            labelnames=("pool",),
+            registry=registry,
+        )
+        self.agent_endpoint_healthy = Gauge(
+            "agent_endpoint_healthy",
+            "Whether an agent replica endpoint is in load-balancing rotation (1) or not (0)",
+            labelnames=("agent_name", "endpoint"),
+            multiprocess_mode="livemin",
+            registry=registry,
+        )
+        self.agent_hedged_requests_total = Counter(
+            "agent_hedged_requests_total",
+            "Hedged agent requests by which attempt answered first",
+            labelnames=("agent_name", "winner"),
+            registry=registry,
+        )
+        self.agent_circuit_state = Gauge(
+            "agent_circuit_state",
+            "Agent circuit breaker state (0 closed, 1 half-open, 2 open)",
+            labelnames=("agent_name",),
+            multiprocess_mode="livemax",
+            registry=registry,
+        )
+        self.agent_concurrency_limit = Gauge(
+            "agent_concurrency_limit",
+            "Current adaptive concurrency limit per agent",
+            labelnames=("agent_name",),
+            multiprocess_mode="livesum",
+            registry=registry,
+        )
+        self.agent_guard_rejections_total = Counter(
+            "agent_guard_rejections_total",
+            "Agent calls refused by the circuit breaker or concurrency limit",
+            labelnames=("agent_name", "reason"),
+            registry=registry,
+        )
+        self.agent_cache_requests_total = Counter(
+            "agent_cache_requests_total",
+            "Agent response cache lookups by result (local_hit/redis_hit/coalesced/miss)",
+            labelnames=("agent_name", "result"),
+            registry=registry,
+        )
+        self.post_dispatch_queue_depth = Gauge(
+            "agent_post_dispatch_queue_depth",
+            "Post-dispatch side effects waiting for a background worker",
+            multiprocess_mode="livesum",
+            registry=registry,
+        )
+        self.post_dispatch_tasks_total = Counter(
+            "agent_post_dispatch_tasks_total",
+            "Post-dispatch side effects by step (session/response) and result (ok/failed)",
+            labelnames=("step", "result"),
+            registry=registry,
+        )
+        self.registry_refresh_total = Counter(
+            "hub_registry_refresh_total",
+            "Hub registry revalidations by result (modified/not_modified/failed)",
+            labelnames=("result",),
+            registry=registry,
+        )
+        self.registry_invalidations_total = Counter(
+            "hub_registry_invalidations_total",
+            "Hub registry invalidations sent (local), received (remote) or detected as missed (gap)",
+            labelnames=("source",),
+            registry=registry,
+        )
+        self.registry_cache_loaded_at = Gauge(
+            "hub_registry_cache_loaded_timestamp_seconds",
+            "When the oldest cached registry data (agents or tenants) was loaded",
+            labelnames=("cache",),
+            multiprocess_mode="livemin",
+            registry=registry,
+        )
+        self.scheduler_queue_depth = Gauge(
+            "agent_scheduler_queue_depth",
+            "Agent executions waiting for a scheduler slot per tenant",
+            labelnames=("tenant_id",),
+            multiprocess_mode="livesum",
+            registry=registry,
+        )
+        self.scheduler_wait_seconds = Histogram(
+            "agent_scheduler_wait_seconds",
+            "Time agent executions waited for a scheduler slot per tenant",
+            labelnames=("tenant_id",),
+            buckets=(
+                0.001,
+                0.005,
+                0.01,
+                0.025,
+                0.05,
+                0.1,
+                0.25,
+                0.5,
+                1.0,
+                2.5,
+                5.0,
+                10.0,
+            ),
+            registry=registry,
+        )
 
-    def track_agent(self, resolver: LabelsResolver) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def track_agent(
+        self, resolver: LabelsResolver
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
         """Decorate a sync/async callable to record hub metrics.
 
         Parameters
@@ -68,7 +264,9 @@ class MetricsCollector:
                     except Exception as exc:
                         self._record_error(agent_name, tenant_id, event_type, exc)
                         duration = perf_counter() - start
-                        self._observe_latency(agent_name, tenant_id, event_type, duration)
+                        self._observe_latency(
+                            agent_name, tenant_id, event_type, duration
+                        )
                         raise
                     duration = perf_counter() - start
                     self._observe_latency(agent_name, tenant_id, event_type, duration)
@@ -101,40 +299,79 @@ class MetricsCollector:
 
         return decorator
 
-    def _observe_latency(self, agent_name: str, tenant_id: str, event_type: str, duration: float) -> None:
+    def bounded_labels(self, metric: str, **labels: str) -> Dict[str, str]:
+        """``labels`` with client-controlled values and series count kept within bounds."""
+
+        bounded = {
+            name: (
+                self._label_guards[name](value) if name in self._label_guards else value
+            )
+            for name, value in labels.items()
+        }
+        guard = self._series_guards.get(metric)
+        if guard is None:
+            guard = self._series_guards[metric] = SeriesGuard(
+                self._max_series,
+                foldable=[name for name in labels if name in self._label_guards],
+            )
+        bounded, folded = guard(bounded)
+        if folded or bounded != labels:
+            self.metrics_folded_total.labels(metric=metric).inc()
+        return bounded
+
+    def _observe_latency(
+        self, agent_name: str, tenant_id: str, event_type: str, duration: float
+    ) -> None:
         try:
             self.agent_latency_seconds.labels(
-                agent_name=agent_name,
-                tenant_id=tenant_id,
-                event_type=event_type,
+                **self.bounded_labels(
+                    "agent_latency_seconds",
+                    agent_name=agent_name,
+                    tenant_id=tenant_id,
+                    event_type=event_type,
+                )
             ).observe(duration)
         except ValueError:
-            logger.debug("Latency metric already registered for %s/%s", agent_name, tenant_id)
+            logger.debug(
+                "Latency metric already registered for %s/%s", agent_name, tenant_id
+            )
 
     def _increment_request(
         self, tenant_id: str, agent_name: str, channel: str, event_type: str
     ) -> None:
         try:
             self.tenant_request_count.labels(
-                tenant_id=tenant_id,
-                agent_name=agent_name,
-                channel=channel,
-                event_type=event_type,
+                **self.bounded_labels(
+                    "tenant_request_count",
+                    tenant_id=tenant_id,
+                    agent_name=agent_name,
+                    channel=channel,
+                    event_type=event_type,
+                )
             ).inc()
         except ValueError:
-            logger.debug("Request counter already registered for %s/%s", tenant_id, agent_name)
+            logger.debug(
+                "Request counter already registered for %s/%s", tenant_id, agent_name
+            )
 
-    def _record_error(self, agent_name: str, tenant_id: str, event_type: str, exc: BaseException) -> None:
+    def _record_error(
+        self, agent_name: str, tenant_id: str, event_type: str, exc: BaseException
+    ) -> None:
         error_type = exc.__class__.__name__
         try:
             self.agent_error_total.labels(
-                agent_name=agent_name,
-                tenant_id=tenant_id,
-                event_type=event_type,
-                error_type=error_type,
+                **self.bounded_labels(
+                    "agent_error_total",
+                    agent_name=agent_name,
+                    tenant_id=tenant_id,
+                    event_type=event_type,
+                    error_type=error_type,
+                )
             ).inc()
         except ValueError:
-            logger.debug("Error counter already registered for %s/%s", agent_name, tenant_id)
+            logger.debug(
+                "Error counter already registered for %s/%s", agent_name, tenant_id
+            )
 
     @staticmethod
     def _resolve_labels(
@@ -144,3 +381,26 @@ class MetricsCollector:
     ) -> tuple[str, str, Optional[str], Optional[str]]:
         agent_name, tenant_id, channel, event_type = resolver(*args, **kwargs)
         return agent_name, tenant_id, channel, event_type
+
+
+class CachedExposition:
+    """Prometheus text exposition of several registries, reused for ``ttl`` seconds.
+
+    Scrapes within the TTL get the same bytes, so concurrent or frequent
+    scrapers cost one ``generate_latest`` per registry per TTL.
+    """
+
+    def __init__(self, *registries: CollectorRegistry, ttl: float = 5.0) -> None:
+        self._registries = registries
+        self._ttl = ttl
+        self._body: Optional[bytes] = None
+        self._expires_at = 0.0
+
+    def render(self) -> bytes:
+        now = monotonic()
+        if self._body is None or now >= self._expires_at:
+            self._body = b"".join(
+                generate_latest(registry) for registry in self._registries
+            )
+            self._expires_at = now + self._ttl
+        return self._body
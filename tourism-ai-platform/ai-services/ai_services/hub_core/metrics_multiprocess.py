@@ -0,0 +1,83 @@
+"""Prometheus multi-process mode for deployments with several workers per pod.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set before ``prometheus_client`` is
+imported, every worker writes its samples to memory-mapped files in that
+directory and any worker can expose the aggregate of all of them. The
+directory must exist, be shared by the workers of one pod only, and start
+empty (mount an ``emptyDir`` or clear it before the server starts).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from typing import Optional
+
+from prometheus_client import CollectorRegistry
+from prometheus_client.multiprocess import MultiProcessCollector, mark_process_dead
+
+logger = logging.getLogger(__name__)
+
+_LIVE_GAUGE_FILE = re.compile(r"^gauge_live\w+_(\d+)\.db$")
+
+
+def multiprocess_dir() -> Optional[str]:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get(
+        "prometheus_multiproc_dir"
+    )
+
+
+def multiprocess_registry(path: Optional[str] = None) -> CollectorRegistry:
+    """A registry that collects every worker's samples from ``path``."""
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry, path=path or multiprocess_dir())
+    return registry
+
+
+def mark_worker_dead(pid: Optional[int] = None, path: Optional[str] = None) -> None:
+    """Drop the live-gauge files of ``pid`` (this process by default).
+
+    Counter and histogram files are kept so totals stay monotonic after a
+    worker exits; only gauges in ``live*`` modes stop reporting it.
+    """
+
+    path = path or multiprocess_dir()
+    if path:
+        mark_process_dead(pid if pid is not None else os.getpid(), path)
+
+
+def cleanup_dead_workers(path: Optional[str] = None) -> int:
+    """Mark every worker whose live-gauge files outlived its process as dead.
+
+    Covers workers that were killed without running shutdown hooks. Returns
+    the number of processes cleaned up.
+    """
+
+    path = path or multiprocess_dir()
+    if not path or not os.path.isdir(path):
+        return 0
+    pids = set()
+    for name in os.listdir(path):
+        match = _LIVE_GAUGE_FILE.match(name)
+        if match:
+            pids.add(int(match.group(1)))
+    dead = [pid for pid in pids if not _process_alive(pid)]
+    for pid in dead:
+        mark_process_dead(pid, path)
+    if dead:
+        logger.info(
+            "Removed live metrics of %s exited workers from %s", len(dead), path
+        )
+    return len(dead)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
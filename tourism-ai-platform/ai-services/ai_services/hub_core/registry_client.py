@@ -4,18 +4,33 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Iterable, List, Optional
+from functools import partial
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import httpx
 
 from .context_manager import ContextManager
+from .single_flight import SingleFlight, should_refresh_early
 from ai_services.interfaces.schemas.agent_schema import AgentSchema
 from ai_services.interfaces.schemas.tenant_schema import TenantSchema
 
 logger = logging.getLogger(__name__)
 
+# Cached in place of a tenant the registry does not know; not valid JSON, so
+# readers that predate negative caching treat it as a miss.
+_UNKNOWN_TENANT = "!unknown"
+
 
 class RegistryClient:
+    """HTTP client for the hub registry with a Redis copy of tenant documents.
+
+    Cached tenant lookups are coalesced per tenant, refreshed early with a
+    probability that rises as the Redis TTL runs out (scaled by
+    ``early_refresh_beta``), and tenants the registry does not know are
+    remembered for ``negative_ttl`` seconds.
+    """
+
     def __init__(
         self,
         base_url: str,
@@ -24,6 +39,8 @@ class RegistryClient:
         api_key: str | None = None,
         headers: Optional[Iterable[tuple[str, str]]] = None,
         context_manager: ContextManager | None = None,
+        negative_ttl: int = 30,
+        early_refresh_beta: float = 1.0,
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._api_key = api_key
@@ -37,6 +54,11 @@ class RegistryClient:
         )
         self._context_manager = context_manager
         self._tenant_cache_ttl = 600
+        self._negative_ttl = negative_ttl
+        self._early_refresh_beta = early_refresh_beta
+        self._tenant_loads: SingleFlight[Optional[TenantSchema]] = SingleFlight()
+        self._tenant_fetch_seconds = 0.0
+        self._etags: Dict[Tuple[str, str], str] = {}
 
     def _tenant_headers(self, tenant_id: str | None) -> dict[str, str]:
         resolved = tenant_id or "system"
@@ -46,20 +68,62 @@ class RegistryClient:
         await self._client.aclose()
 
     async def list_agents(self, tenant_id: str | None = None) -> List[AgentSchema]:
-        response = await self._client.get("/agents", headers=self._tenant_headers(tenant_id))
+        response = await self._client.get(
+            "/agents", headers=self._tenant_headers(tenant_id)
+        )
         response.raise_for_status()
         payload = response.json()
         agents = [AgentSchema.model_validate(agent) for agent in payload]
         logger.debug("Fetched %s agents from registry", len(agents))
         return agents
 
+    async def list_agents_if_modified(
+        self, tenant_id: str | None = None
+    ) -> Optional[List[AgentSchema]]:
+        """Conditional :meth:`list_agents`; ``None`` when unchanged since this client's last fetch."""
+
+        payload = await self._get_if_modified("/agents", tenant_id or "system")
+        if payload is None:
+            return None
+        return [AgentSchema.model_validate(agent) for agent in payload]
+
+    async def list_tenants_if_modified(self) -> Optional[List[TenantSchema]]:
+        """Conditional :meth:`list_tenants` that skips the Redis copy; ``None`` when unchanged."""
+
+        payload = await self._get_if_modified("/tenants", "system")
+        if payload is None:
+            return None
+        tenants = [TenantSchema.model_validate(item) for item in payload]
+        if self._context_manager:
+            await self._cache_tenants(tenants)
+        return tenants
+
+    async def _get_if_modified(self, path: str, tenant_id: str) -> Optional[Any]:
+        """GET with ``If-None-Match``; registries without ETags simply always return 200."""
+
+        headers = self._tenant_headers(tenant_id)
+        etag = self._etags.get((path, tenant_id))
+        if etag:
+            headers["If-None-Match"] = etag
+        response = await self._client.get(path, headers=headers)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        if response.headers.get("ETag"):
+            self._etags[(path, tenant_id)] = response.headers["ETag"]
+        else:
+            self._etags.pop((path, tenant_id), None)
+        return response.json()
+
     async def list_tenants(self, use_cache: bool = True) -> List[TenantSchema]:
         if use_cache and self._context_manager:
             tenants = await self._read_cached_tenants()
             if tenants:
                 return tenants
 
-        response = await self._client.get("/tenants", headers=self._tenant_headers("system"))
+        response = await self._client.get(
+            "/tenants", headers=self._tenant_headers("system")
+        )
         response.raise_for_status()
         payload = response.json()
         tenants = [TenantSchema.model_validate(item) for item in payload]
@@ -67,7 +131,52 @@ class RegistryClient:
             await self._cache_tenants(tenants)
         return tenants
 
-    async def get_agent(self, name: str, tenant_id: str | None = None) -> Optional[AgentSchema]:
+    async def get_tenants(
+        self, tenant_ids: Iterable[str], use_cache: bool = True
+    ) -> Dict[str, TenantSchema]:
+        """Look up many tenants: one ``MGET`` for cached entries, one registry call for the rest.
+
+        The registry call is ``GET /tenants?ids=a,b``; registries that ignore
+        the filter return every tenant, and the response is narrowed to the
+        requested ids either way. Unknown tenants are omitted.
+        """
+
+        wanted = list(dict.fromkeys(tenant_ids))
+        cached: Dict[str, Optional[TenantSchema]] = {}
+        if use_cache and self._context_manager and wanted:
+            cached = await self._read_cached_tenant_map(wanted)
+        found = {
+            tenant_id: tenant
+            for tenant_id, tenant in cached.items()
+            if tenant is not None
+        }
+        missing = [tenant_id for tenant_id in wanted if tenant_id not in cached]
+        if not missing:
+            return found
+        response = await self._client.get(
+            "/tenants",
+            params={"ids": ",".join(missing)},
+            headers=self._tenant_headers("system"),
+        )
+        response.raise_for_status()
+        requested = set(missing)
+        fetched = [
+            tenant
+            for tenant in (
+                TenantSchema.model_validate(item) for item in response.json()
+            )
+            if tenant.id in requested
+        ]
+        known = {tenant.id for tenant in fetched}
+        unknown = [tenant_id for tenant_id in missing if tenant_id not in known]
+        if self._context_manager and (fetched or unknown):
+            await self._write_cached_tenants(fetched, unknown=unknown)
+        found.update((tenant.id, tenant) for tenant in fetched)
+        return found
+
+    async def get_agent(
+        self, name: str, tenant_id: str | None = None
+    ) -> Optional[AgentSchema]:
         response = await self._client.get(
             f"/agents/{name}", headers=self._tenant_headers(tenant_id)
         )
@@ -76,16 +185,33 @@ class RegistryClient:
         response.raise_for_status()
         return AgentSchema.model_validate(response.json())
 
-    async def get_tenant(self, tenant_id: str, use_cache: bool = True) -> Optional[TenantSchema]:
+    async def get_tenant(
+        self, tenant_id: str, use_cache: bool = True
+    ) -> Optional[TenantSchema]:
+        return await self._tenant_loads.do(
+            (tenant_id, use_cache), partial(self._load_tenant, tenant_id, use_cache)
+        )
+
+    async def _load_tenant(
+        self, tenant_id: str, use_cache: bool
+    ) -> Optional[TenantSchema]:
         if use_cache and self._context_manager:
             cached = await self._read_cached_tenant(tenant_id)
-            if cached:
-                return cached
+            if cached is not None:
+                tenant, remaining = cached
+                if not should_refresh_early(
+                    remaining, self._tenant_fetch_seconds, self._early_refresh_beta
+                ):
+                    return tenant
 
+        started = perf_counter()
         response = await self._client.get(
             f"/tenants/{tenant_id}", headers=self._tenant_headers("system")
         )
+        self._tenant_fetch_seconds = perf_counter() - started
         if response.status_code == 404:
+            if self._context_manager:
+                await self._write_cached_tenants([], unknown=[tenant_id])
             return None
         response.raise_for_status()
         tenant = TenantSchema.model_validate(response.json())
@@ -93,9 +219,13 @@ class RegistryClient:
             await self._write_cached_tenant(tenant)
         return tenant
 
-    async def register_agent(self, agent: AgentSchema, tenant_id: str | None = None) -> AgentSchema:
+    async def register_agent(
+        self, agent: AgentSchema, tenant_id: str | None = None
+    ) -> AgentSchema:
         response = await self._client.post(
-            "/agents", json=agent.model_dump(mode="json"), headers=self._tenant_headers(tenant_id)
+            "/agents",
+            json=agent.model_dump(mode="json"),
+            headers=self._tenant_headers(tenant_id),
         )
         response.raise_for_status()
         return AgentSchema.model_validate(response.json())
@@ -112,13 +242,67 @@ class RegistryClient:
         return TenantSchema.model_validate(response.json())
 
     async def _cache_tenants(self, tenants: List[TenantSchema]) -> None:
+        if not self._context_manager:
+            return
+        payload = json.dumps(
+            [tenant.model_dump(mode="json", by_alias=True) for tenant in tenants]
+        )
+        await self._write_cached_tenants(
+            tenants, ("system:hub:registry:tenants", payload)
+        )
+
+    async def _write_cached_tenants(
+        self,
+        tenants: List[TenantSchema],
+        *extra: Tuple[str, str],
+        unknown: Iterable[str] = (),
+    ) -> None:
+        """Write tenant entries, ``extra`` key/value pairs and ``unknown`` markers in one pipeline."""
+
         if not self._context_manager:
             return
         redis = await self._context_manager.connect()
-        payload = json.dumps([tenant.model_dump(mode="json", by_alias=True) for tenant in tenants])
-        await redis.set("system:hub:registry:tenants", payload, ex=self._tenant_cache_ttl)
+        pipeline = redis.pipeline(transaction=False)
+        for key, value in extra:
+            pipeline.set(key, value, ex=self._tenant_cache_ttl)
         for tenant in tenants:
-            await self._write_cached_tenant(tenant)
+            pipeline.set(
+                self._registry_key(tenant.id),
+                json.dumps(tenant.model_dump(mode="json", by_alias=True)),
+                ex=self._tenant_cache_ttl,
+            )
+        if self._negative_ttl > 0:
+            for tenant_id in unknown:
+                pipeline.set(
+                    self._registry_key(tenant_id),
+                    _UNKNOWN_TENANT,
+                    ex=self._negative_ttl,
+                )
+        await pipeline.execute()
+
+    async def _read_cached_tenant_map(
+        self, tenant_ids: List[str]
+    ) -> Dict[str, Optional[TenantSchema]]:
+        """Cached tenants by id; ``None`` marks a tenant cached as unknown, absent ids are uncached."""
+
+        if not self._context_manager:
+            return {}
+        redis = await self._context_manager.connect()
+        payloads = await redis.mget(
+            [self._registry_key(tenant_id) for tenant_id in tenant_ids]
+        )
+        found: Dict[str, Optional[TenantSchema]] = {}
+        for tenant_id, raw in zip(tenant_ids, payloads):
+            if not raw:
+                continue
+            if raw == _UNKNOWN_TENANT:
+                found[tenant_id] = None
+                continue
+            try:
+                found[tenant_id] = TenantSchema.model_validate(json.loads(raw))
+            except json.JSONDecodeError:
+                continue
+        return found
 
     async def _read_cached_tenants(self) -> List[TenantSchema]:
         if not self._context_manager:
@@ -133,16 +317,26 @@ class RegistryClient:
         except json.JSONDecodeError:
             return []
 
-    async def _read_cached_tenant(self, tenant_id: str) -> Optional[TenantSchema]:
+    async def _read_cached_tenant(
+        self, tenant_id: str
+    ) -> Optional[Tuple[Optional[TenantSchema], float]]:
+        """``(tenant, seconds to expiry)`` from Redis; the tenant is ``None`` when cached as unknown."""
+
         if not self._context_manager:
             return None
         redis = await self._context_manager.connect()
-        raw = await redis.get(self._registry_key(tenant_id))
+        pipeline = redis.pipeline(transaction=False)
+        pipeline.get(self._registry_key(tenant_id))
+        pipeline.pttl(self._registry_key(tenant_id))
+        raw, pttl = await pipeline.execute()
         if not raw:
             return None
+        remaining = pttl / 1000 if pttl is not None and pttl >= 0 else float("inf")
+        if raw == _UNKNOWN_TENANT:
+            return None, remaining
         try:
             data = json.loads(raw)
-            return TenantSchema.model_validate(data)
+            return TenantSchema.model_validate(data), remaining
         except json.JSONDecodeError:
             return None
 
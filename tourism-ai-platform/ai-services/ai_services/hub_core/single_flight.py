@@ -0,0 +1,63 @@
+"""Stampede protection for cache lookups: request coalescing and early refresh."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Share one in-flight call per key between concurrent callers.
+
+    The first caller for a key runs ``load``; callers arriving while it runs
+    await the same result (or exception) instead of repeating the work. The
+    key is released as soon as the call finishes, so nothing is cached here.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        pending = self._calls.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await load()
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; do not log it as unretrieved
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._calls.pop(key, None)
+        future.set_result(result)
+        return result
+
+
+def should_refresh_early(remaining: float, cost: float, beta: float = 1.0) -> bool:
+    """Decide whether to refresh an entry that expires in ``remaining`` seconds.
+
+    Probabilistic early expiration ("XFetch"): a lookup refreshes when
+    ``cost * beta * -ln(U)`` reaches the time left, ``U`` uniform in (0, 1].
+    The chance rises as expiry approaches and with the refresh ``cost``, so
+    one caller usually refreshes shortly before the TTL instead of every
+    caller at once after it. ``beta > 1`` refreshes earlier, ``0`` never.
+    """
+
+    if remaining <= 0:
+        return True
+    if cost <= 0 or beta <= 0:
+        return False
+    return cost * beta * -math.log(1.0 - random.random()) >= remaining
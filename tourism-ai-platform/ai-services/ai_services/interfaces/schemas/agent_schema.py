@@ -13,12 +13,22 @@ class AgentCapability(BaseModel):
     name: str
     description: Optional[str] = None
     version: Optional[str] = None
+    cacheable: bool = Field(
+        default=False, description="Identical payloads return identical results"
+    )
+    cache_ttl: Optional[float] = Field(default=None, alias="cacheTtl")
+
+    class Config:
+        populate_by_name = True
 
 
 class AgentSchema(BaseModel):
     id: str
     name: str
     endpoint: HttpUrl = Field(..., description="Primary execution endpoint")
+    endpoints: List[HttpUrl] = Field(
+        default_factory=list, description="Additional replica endpoints"
+    )
     display_name: Optional[str] = None
     version: Optional[str] = None
     owner: Optional[str] = None
@@ -29,3 +39,13 @@ class AgentSchema(BaseModel):
 
     class Config:
         allow_population_by_field_name = True
+
+    def endpoint_urls(self) -> List[str]:
+        """Primary and replica endpoints as base URLs without a trailing slash."""
+
+        urls: List[str] = []
+        for endpoint in (self.endpoint, *self.endpoints):
+            url = str(endpoint).rstrip("/")
+            if url not in urls:
+                urls.append(url)
+        return urls
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -28,6 +28,8 @@ class HubEvent(BaseModel):
     session_id: Optional[str] = Field(default=None, alias="sessionId")
     target_agent: Optional[str] = Field(default=None, alias="targetAgent")
     agent_name: Optional[str] = Field(default=None, alias="agentName")
+    target_agents: List[str] = Field(default_factory=list, alias="targetAgents")
+    target_capability: Optional[str] = Field(default=None, alias="targetCapability")
     channel: Optional[str] = Field(default=None, description="Communication channel")
     correlation_id: Optional[str] = Field(default=None, alias="correlationId")
     metadata: Dict[str, Any] = Field(default_factory=dict)
@@ -38,3 +40,9 @@ class HubEvent(BaseModel):
     @property
     def resolved_agent(self) -> Optional[str]:
         return self.target_agent or self.agent_name
+
+    @property
+    def is_scatter(self) -> bool:
+        """Whether the event fans out to several agents (scatter-gather)."""
+
+        return bool(self.target_agents or self.target_capability)
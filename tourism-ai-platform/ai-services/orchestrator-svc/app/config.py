@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
@@ -8,7 +8,9 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     app_name: str = "ai-orchestrator"
     redis_url: str = Field("redis://localhost:6379/1", env="REDIS_URL")
-    kafka_brokers: List[str] = Field(default_factory=lambda: ["localhost:9092"], env="KAFKA_BROKERS")
+    kafka_brokers: List[str] = Field(
+        default_factory=lambda: ["localhost:9092"], env="KAFKA_BROKERS"
+    )
     langsmith_api_key: str | None = Field(default=None, env="LANGSMITH_API_KEY")
     otel_endpoint: str | None = Field(default=None, env="OTEL_EXPORTER_OTLP_ENDPOINT")
     s3_endpoint: str = Field("http://localhost:9000", env="S3_ENDPOINT")
@@ -16,7 +18,9 @@ class Settings(BaseSettings):
     s3_access_key: str = Field("minioadmin", env="S3_ACCESS_KEY")
     s3_secret_key: str = Field("minioadmin", env="S3_SECRET_KEY")
     backend_base_url: str = Field("http://localhost:4000/api", env="BACKEND_BASE_URL")
-    amadeus_base_url: str = Field("https://api.test.amadeus.com", env="AMADEUS_BASE_URL")
+    amadeus_base_url: str = Field(
+        "https://api.test.amadeus.com", env="AMADEUS_BASE_URL"
+    )
     amadeus_api_key: str | None = Field(default=None, env="AMADEUS_API_KEY")
     amadeus_api_secret: str | None = Field(default=None, env="AMADEUS_API_SECRET")
     non_diagnostic_disclaimer: str = Field(
@@ -26,16 +30,91 @@ class Settings(BaseSettings):
     hub_namespace: str = Field("hub", env="HUB_NAMESPACE")
     hub_registry_url: str = Field("http://localhost:8200", env="HUB_REGISTRY_URL")
     hub_registry_api_key: str | None = Field(default=None, env="HUB_REGISTRY_API_KEY")
+    hub_registry_refresh_interval: int = Field(60, env="HUB_REGISTRY_REFRESH_INTERVAL")
+    hub_registry_tenant_ttl: float = Field(300.0, env="HUB_REGISTRY_TENANT_TTL")
+    hub_negative_cache_ttl: float = Field(30.0, env="HUB_NEGATIVE_CACHE_TTL")
+    hub_cache_early_refresh_beta: float = Field(1.0, env="HUB_CACHE_EARLY_REFRESH_BETA")
+    hub_client_ttl: float = Field(90.0, env="HUB_CLIENT_TTL")
+    hub_client_flush_interval: float = Field(1.0, env="HUB_CLIENT_FLUSH_INTERVAL")
+    hub_client_sweep_interval: float = Field(60.0, env="HUB_CLIENT_SWEEP_INTERVAL")
     hub_kafka_topic: str = Field("ai.agent.events", env="HUB_KAFKA_TOPIC")
     hub_topic_suffix: str = Field("hub.events", env="HUB_TOPIC_SUFFIX")
     hub_redis_stream: str = Field("hub:events", env="HUB_REDIS_STREAM")
     hub_default_ttl: int = Field(600, env="HUB_DEFAULT_TTL")
+    hub_batch_max_events: int = Field(500, env="HUB_BATCH_MAX_EVENTS")
+    hub_context_cache_size: int = Field(2048, env="HUB_CONTEXT_CACHE_SIZE")
+    hub_context_cache_ttl: float = Field(30.0, env="HUB_CONTEXT_CACHE_TTL")
+    hub_dispatch_mode: str = Field("inline", env="HUB_DISPATCH_MODE")
+    hub_worker_enabled: bool = Field(False, env="HUB_WORKER_ENABLED")
+    hub_worker_group: str = Field("hub-workers", env="HUB_WORKER_GROUP")
+    hub_worker_concurrency: int = Field(8, env="HUB_WORKER_CONCURRENCY")
+    hub_worker_claim_idle: float = Field(60.0, env="HUB_WORKER_CLAIM_IDLE")
+    hub_worker_max_deliveries: int = Field(5, env="HUB_WORKER_MAX_DELIVERIES")
+    hub_scheduler_max_concurrency: int = Field(64, env="HUB_SCHEDULER_MAX_CONCURRENCY")
+    hub_scheduler_tenant_concurrency: int = Field(
+        16, env="HUB_SCHEDULER_TENANT_CONCURRENCY"
+    )
+    hub_rate_limit_enabled: bool = Field(False, env="HUB_RATE_LIMIT_ENABLED")
+    hub_rate_limit_lease_size: int = Field(8, env="HUB_RATE_LIMIT_LEASE_SIZE")
+    hub_rate_limits: Dict[str, Dict[str, float]] = Field(
+        default_factory=lambda: {
+            "agents": {"rate": 20, "burst": 40},
+            "events": {"rate": 200, "burst": 400},
+            "orchestrate": {"rate": 10, "burst": 20},
+            "default": {"rate": 50, "burst": 100},
+        },
+        env="HUB_RATE_LIMITS",
+    )
+    hub_agent_timeout: float = Field(60.0, env="HUB_AGENT_TIMEOUT")
+    hub_agent_connect_timeout: float = Field(5.0, env="HUB_AGENT_CONNECT_TIMEOUT")
+    hub_agent_max_connections: int = Field(100, env="HUB_AGENT_MAX_CONNECTIONS")
+    hub_agent_max_keepalive: int = Field(20, env="HUB_AGENT_MAX_KEEPALIVE")
+    hub_agent_http2: bool = Field(False, env="HUB_AGENT_HTTP2")
+    hub_agent_failure_threshold: int = Field(3, env="HUB_AGENT_FAILURE_THRESHOLD")
+    hub_agent_probe_interval: float = Field(10.0, env="HUB_AGENT_PROBE_INTERVAL")
+    hub_agent_hedge: bool = Field(False, env="HUB_AGENT_HEDGE")
+    hub_agent_hedge_quantile: float = Field(0.95, env="HUB_AGENT_HEDGE_QUANTILE")
+    hub_route_timeouts: Dict[str, float] = Field(
+        default_factory=lambda: {"agents": 60.0, "events": 30.0, "orchestrate": 120.0},
+        env="HUB_ROUTE_TIMEOUTS",
+    )
+    hub_max_request_timeout: float = Field(300.0, env="HUB_MAX_REQUEST_TIMEOUT")
+    hub_agent_cache_enabled: bool = Field(True, env="HUB_AGENT_CACHE_ENABLED")
+    hub_agent_cache_local_size: int = Field(1024, env="HUB_AGENT_CACHE_LOCAL_SIZE")
+    hub_agent_cache_default_ttl: float = Field(300.0, env="HUB_AGENT_CACHE_DEFAULT_TTL")
+    hub_post_dispatch_workers: int = Field(4, env="HUB_POST_DISPATCH_WORKERS")
+    hub_post_dispatch_queue_size: int = Field(1024, env="HUB_POST_DISPATCH_QUEUE_SIZE")
+    hub_post_dispatch_sync: bool = Field(False, env="HUB_POST_DISPATCH_SYNC")
+    hub_scatter_timeout: float = Field(10.0, env="HUB_SCATTER_TIMEOUT")
+    hub_route_by_intent: bool = Field(False, env="HUB_ROUTE_BY_INTENT")
+    hub_route_by_channel: bool = Field(False, env="HUB_ROUTE_BY_CHANNEL")
+    hub_agent_guard_enabled: bool = Field(True, env="HUB_AGENT_GUARD_ENABLED")
+    hub_agent_concurrency_initial: int = Field(20, env="HUB_AGENT_CONCURRENCY_INITIAL")
+    hub_agent_concurrency_max: int = Field(200, env="HUB_AGENT_CONCURRENCY_MAX")
+    hub_agent_breaker_failure_ratio: float = Field(
+        0.5, env="HUB_AGENT_BREAKER_FAILURE_RATIO"
+    )
+    hub_agent_breaker_min_calls: int = Field(20, env="HUB_AGENT_BREAKER_MIN_CALLS")
+    hub_agent_breaker_open_seconds: float = Field(
+        30.0, env="HUB_AGENT_BREAKER_OPEN_SECONDS"
+    )
+    hub_session_storage: str = Field("json", env="HUB_SESSION_STORAGE")
+    hub_event_index_ttl: int = Field(86400, env="HUB_EVENT_INDEX_TTL")
+    hub_session_sliding_ttl: Optional[int] = Field(None, env="HUB_SESSION_SLIDING_TTL")
+    metrics_max_tenants: int = Field(500, env="METRICS_MAX_TENANTS")
+    metrics_tenant_allowlist: List[str] = Field(
+        default_factory=list, env="METRICS_TENANT_ALLOWLIST"
+    )
+    metrics_max_event_types: int = Field(50, env="METRICS_MAX_EVENT_TYPES")
+    metrics_max_series: int = Field(10000, env="METRICS_MAX_SERIES")
+    metrics_cache_ttl: float = Field(5.0, env="METRICS_CACHE_TTL")
+    web_concurrency: int = Field(1, env="WEB_CONCURRENCY")
 
-    @field_validator("kafka_brokers", mode="before")
+    @field_validator("kafka_brokers", "metrics_tenant_allowlist", mode="before")
     @classmethod
-    def _split_brokers(cls, value):
+    def _split_csv(cls, value):
         if isinstance(value, str):
-            return [broker.strip() for broker in value.split(",") if broker.strip()]
+            return [item.strip() for item in value.split(",") if item.strip()]
         return value
 
     class Config:
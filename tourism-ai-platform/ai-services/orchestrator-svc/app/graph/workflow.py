@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
 from langgraph.checkpoint.memory import MemorySaver
+
 try:
     from langgraph.checkpoint.redis import RedisSaver  # type: ignore
 except ImportError:  # pragma: no cover
@@ -12,6 +13,8 @@ except ImportError:  # pragma: no cover
 from langgraph.graph import END, StateGraph
 from opentelemetry import trace
 
+from ai_services.hub_core.deadline import check_deadline
+
 from ..filters.phi_redaction import redact_payload, redact_text
 from ..middleware.langsmith_trace import LangsmithTracer
 from ..tools.amadeus import AmadeusTool
@@ -76,6 +79,7 @@ def configure_workflow_dependencies(
 
 
 async def _with_span(node_name: str, state: JourneyState, handler):
+    check_deadline(f"workflow node {node_name}")
     async with langsmith_tracer.trace(node_name, state.case_id):
         with tracer.start_as_current_span(f"node.{node_name}") as span:
             span.set_attribute("case_id", state.case_id)
@@ -86,10 +90,11 @@ async def _with_span(node_name: str, state: JourneyState, handler):
             result = await handler(span)
             if isinstance(result, JourneyState):
                 span.set_attribute("stage.next", result.stage)
+                return result.to_dict()
             return result
 
 
-async def intake_node(state: JourneyState) -> JourneyState:
+async def intake_node(state: JourneyState) -> Dict[str, Any]:
     async def handler(span):
         state.stage = "intake"
         state.status = "intake"
@@ -100,7 +105,10 @@ async def intake_node(state: JourneyState) -> JourneyState:
             try:
                 payload = await doctor365_tool.start_tourism_agent(
                     state.case_id,
-                    {"tenantId": state.tenant_id, "intake": redact_payload(state.intake)},
+                    {
+                        "tenantId": state.tenant_id,
+                        "intake": redact_payload(state.intake),
+                    },
                 )
                 span.set_attribute("d365.sessionId", payload.get("sessionId", ""))
             except Exception as exc:  # pragma: no cover
@@ -114,7 +122,7 @@ async def intake_node(state: JourneyState) -> JourneyState:
     return await _with_span("intake", state, handler)
 
 
-async def eligibility_node(state: JourneyState) -> JourneyState:
+async def eligibility_node(state: JourneyState) -> Dict[str, Any]:
     async def handler(span):
         metrics = state.intake.get("metrics", {})
         bmi = metrics.get("bmi", 24)
@@ -123,7 +131,11 @@ async def eligibility_node(state: JourneyState) -> JourneyState:
             "status": status,
             "bmi": bmi,
             "notes": [
-                "BMI within acceptable range" if status == "eligible" else "BMI requires clinical oversight"
+                (
+                    "BMI within acceptable range"
+                    if status == "eligible"
+                    else "BMI requires clinical oversight"
+                )
             ],
         }
         if status != "eligible":
@@ -137,7 +149,7 @@ async def eligibility_node(state: JourneyState) -> JourneyState:
     return await _with_span("eligibility", state, handler)
 
 
-async def provider_match_node(state: JourneyState) -> JourneyState:
+async def provider_match_node(state: JourneyState) -> Dict[str, Any]:
     async def handler(span):
         preferences = state.intake.get("travelPreferences", {})
         provider_payload = {
@@ -148,7 +160,11 @@ async def provider_match_node(state: JourneyState) -> JourneyState:
                 "language_support": ["en", "tr"],
             },
             "alternatives": [
-                {"id": "provider-ankara-1", "name": "Ankara Ortho Center", "score": 0.88}
+                {
+                    "id": "provider-ankara-1",
+                    "name": "Ankara Ortho Center",
+                    "score": 0.88,
+                }
             ],
             "preferences": preferences,
         }
@@ -168,7 +184,7 @@ async def provider_match_node(state: JourneyState) -> JourneyState:
     return await _with_span("provider_match", state, handler)
 
 
-async def pricing_node(state: JourneyState) -> JourneyState:
+async def pricing_node(state: JourneyState) -> Dict[str, Any]:
     async def handler(span):
         base_price = 6200
         travel_allowance = 900
@@ -197,14 +213,16 @@ async def pricing_node(state: JourneyState) -> JourneyState:
     return await _with_span("pricing", state, handler)
 
 
-async def travel_node(state: JourneyState) -> JourneyState:
+async def travel_node(state: JourneyState) -> Dict[str, Any]:
     async def handler(span):
         flights: Dict[str, Any] = {}
         hotels: Dict[str, Any] = {}
         preferences = state.intake.get("travelPreferences", {})
         try:
             if amadeus_tool:
-                flights = await amadeus_tool.search_flights({"preferences": preferences})
+                flights = await amadeus_tool.search_flights(
+                    {"preferences": preferences}
+                )
                 hotels = await amadeus_tool.search_hotels({"preferences": preferences})
         except Exception as exc:  # pragma: no cover
             logger.warning("Amadeus search fallback: %s", exc)
@@ -235,7 +253,7 @@ async def travel_node(state: JourneyState) -> JourneyState:
     return await _with_span("travel", state, handler)
 
 
-async def docs_visa_node(state: JourneyState) -> JourneyState:
+async def docs_visa_node(state: JourneyState) -> Dict[str, Any]:
     async def handler(span):
         documents = [
             {"name": "Passport copy", "status": "required"},
@@ -251,7 +269,9 @@ async def docs_visa_node(state: JourneyState) -> JourneyState:
             sample_key = f"{state.case_id}/checklist.json"
             try:
                 await s3_tool.upload(sample_key, b"{}", content_type="application/json")
-                presigned = await s3_tool.generate_presigned_url(sample_key, expires=3600)
+                presigned = await s3_tool.generate_presigned_url(
+                    sample_key, expires=3600
+                )
                 state.docs["uploadLink"] = presigned
             except Exception as exc:  # pragma: no cover
                 logger.debug("S3 upload skipped: %s", exc)
@@ -259,13 +279,15 @@ async def docs_visa_node(state: JourneyState) -> JourneyState:
         state.status = "docs"
         state.touch()
         await _persist_checkpoint(state)
-        await _emit(DOC_TOPIC, state, {"documents": redact_payload({"items": documents})})
+        await _emit(
+            DOC_TOPIC, state, {"documents": redact_payload({"items": documents})}
+        )
         return state
 
     return await _with_span("docs_visa", state, handler)
 
 
-async def approvals_node(state: JourneyState) -> JourneyState:
+async def approvals_node(state: JourneyState) -> Dict[str, Any]:
     async def handler(span):
         state.approvals = []
         if state.red_flags:
@@ -291,17 +313,22 @@ async def approvals_node(state: JourneyState) -> JourneyState:
     return await _with_span("approvals", state, handler)
 
 
-def approvals_branch(state: JourneyState) -> str:
-    if state.approvals:
+def approvals_branch(state: JourneyState | Dict[str, Any]) -> str:
+    approvals = state.get("approvals") if isinstance(state, dict) else state.approvals
+    if approvals:
         return "awaiting"
     return "continue"
 
 
-async def itinerary_node(state: JourneyState) -> JourneyState:
+async def itinerary_node(state: JourneyState) -> Dict[str, Any]:
     async def handler(span):
         start = datetime.utcnow() + timedelta(days=22)
         itinerary = [
-            {"id": "consult-1", "title": "Pre-op consultation", "start": start.isoformat()},
+            {
+                "id": "consult-1",
+                "title": "Pre-op consultation",
+                "start": start.isoformat(),
+            },
             {
                 "id": "surgery",
                 "title": redact_text(state.intake.get("targetProcedure", "Procedure")),
@@ -318,7 +345,7 @@ async def itinerary_node(state: JourneyState) -> JourneyState:
     return await _with_span("itinerary", state, handler)
 
 
-async def aftercare_node(state: JourneyState) -> JourneyState:
+async def aftercare_node(state: JourneyState) -> Dict[str, Any]:
     async def handler(span):
         state.aftercare = {
             "virtual_followups": 3,
@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 # Ensure the shared ai_services package is available when running via uvicorn
 BASE_DIR = Path(__file__).resolve().parents[2]
@@ -11,10 +11,16 @@ if str(BASE_DIR) not in sys.path:
     sys.path.append(str(BASE_DIR))
 
 from ai_services.hub_core import (
+    CachedExposition,
     ContextManager,
     HubRouter as CoreHubRouter,
+    HubWorker,
     MetricsCollector,
     RegistryClient,
+    cleanup_dead_workers,
+    mark_worker_dead,
+    multiprocess_dir,
+    multiprocess_registry,
 )
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -24,14 +30,31 @@ from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExport
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry
 
 from .config import get_settings
 from .graph.workflow import compile_workflow, configure_workflow_dependencies
+from .middleware.deadline import DeadlineMiddleware
 from .middleware.langsmith_trace import LangsmithTracer
 from .middleware.tenant_context import TenantContextMiddleware
 from .routers import agents_router, hub_router, orchestrator_router
-from .services import AgentExecutor, EventBus, HubRegistry, TenantContextService
+from .services import (
+    AdaptiveConcurrencyLimit,
+    AgentConnectionPools,
+    AgentExecutor,
+    AgentGuard,
+    AgentLoadBalancer,
+    AgentResponseCache,
+    CircuitBreaker,
+    ClientPresence,
+    EventBus,
+    HubRegistry,
+    PostDispatchPipeline,
+    RateLimit,
+    TenantContextService,
+    TenantRateLimiter,
+    TenantScheduler,
+)
 from .tools.amadeus import AmadeusTool
 from .tools.d365 import Doctor365Tool
 from .tools.s3 import S3Tool
@@ -60,6 +83,11 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(
+        DeadlineMiddleware,
+        route_timeouts=settings.hub_route_timeouts,
+        max_timeout=settings.hub_max_request_timeout,
+    )
     app.add_middleware(TenantContextMiddleware)
 
     redis_store = RedisStore(settings.redis_url, namespace=settings.graph_namespace)
@@ -73,18 +101,55 @@ def create_app() -> FastAPI:
         settings.s3_secret_key,
         settings.s3_bucket,
     )
-    context_manager = ContextManager(settings.redis_url, namespace=settings.hub_namespace)
+    metrics_registry = CollectorRegistry()
+    metrics = MetricsCollector(
+        metrics_registry,
+        max_tenants=settings.metrics_max_tenants,
+        tenant_allowlist=settings.metrics_tenant_allowlist,
+        max_event_types=settings.metrics_max_event_types,
+        max_series=settings.metrics_max_series,
+        # In multi-process mode the limits are shared by every worker of the pod.
+        workers=settings.web_concurrency if multiprocess_dir() else 1,
+    )
+    context_manager = ContextManager(
+        settings.redis_url,
+        namespace=settings.hub_namespace,
+        local_cache_size=settings.hub_context_cache_size,
+        local_cache_ttl=settings.hub_context_cache_ttl,
+        session_storage=settings.hub_session_storage,
+        session_sliding_ttl=settings.hub_session_sliding_ttl,
+        event_index_ttl=settings.hub_event_index_ttl,
+        metrics=metrics,
+    )
     registry_client = RegistryClient(
         settings.hub_registry_url,
         api_key=settings.hub_registry_api_key,
         context_manager=context_manager,
+        negative_ttl=int(settings.hub_negative_cache_ttl),
+        early_refresh_beta=settings.hub_cache_early_refresh_beta,
+    )
+    hub_registry = HubRegistry(
+        client=registry_client,
+        refresh_interval=settings.hub_registry_refresh_interval,
+        metrics=metrics,
+        context_manager=context_manager,
+        namespace=settings.hub_namespace,
+        tenant_ttl=settings.hub_registry_tenant_ttl,
+        negative_ttl=settings.hub_negative_cache_ttl,
+        early_refresh_beta=settings.hub_cache_early_refresh_beta,
     )
-    metrics = MetricsCollector()
-    hub_registry = HubRegistry(client=registry_client)
     tenant_context = TenantContextService(
         context_manager=context_manager,
         registry_client=registry_client,
         default_ttl=settings.hub_default_ttl,
+        negative_ttl=settings.hub_negative_cache_ttl,
+    )
+    client_presence = ClientPresence(
+        context_manager=context_manager,
+        namespace=settings.hub_namespace,
+        client_ttl=settings.hub_client_ttl,
+        flush_interval=settings.hub_client_flush_interval,
+        sweep_interval=settings.hub_client_sweep_interval,
     )
     event_bus = EventBus(
         kafka_producer=kafka_producer,
@@ -93,19 +158,103 @@ def create_app() -> FastAPI:
         redis_stream=settings.hub_redis_stream,
         hub_topic_suffix=settings.hub_topic_suffix,
     )
+    scheduler = (
+        TenantScheduler(
+            max_concurrency=settings.hub_scheduler_max_concurrency,
+            tenant_concurrency=settings.hub_scheduler_tenant_concurrency or None,
+            tenant_resolver=tenant_context.get_tenant,
+            metrics=metrics,
+        )
+        if settings.hub_scheduler_max_concurrency > 0
+        else None
+    )
+    response_cache = (
+        AgentResponseCache(
+            context_manager=context_manager,
+            namespace=settings.hub_namespace,
+            local_size=settings.hub_agent_cache_local_size,
+            default_ttl=settings.hub_agent_cache_default_ttl,
+            metrics=metrics,
+        )
+        if settings.hub_agent_cache_enabled
+        else None
+    )
+    agent_pools = AgentConnectionPools(
+        timeout=settings.hub_agent_timeout,
+        connect_timeout=settings.hub_agent_connect_timeout,
+        max_connections=settings.hub_agent_max_connections,
+        max_keepalive=settings.hub_agent_max_keepalive,
+        http2=settings.hub_agent_http2,
+        metrics=metrics,
+    )
     agent_executor = AgentExecutor(
         tenant_context=tenant_context,
         registry=hub_registry,
         event_bus=event_bus,
         metrics=metrics,
+        pools=agent_pools,
+        balancer=AgentLoadBalancer(
+            pools=agent_pools,
+            failure_threshold=settings.hub_agent_failure_threshold,
+            probe_interval=settings.hub_agent_probe_interval,
+            hedge=settings.hub_agent_hedge,
+            hedge_quantile=settings.hub_agent_hedge_quantile,
+            metrics=metrics,
+        ),
+        scheduler=scheduler,
+        guard=(
+            AgentGuard(
+                limit_factory=lambda: AdaptiveConcurrencyLimit(
+                    initial=settings.hub_agent_concurrency_initial,
+                    max_limit=settings.hub_agent_concurrency_max,
+                ),
+                breaker_factory=lambda: CircuitBreaker(
+                    min_calls=settings.hub_agent_breaker_min_calls,
+                    failure_ratio=settings.hub_agent_breaker_failure_ratio,
+                    open_for=settings.hub_agent_breaker_open_seconds,
+                ),
+                metrics=metrics,
+            )
+            if settings.hub_agent_guard_enabled
+            else None
+        ),
+        cache=response_cache,
+        post_dispatch=PostDispatchPipeline(
+            workers=settings.hub_post_dispatch_workers,
+            max_queue=settings.hub_post_dispatch_queue_size,
+            sync=settings.hub_post_dispatch_sync,
+            metrics=metrics,
+        ),
     )
-    hub_router = CoreHubRouter(
+    hub_registry.add_agents_listener(agent_executor.warm_pools)
+    if response_cache is not None:
+        hub_registry.add_agents_listener(response_cache.observe_agents)
+    core_hub_router = CoreHubRouter(
         registry=hub_registry,
         context_manager=context_manager,
         metrics=metrics,
         agent_executor=agent_executor,
         event_bus=event_bus,
         persist_stream=settings.hub_redis_stream,
+        dispatch_mode=settings.hub_dispatch_mode,
+        scatter_timeout=settings.hub_scatter_timeout,
+        route_by_intent=settings.hub_route_by_intent,
+        route_by_channel=settings.hub_route_by_channel,
+    )
+
+    async def worker_tenants() -> List[str]:
+        return [tenant.id for tenant in await hub_registry.list_tenants()]
+
+    hub_worker = HubWorker(
+        context_manager=context_manager,
+        hub_router=core_hub_router,
+        tenant_source=worker_tenants,
+        metrics=metrics,
+        stream=settings.hub_redis_stream,
+        group=settings.hub_worker_group,
+        concurrency=settings.hub_worker_concurrency,
+        claim_idle=settings.hub_worker_claim_idle,
+        max_deliveries=settings.hub_worker_max_deliveries,
     )
 
     configure_workflow_dependencies(
@@ -128,11 +277,41 @@ def create_app() -> FastAPI:
     app.state.registry_client = registry_client
     app.state.metrics_collector = metrics
     app.state.hub_registry = hub_registry
+    app.state.client_presence = client_presence
+    app.state.metrics = metrics
+    if multiprocess_dir():
+        # Several workers share this pod: expose the samples of all of them.
+        app.state.metrics_exposition = CachedExposition(
+            multiprocess_registry(), ttl=settings.metrics_cache_ttl
+        )
+    else:
+        app.state.metrics_exposition = CachedExposition(
+            REGISTRY, metrics_registry, ttl=settings.metrics_cache_ttl
+        )
     app.state.tenant_context = tenant_context
     app.state.event_bus = event_bus
     app.state.agent_executor = agent_executor
-    app.state.hub_router = hub_router
+    app.state.response_cache = response_cache
+    app.state.hub_router = core_hub_router
     app.state.hub_stream = settings.hub_redis_stream
+    app.state.hub_worker = hub_worker
+    app.state.rate_limiter = (
+        TenantRateLimiter(
+            context_manager=context_manager,
+            defaults={
+                route_class: RateLimit(
+                    rate=float(limit["rate"]), burst=int(limit["burst"])
+                )
+                for route_class, limit in settings.hub_rate_limits.items()
+            },
+            tenant_resolver=tenant_context.get_tenant,
+            namespace=settings.hub_namespace,
+            lease_size=settings.hub_rate_limit_lease_size,
+            metrics=metrics,
+        )
+        if settings.hub_rate_limit_enabled
+        else None
+    )
 
     app.state.graph = compile_workflow(
         redis_url=settings.redis_url,
@@ -141,15 +320,25 @@ def create_app() -> FastAPI:
 
     @app.on_event("startup")
     async def startup() -> None:
+        if multiprocess_dir():
+            cleanup_dead_workers()
         await asyncio.gather(
             app.state.redis_store.connect(),
             app.state.kafka_producer.start(),
             app.state.context_manager.connect(),
             app.state.hub_registry.refresh(force=True),
         )
+        await app.state.hub_registry.start()
+        await app.state.client_presence.start()
+        await app.state.agent_executor.start()
+        if settings.hub_worker_enabled:
+            await app.state.hub_worker.start()
 
     @app.on_event("shutdown")
     async def shutdown() -> None:
+        await app.state.hub_worker.stop()
+        await app.state.hub_registry.stop()
+        await app.state.client_presence.stop()
         await app.state.kafka_producer.stop()
         await app.state.redis_store.close()
         await app.state.context_manager.close()
@@ -157,6 +346,7 @@ def create_app() -> FastAPI:
         await app.state.amadeus_tool.close()
         await app.state.agent_executor.close()
         await app.state.registry_client.close()
+        mark_worker_dead()
 
     @app.get("/health")
     async def health():
@@ -164,7 +354,9 @@ def create_app() -> FastAPI:
 
     @app.get("/metrics")
     async def metrics() -> Response:
-        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+        return Response(
+            app.state.metrics_exposition.render(), media_type=CONTENT_TYPE_LATEST
+        )
 
     app.include_router(hub_router)
     app.include_router(agents_router)
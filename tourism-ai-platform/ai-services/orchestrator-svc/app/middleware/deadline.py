@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ai_services.hub_core.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    deadline_scope,
+    parse_timeout,
+)
+
+from ..services.rate_limiter import classify_route
+
+TIMEOUT_HEADER = "x-request-timeout"
+
+
+class DeadlineMiddleware:
+    """Set the request deadline from ``X-Request-Timeout`` or the route default.
+
+    The deadline is visible to everything the request awaits through
+    :mod:`ai_services.hub_core.deadline`. When it passes the request is
+    cancelled and answered with ``504`` if no response has started yet.
+    Route defaults are keyed by rate-limit route class; classes without a
+    default (and exempt paths such as ``/health``) only get a deadline when the
+    client sends the header. ``max_timeout`` caps what clients may ask for.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        route_timeouts: Optional[Dict[str, float]] = None,
+        max_timeout: float = 300.0,
+    ) -> None:
+        self.app = app
+        self._route_timeouts = route_timeouts or {}
+        self._max_timeout = max_timeout
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        seconds = self._timeout_for(scope)
+        if seconds is None:
+            await self.app(scope, receive, send)
+            return
+
+        started = False
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        deadline = Deadline.after(seconds)
+        with deadline_scope(deadline):
+            try:
+                async with asyncio.timeout(seconds):
+                    await self.app(scope, receive, send_tracking)
+                return
+            except (TimeoutError, DeadlineExceeded):
+                if started:
+                    raise
+        response = JSONResponse(
+            {"detail": "Request deadline exceeded"}, status_code=504
+        )
+        await response(scope, receive, send)
+
+    def _timeout_for(self, scope: Scope) -> Optional[float]:
+        requested = parse_timeout(Headers(scope=scope).get(TIMEOUT_HEADER))
+        if requested is not None:
+            return min(requested, self._max_timeout)
+        route_class = classify_route(scope["method"], scope["path"])
+        if route_class is None:
+            return None
+        default = self._route_timeouts.get(route_class)
+        return default if default and default > 0 else None
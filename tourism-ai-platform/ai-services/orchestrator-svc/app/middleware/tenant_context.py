@@ -1,40 +1,88 @@
 from __future__ import annotations
 
+import math
 from typing import Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from opentelemetry import trace
 
+from ..services.rate_limiter import classify_route
+
 TENANT_HEADER = "x-tenant"
 
 
-class TenantContextMiddleware(BaseHTTPMiddleware):
-    """Inject tenant information into request state for orchestrator routes."""
+class TenantContextMiddleware:
+    """Inject tenant information into request state for orchestrator routes.
+
+    Pure ASGI so responses, including streaming and SSE bodies, pass through
+    untouched; only the ``http.response.start`` message is amended with the
+    ``X-Tenant`` header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tenant_id = self._resolve_tenant(scope) or "system"
+        scope.setdefault("state", {})["tenant_id"] = tenant_id
+        scope["tenant_id"] = tenant_id
+        self._annotate_trace(tenant_id)
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        tenant_id = self._resolve_tenant(request) or "system"
-        if tenant_id:
-            request.state.tenant_id = tenant_id
-            request.scope["tenant_id"] = tenant_id
-            self._annotate_trace(tenant_id)
-        response = await call_next(request)
-        if tenant_id:
-            response.headers.setdefault("X-Tenant", tenant_id)
-        return response
+        limited = await self._enforce_rate_limit(scope, tenant_id)
+        if limited is not None:
+            await limited(scope, receive, send)
+            return
 
-    def _resolve_tenant(self, request: Request) -> Optional[str]:
-        header = request.headers.get(TENANT_HEADER) or request.headers.get(TENANT_HEADER.upper())
+        async def send_with_tenant(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if "x-tenant" not in headers:
+                    headers.append("X-Tenant", tenant_id)
+            await send(message)
+
+        await self.app(scope, receive, send_with_tenant)
+
+    @staticmethod
+    def _resolve_tenant(scope: Scope) -> Optional[str]:
+        header = Headers(scope=scope).get(TENANT_HEADER)
         if header:
             return header
         # Fallback to JSON payload fields if header is missing
-        tenant_from_scope = request.scope.get("tenant_id")
+        tenant_from_scope = scope.get("tenant_id")
         if isinstance(tenant_from_scope, str):
             return tenant_from_scope
         return None
 
+    @staticmethod
+    async def _enforce_rate_limit(
+        scope: Scope, tenant_id: str
+    ) -> Optional[JSONResponse]:
+        app = scope.get("app")
+        limiter = getattr(getattr(app, "state", None), "rate_limiter", None)
+        if limiter is None:
+            return None
+        route_class = classify_route(scope["method"], scope["path"])
+        if route_class is None:
+            return None
+        decision = await limiter.check(tenant_id, route_class)
+        if decision.allowed:
+            return None
+        return JSONResponse(
+            {"detail": "Rate limit exceeded", "routeClass": route_class},
+            status_code=429,
+            headers={
+                "Retry-After": str(max(1, math.ceil(decision.retry_after))),
+                "X-Tenant": tenant_id,
+            },
+        )
+
     @staticmethod
     def _annotate_trace(tenant_id: str) -> None:
         span = trace.get_current_span()
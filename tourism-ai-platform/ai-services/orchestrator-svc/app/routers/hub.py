@@ -2,27 +2,29 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel, Field
 
 from ai_services.hub_core import ContextManager, HubRouter
 
+from ..config import get_settings
+from ..services.client_presence import ClientPresence
 from ..services.hub_registry import HubRegistry
 
 router = APIRouter(prefix="/hub", tags=["Hub"])
 
-@router.get("/agents")
-async def list_agents(
-    request: Request,
-    registry: HubRegistry = Depends(get_hub_registry),
-) -> Dict[str, Any]:
-    tenant_id = getattr(request.state, "tenant_id", "system")
-    agents = await registry.list_agents(tenant_id)
-    return {
-        "tenantId": tenant_id,
-        "agents": [agent.model_dump(mode="json", by_alias=True) for agent in agents],
-    }
+
+class ReplayRangeRequest(BaseModel):
+    start: datetime
+    end: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    limit: int = Field(1000, ge=1, le=10000)
+    rate: float = Field(50.0, gt=0)
+    event_types: Optional[List[str]] = Field(default=None, alias="eventTypes")
+
+    class Config:
+        populate_by_name = True
 
 
 def get_hub_router(request: Request) -> HubRouter:
@@ -39,6 +41,13 @@ def get_hub_registry(request: Request) -> HubRegistry:
     return registry
 
 
+def get_client_presence(request: Request) -> ClientPresence:
+    presence = getattr(request.app.state, "client_presence", None)
+    if presence is None:
+        raise HTTPException(status_code=500, detail="Client presence unavailable")
+    return presence
+
+
 def get_context_manager(request: Request) -> ContextManager:
     manager = getattr(request.app.state, "context_manager", None)
     if manager is None:
@@ -46,16 +55,73 @@ def get_context_manager(request: Request) -> ContextManager:
     return manager
 
 
+@router.get("/agents")
+async def list_agents(
+    request: Request,
+    registry: HubRegistry = Depends(get_hub_registry),
+) -> Dict[str, Any]:
+    tenant_id = getattr(request.state, "tenant_id", "system")
+    agents = await registry.list_agents(tenant_id)
+    return {
+        "tenantId": tenant_id,
+        "agents": [agent.model_dump(mode="json", by_alias=True) for agent in agents],
+    }
+
+
 @router.post("/events/publish")
-async def publish_event(event: Dict[str, Any], router: HubRouter = Depends(get_hub_router)) -> Dict[str, Any]:
+async def publish_event(
+    event: Dict[str, Any], router: HubRouter = Depends(get_hub_router)
+) -> Dict[str, Any]:
     event = dict(event)
     event.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
     return await router.handle_rest_payload(event)
 
 
+@router.post("/events/publish:batch")
+async def publish_events(
+    events: List[Dict[str, Any]],
+    router: HubRouter = Depends(get_hub_router),
+    settings=Depends(get_settings),
+) -> Dict[str, Any]:
+    if len(events) > settings.hub_batch_max_events:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.hub_batch_max_events} events",
+        )
+    timestamp = datetime.now(timezone.utc).isoformat()
+    payloads = []
+    for event in events:
+        event = dict(event)
+        event.setdefault("timestamp", timestamp)
+        payloads.append(event)
+    return await router.handle_rest_batch(payloads)
+
+
+@router.post("/events/replay")
+async def replay_events(
+    body: ReplayRangeRequest,
+    request: Request,
+    router: HubRouter = Depends(get_hub_router),
+) -> Dict[str, Any]:
+    if body.end < body.start:
+        raise HTTPException(status_code=422, detail="end must not precede start")
+    return await router.replay_range(
+        request.state.tenant_id,
+        body.start,
+        body.end,
+        limit=body.limit,
+        rate=body.rate,
+        event_types=body.event_types,
+    )
+
+
 @router.post("/events/{event_id}/replay")
-async def replay_event(event_id: str, router: HubRouter = Depends(get_hub_router)) -> Dict[str, Any]:
-    result = await router.replay_event(event_id)
+async def replay_event(
+    event_id: str,
+    request: Request,
+    router: HubRouter = Depends(get_hub_router),
+) -> Dict[str, Any]:
+    result = await router.replay_event(event_id, request.state.tenant_id)
     if result is None:
         raise HTTPException(status_code=404, detail="Event not found")
     return result
@@ -72,7 +138,9 @@ async def list_registry(
 
 
 @router.get("/tenants")
-async def list_tenants(registry: HubRegistry = Depends(get_hub_registry)) -> List[Dict[str, Any]]:
+async def list_tenants(
+    registry: HubRegistry = Depends(get_hub_registry),
+) -> List[Dict[str, Any]]:
     tenants = await registry.list_tenants()
     return [tenant.model_dump(mode="json", by_alias=True) for tenant in tenants]
 
@@ -101,12 +169,37 @@ async def list_events(
 async def heartbeat_client(
     tenant_id: str,
     client_id: str,
-    registry: HubRegistry = Depends(get_hub_registry),
+    presence: ClientPresence = Depends(get_client_presence),
+) -> Dict[str, str]:
+    await presence.heartbeat(tenant_id, client_id)
+    return {"status": "ok"}
+
+
+@router.delete("/clients/{tenant_id}/{client_id}")
+async def unregister_client(
+    tenant_id: str,
+    client_id: str,
+    presence: ClientPresence = Depends(get_client_presence),
 ) -> Dict[str, str]:
-    registry.heartbeat_client(tenant_id, client_id)
+    await presence.unregister(tenant_id, client_id)
     return {"status": "ok"}
 
 
 @router.get("/clients")
-async def list_clients(registry: HubRegistry = Depends(get_hub_registry)) -> Dict[str, Any]:
-    return registry.list_clients()
+async def list_clients(
+    presence: ClientPresence = Depends(get_client_presence),
+) -> Dict[str, Any]:
+    return await presence.list_clients()
+
+
+@router.get("/clients/{tenant_id}")
+async def page_clients(
+    tenant_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    presence: ClientPresence = Depends(get_client_presence),
+) -> Dict[str, Any]:
+    try:
+        return await presence.page_clients(tenant_id, cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -1,13 +1,33 @@
 """Service layer components for the orchestrator."""
 
 from .agent_executor import AgentExecutor
+from .agent_guard import AdaptiveConcurrencyLimit, AgentGuard, CircuitBreaker
+from .agent_pools import AgentConnectionPools
+from .client_presence import ClientPresence
 from .event_bus import EventBus
 from .hub_registry import HubRegistry
+from .load_balancer import AgentLoadBalancer
+from .post_dispatch import PostDispatchPipeline
+from .rate_limiter import RateLimit, TenantRateLimiter
+from .response_cache import AgentResponseCache
+from .scheduler import TenantPolicy, TenantScheduler
 from .tenant_context import TenantContextService
 
 __all__ = [
+    "AdaptiveConcurrencyLimit",
+    "AgentConnectionPools",
     "AgentExecutor",
+    "AgentGuard",
+    "AgentLoadBalancer",
+    "AgentResponseCache",
+    "CircuitBreaker",
+    "ClientPresence",
     "EventBus",
     "HubRegistry",
+    "PostDispatchPipeline",
+    "RateLimit",
     "TenantContextService",
+    "TenantPolicy",
+    "TenantRateLimiter",
+    "TenantScheduler",
 ]
@@ -3,17 +3,29 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Optional
+from functools import partial
+from typing import Any, Dict, List, Optional
 
 import httpx
 
+from ai_services.hub_core.deadline import (
+    TIMEOUT_HEADER,
+    check_deadline,
+    current_deadline,
+)
 from ai_services.hub_core.metrics_collector import MetricsCollector
 from ai_services.interfaces.schemas.agent_schema import AgentSchema
 from ai_services.interfaces.schemas.event_schema import HubEvent
-from ai_services.interfaces.schemas.tenant_schema import TenantSchema
 
+from .agent_guard import AgentGuard
+from .agent_pools import AgentConnectionPools
 from .event_bus import EventBus
 from .hub_registry import HubRegistry
+from .load_balancer import AgentLoadBalancer
+from .post_dispatch import SYNC_SESSION_METADATA_KEY, PostDispatchPipeline
+from .request_body import RequestBodyEncoder
+from .response_cache import AgentResponseCache
+from .scheduler import TenantScheduler
 from .tenant_context import TenantContextService
 
 logger = logging.getLogger(__name__)
@@ -29,19 +41,58 @@ class AgentExecutor:
         registry: HubRegistry,
         event_bus: EventBus,
         metrics: MetricsCollector,
-        http_client: Optional[httpx.AsyncClient] = None,
+        pools: Optional[AgentConnectionPools] = None,
+        balancer: Optional[AgentLoadBalancer] = None,
+        scheduler: Optional[TenantScheduler] = None,
+        guard: Optional[AgentGuard] = None,
+        cache: Optional[AgentResponseCache] = None,
+        post_dispatch: Optional[PostDispatchPipeline] = None,
     ) -> None:
         self._tenant_context = tenant_context
         self._registry = registry
         self._event_bus = event_bus
         self._metrics = metrics
-        self._http_client = http_client or httpx.AsyncClient()
-        self._owns_client = http_client is None
-        self._instrumented_execute = metrics.track_agent(self._metric_labels)(self._execute)
+        self._pools = pools or AgentConnectionPools(metrics=metrics)
+        self._balancer = balancer or AgentLoadBalancer(
+            pools=self._pools, metrics=metrics
+        )
+        self._scheduler = scheduler
+        self._guard = guard
+        self._cache = cache
+        self._post_dispatch = post_dispatch or PostDispatchPipeline(metrics=metrics)
+        self._bodies = RequestBodyEncoder()
+        self._instrumented_execute = metrics.track_agent(self._metric_labels)(
+            self._execute
+        )
+
+    @property
+    def pools(self) -> AgentConnectionPools:
+        return self._pools
+
+    @property
+    def guard(self) -> Optional[AgentGuard]:
+        return self._guard
+
+    @property
+    def balancer(self) -> AgentLoadBalancer:
+        return self._balancer
+
+    @property
+    def post_dispatch(self) -> PostDispatchPipeline:
+        return self._post_dispatch
+
+    async def start(self) -> None:
+        await self._balancer.start()
+        await self._post_dispatch.start()
 
     async def close(self) -> None:
-        if self._owns_client:
-            await self._http_client.aclose()
+        await self._post_dispatch.stop()
+        await self._balancer.stop()
+        await self._pools.close()
+
+    async def warm_pools(self, agents: List[AgentSchema]) -> None:
+        self._balancer.track(agents)
+        await self._pools.warm(agents)
 
     async def execute(
         self,
@@ -53,14 +104,48 @@ class AgentExecutor:
         session_context: Optional[Dict[str, Any]] = None,
         channel: Optional[str] = None,
     ) -> Dict[str, Any]:
-        return await self._instrumented_execute(
+        call = {
+            "agent": agent,
+            "tenant_id": tenant_id,
+            "payload": payload,
+            "event": event,
+            "session_context": session_context,
+            "channel": channel,
+        }
+        capability = payload.get("capability") or event.metadata.get("capability")
+        ttl = (
+            self._cache.ttl_for(agent, capability) if self._cache is not None else None
+        )
+        if ttl is None:
+            return await self._admit(call)
+        result, source = await self._cache.get_or_compute(
             agent=agent,
             tenant_id=tenant_id,
+            capability=capability,
             payload=payload,
-            event=event,
-            session_context=session_context,
-            channel=channel,
+            ttl=ttl,
+            compute=lambda: self._admit(call),
         )
+        if source != "agent":
+            # Served without calling the agent: still answer on the bus for this event.
+            await self._post_dispatch.submit(
+                self._session_key(tenant_id, event),
+                "response",
+                partial(self._emit_response, tenant_id, agent, event, result),
+            )
+        return result
+
+    async def _admit(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        if self._scheduler is None:
+            return await self._guarded_execute(call)
+        async with self._scheduler.slot(call["tenant_id"]):
+            return await self._guarded_execute(call)
+
+    async def _guarded_execute(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        if self._guard is None:
+            return await self._instrumented_execute(**call)
+        async with self._guard.call(call["agent"].name):
+            return await self._instrumented_execute(**call)
 
     async def _execute(
         self,
@@ -77,8 +162,10 @@ class AgentExecutor:
             agent = registry_agent
         tenant = await self._tenant_context.get_tenant(tenant_id)
         if tenant is None:
-            logger.warning("tenant_id=%s agent=%s not registered", tenant_id, agent.name)
-        request_body = self._build_request_body(
+            logger.warning(
+                "tenant_id=%s agent=%s not registered", tenant_id, agent.name
+            )
+        request_body = self._bodies.encode(
             agent=agent,
             tenant_id=tenant_id,
             payload=payload,
@@ -87,6 +174,15 @@ class AgentExecutor:
             session_context=session_context,
             channel=channel,
         )
+        headers = {
+            "Content-Type": "application/json",
+            "X-Tenant-ID": tenant_id,
+            "X-Agent-Name": agent.name,
+        }
+        check_deadline(f"running agent {agent.name}")
+        deadline = current_deadline()
+        if deadline is not None:
+            headers[TIMEOUT_HEADER] = deadline.header_value()
         logger.info(
             "Dispatching agent run tenant_id=%s agent=%s channel=%s",
             tenant_id,
@@ -94,14 +190,11 @@ class AgentExecutor:
             channel or event.channel,
         )
         try:
-            response = await self._http_client.post(
-                f"{agent.endpoint}/run",
-                json=request_body,
-                headers={
-                    "X-Tenant-ID": tenant_id,
-                    "X-Agent-Name": agent.name,
-                },
-                timeout=60.0,
+            response = await self._balancer.send(
+                agent,
+                "/run",
+                content=request_body,
+                headers=headers,
             )
             response.raise_for_status()
         except httpx.HTTPStatusError as exc:
@@ -122,44 +215,51 @@ class AgentExecutor:
             )
             raise
         result = response.json()
-        await self._persist_session_state(tenant_id, event, result)
+        await self._after_dispatch(tenant_id, agent, event, result)
+        return result
+
+    async def _after_dispatch(
+        self,
+        tenant_id: str,
+        agent: AgentSchema,
+        event: HubEvent,
+        result: Dict[str, Any],
+    ) -> None:
+        """Queue the session write and response event; ``syncSession`` waits for the write.
+
+        A synchronous write still goes through the session's shard so it runs
+        after, not before, writes already queued for the same session.
+        """
+
+        key = self._session_key(tenant_id, event)
+        persist = partial(self._persist_session_state, tenant_id, event, result)
+        if event.metadata.get(SYNC_SESSION_METADATA_KEY):
+            await self._post_dispatch.run(key, "session", persist)
+        else:
+            await self._post_dispatch.submit(key, "session", persist)
+        await self._post_dispatch.submit(
+            key,
+            "response",
+            partial(self._emit_response, tenant_id, agent, event, result),
+        )
+
+    async def _emit_response(
+        self,
+        tenant_id: str,
+        agent: AgentSchema,
+        event: HubEvent,
+        result: Dict[str, Any],
+    ) -> None:
         await self._event_bus.emit_agent_response(
             tenant_id=tenant_id,
             agent_name=agent.name,
             response=result,
             correlation_id=event.correlation_id or event.id,
         )
-        return result
 
-    def _build_request_body(
-        self,
-        *,
-        agent: AgentSchema,
-        tenant_id: str,
-        payload: Dict[str, Any],
-        event: HubEvent,
-        tenant: Optional[TenantSchema],
-        session_context: Optional[Dict[str, Any]],
-        channel: Optional[str],
-    ) -> Dict[str, Any]:
-        tenant_payload: Dict[str, Any]
-        if tenant is not None:
-            tenant_payload = tenant.model_dump(mode="json", by_alias=True)
-        else:
-            tenant_payload = {"id": tenant_id}
-        request_body = {
-            "agent": {
-                "id": agent.id,
-                "name": agent.name,
-                "capabilities": [cap.model_dump(mode="json") for cap in agent.capabilities],
-            },
-            "tenant": tenant_payload,
-            "event": event.model_dump(mode="json", by_alias=True),
-            "payload": payload,
-            "session": session_context or {},
-            "channel": channel or event.channel or "system",
-        }
-        return request_body
+    @staticmethod
+    def _session_key(tenant_id: str, event: HubEvent) -> str:
+        return f"{tenant_id}:{event.session_id or event.id}"
 
     async def _persist_session_state(
         self,
@@ -173,7 +273,9 @@ class AgentExecutor:
         session_state = result.get("session") or result.get("context")
         if not isinstance(session_state, dict):
             return
-        await self._tenant_context.set_session_state(
+        # Merge only the fields the agent returned so concurrent runs on the
+        # same session do not overwrite each other's fields.
+        await self._tenant_context.update_session_state(
             tenant_id,
             session_id,
             session_state,
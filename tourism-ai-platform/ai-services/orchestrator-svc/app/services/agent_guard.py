@@ -0,0 +1,292 @@
+"""Per-agent adaptive concurrency limits and circuit breakers."""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic, perf_counter
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional
+
+import httpx
+
+from ai_services.hub_core.hub_router import AgentUnavailableError
+from ai_services.hub_core.metrics_collector import MetricsCollector
+
+logger = logging.getLogger(__name__)
+
+Clock = Callable[[], float]
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class AdaptiveConcurrencyLimit:
+    """AIMD concurrency limit driven by latency.
+
+    Each success grows the limit by ``1 / limit`` (one slot per window of
+    ``limit`` successes). A failure, or a latency above ``tolerance`` times the
+    slow-moving average, multiplies the limit by ``backoff``.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff: float = 0.9,
+        tolerance: float = 2.0,
+        smoothing: float = 0.05,
+    ) -> None:
+        self._limit = float(initial)
+        self._min = min_limit
+        self._max = max_limit
+        self._backoff = backoff
+        self._tolerance = tolerance
+        self._smoothing = smoothing
+        self._baseline: Optional[float] = None
+        self.inflight = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        if self.inflight >= self.limit:
+            return False
+        self.inflight += 1
+        return True
+
+    def cancel(self) -> None:
+        self.inflight -= 1
+
+    def release(self, latency: float, *, dropped: bool) -> None:
+        self.inflight -= 1
+        if dropped:
+            self._decrease()
+            return
+        baseline = self._baseline
+        self._baseline = (
+            latency
+            if baseline is None
+            else (self._smoothing * latency + (1 - self._smoothing) * baseline)
+        )
+        if baseline is not None and latency > self._tolerance * baseline:
+            self._decrease()
+        elif self.inflight + 1 >= self._limit / 2:
+            # Only grow while the limit is actually being exercised.
+            self._limit = min(self._max, self._limit + 1.0 / self._limit)
+
+    def _decrease(self) -> None:
+        self._limit = max(self._min, self._limit * self._backoff)
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker with half-open probing.
+
+    Outcomes are counted in ``buckets`` slices of ``window`` seconds. Once the
+    window holds ``min_calls`` calls and the failure ratio reaches
+    ``failure_ratio`` the breaker opens for ``open_for`` seconds, then lets
+    ``half_open_calls`` probes through: all of them succeeding closes it, any
+    failure opens it again.
+
+    Every state change starts a new :attr:`generation`. Callers pass the
+    generation read at admission to :meth:`record`, and outcomes from an
+    older generation are ignored, so a call admitted before the breaker
+    opened cannot complete during half-open and count as a probe.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: float = 30.0,
+        buckets: int = 10,
+        min_calls: int = 20,
+        failure_ratio: float = 0.5,
+        open_for: float = 30.0,
+        half_open_calls: int = 3,
+        clock: Clock = monotonic,
+    ) -> None:
+        self._bucket_width = window / buckets
+        self._buckets: Deque[List[float]] = deque(maxlen=buckets)
+        self._min_calls = min_calls
+        self._failure_ratio = failure_ratio
+        self._open_for = open_for
+        self._half_open_calls = half_open_calls
+        self._clock = clock
+        self._state = CLOSED
+        self._generation = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self._open_for:
+            self._transition(HALF_OPEN)
+            self._probes = 0
+            self._probe_successes = 0
+        return self._state
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._probes < self._half_open_calls:
+            self._probes += 1
+            return True
+        return False
+
+    def release_probe(self, generation: Optional[int] = None) -> None:
+        """Return a half-open probe slot that was granted but never used."""
+
+        if generation is not None and generation != self._generation:
+            return
+        if self._state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record(self, success: bool, generation: Optional[int] = None) -> None:
+        """Count an outcome; pass the ``generation`` read when the call was admitted."""
+
+        if generation is not None and generation != self._generation:
+            return
+        if self._state == HALF_OPEN:
+            if not success:
+                self._open()
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self._half_open_calls:
+                self._transition(CLOSED)
+                self._buckets.clear()
+            return
+        if self._state == OPEN:
+            return
+        bucket = self._bucket()
+        bucket[1 if success else 2] += 1
+        calls = sum(entry[1] + entry[2] for entry in self._buckets)
+        failures = sum(entry[2] for entry in self._buckets)
+        if calls >= self._min_calls and failures / calls >= self._failure_ratio:
+            self._open()
+
+    def _open(self) -> None:
+        self._transition(OPEN)
+        self._opened_at = self._clock()
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        self._generation += 1
+
+    def _bucket(self) -> List[float]:
+        start = self._clock() // self._bucket_width * self._bucket_width
+        horizon = start - self._bucket_width * (self._buckets.maxlen or 1)
+        while self._buckets and self._buckets[0][0] <= horizon:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != start:
+            self._buckets.append([start, 0, 0])
+        return self._buckets[-1]
+
+
+class AgentGuard:
+    """One :class:`AdaptiveConcurrencyLimit` and :class:`CircuitBreaker` per agent.
+
+    Calls beyond the limit or against an open breaker fail fast with
+    :class:`AgentUnavailableError` so callers can queue the work instead of
+    piling up behind a degraded agent. Transport errors and 5xx responses
+    count as failures; other errors (4xx, local failures) only release the slot.
+    """
+
+    def __init__(
+        self,
+        *,
+        limit_factory: Callable[
+            [], AdaptiveConcurrencyLimit
+        ] = AdaptiveConcurrencyLimit,
+        breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+        metrics: Optional[MetricsCollector] = None,
+    ) -> None:
+        self._limit_factory = limit_factory
+        self._breaker_factory = breaker_factory
+        self._metrics = metrics
+        self._limits: Dict[str, AdaptiveConcurrencyLimit] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def limit(self, agent_name: str) -> AdaptiveConcurrencyLimit:
+        limit = self._limits.get(agent_name)
+        if limit is None:
+            limit = self._limits[agent_name] = self._limit_factory()
+        return limit
+
+    def breaker(self, agent_name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(agent_name)
+        if breaker is None:
+            breaker = self._breakers[agent_name] = self._breaker_factory()
+        return breaker
+
+    @asynccontextmanager
+    async def call(self, agent_name: str) -> AsyncIterator[None]:
+        breaker = self.breaker(agent_name)
+        limit = self.limit(agent_name)
+        if not breaker.allow():
+            self._reject(agent_name, "circuit_open")
+        generation = breaker.generation
+        if not limit.try_acquire():
+            breaker.release_probe(generation)
+            self._reject(agent_name, "concurrency_limit")
+        started = perf_counter()
+        success: Optional[bool] = None
+        try:
+            yield
+            success = True
+        except Exception as exc:
+            success = not self._is_failure(exc)
+            raise
+        finally:
+            if success is None:
+                # Cancelled: neither a success nor a failure of the agent.
+                limit.cancel()
+                breaker.release_probe(generation)
+            else:
+                limit.release(perf_counter() - started, dropped=not success)
+                breaker.record(success, generation)
+            self._export(agent_name)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        return {
+            name: {
+                "state": self.breaker(name).state,
+                "limit": limit.limit,
+                "inflight": limit.inflight,
+            }
+            for name, limit in self._limits.items()
+        }
+
+    @staticmethod
+    def _is_failure(exc: BaseException) -> bool:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code >= 500 or exc.response.status_code == 429
+        return isinstance(exc, httpx.RequestError)
+
+    def _reject(self, agent_name: str, reason: str) -> None:
+        if self._metrics is not None:
+            self._metrics.agent_guard_rejections_total.labels(
+                agent_name=agent_name, reason=reason
+            ).inc()
+        self._export(agent_name)
+        raise AgentUnavailableError(agent_name, reason)
+
+    def _export(self, agent_name: str) -> None:
+        if self._metrics is None:
+            return
+        self._metrics.agent_circuit_state.labels(agent_name=agent_name).set(
+            _STATE_VALUES[self.breaker(agent_name).state]
+        )
+        self._metrics.agent_concurrency_limit.labels(agent_name=agent_name).set(
+            self.limit(agent_name).limit
+        )
@@ -0,0 +1,283 @@
+"""Per-agent-host HTTP connection pools for agent execution."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Dict, Iterable, Optional, Set
+
+import httpx
+
+from ai_services.hub_core.deadline import DeadlineExceeded, current_deadline
+from ai_services.hub_core.metrics_collector import MetricsCollector
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AgentHttpSettings:
+    """HTTP settings for one agent, from ``AgentSchema.metadata.http``.
+
+    Recognised keys: ``timeout``, ``connectTimeout``, ``maxConnections``,
+    ``maxKeepalive`` and ``http2``. Pool limits apply to the pool for the
+    agent's host and are fixed by the first agent that creates it.
+    """
+
+    timeout: float
+    connect_timeout: float
+    max_connections: int
+    max_keepalive: int
+    http2: bool
+
+    @classmethod
+    def resolve(
+        cls, agent: AgentSchema, defaults: "AgentHttpSettings"
+    ) -> "AgentHttpSettings":
+        overrides = agent.metadata.get("http")
+        if not isinstance(overrides, dict):
+            return defaults
+
+        def number(key: str, fallback: float, cast: type = float) -> Any:
+            try:
+                value = cast(overrides.get(key, fallback))
+            except (TypeError, ValueError):
+                return fallback
+            return value if value > 0 else fallback
+
+        return cls(
+            timeout=number("timeout", defaults.timeout),
+            connect_timeout=number("connectTimeout", defaults.connect_timeout),
+            max_connections=number("maxConnections", defaults.max_connections, int),
+            max_keepalive=number("maxKeepalive", defaults.max_keepalive, int),
+            http2=bool(overrides.get("http2", defaults.http2)),
+        )
+
+    @property
+    def httpx_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            self.timeout, connect=min(self.connect_timeout, self.timeout)
+        )
+
+
+class AgentConnectionPools:
+    """One ``httpx.AsyncClient`` per agent origin (scheme, host, port).
+
+    Isolating pools per host keeps one slow agent from holding connections
+    every other agent needs. Requests go through :meth:`post`, which records
+    pool utilisation and the time spent waiting for a connection, measured as
+    the time until request headers are sent minus any time spent opening a
+    new connection.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 60.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        warm_path: str = "/health",
+        metrics: Optional[MetricsCollector] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning(
+                "HTTP/2 requested for agent pools but 'h2' is not installed "
+                "(install httpx[http2]); using HTTP/1.1"
+            )
+        self._defaults = AgentHttpSettings(
+            timeout=timeout,
+            connect_timeout=connect_timeout,
+            max_connections=max_connections,
+            max_keepalive=max_keepalive,
+            http2=http2,
+        )
+        self._keepalive_expiry = keepalive_expiry
+        self._warm_path = warm_path
+        self._metrics = metrics
+        self._transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._limits: Dict[str, int] = {}
+        self._in_use: Dict[str, int] = {}
+        self._warmed: Set[str] = set()
+
+    def settings_for(self, agent: AgentSchema) -> AgentHttpSettings:
+        return AgentHttpSettings.resolve(agent, self._defaults)
+
+    def client_for(
+        self, agent: AgentSchema, url: Optional[str] = None
+    ) -> httpx.AsyncClient:
+        origin = self._origin(url or agent.endpoint_urls()[0])
+        client = self._clients.get(origin)
+        if client is None:
+            settings = self.settings_for(agent)
+            if settings.http2 and not HTTP2_AVAILABLE and not self._defaults.http2:
+                logger.warning(
+                    "Agent %s requests HTTP/2 but 'h2' is not installed "
+                    "(install httpx[http2]); using HTTP/1.1 for %s",
+                    agent.name,
+                    origin,
+                )
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.max_connections,
+                    max_keepalive_connections=min(
+                        settings.max_keepalive, settings.max_connections
+                    ),
+                    keepalive_expiry=self._keepalive_expiry,
+                ),
+                http2=settings.http2 and HTTP2_AVAILABLE,
+                timeout=settings.httpx_timeout,
+                transport=self._transport,
+            )
+            self._clients[origin] = client
+            self._limits[origin] = settings.max_connections
+        return client
+
+    async def post(self, agent: AgentSchema, url: str, **kwargs: Any) -> httpx.Response:
+        origin = self._origin(url)
+        client = self.client_for(agent, url)
+        kwargs.setdefault("timeout", self.settings_for(agent).httpx_timeout)
+        deadline = current_deadline()
+        if deadline is not None:
+            if deadline.expired:
+                raise DeadlineExceeded(f"deadline exceeded before calling {origin}")
+            kwargs["timeout"] = _cap_timeout(kwargs["timeout"], deadline.remaining())
+        started = perf_counter()
+        connecting = 0.0
+        connect_started: Optional[float] = None
+        waited = False
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            nonlocal connecting, connect_started, waited
+            if event in (
+                "connection.connect_tcp.started",
+                "connection.start_tls.started",
+            ):
+                connect_started = perf_counter()
+            elif event in (
+                "connection.connect_tcp.complete",
+                "connection.start_tls.complete",
+            ):
+                if connect_started is not None:
+                    connecting += perf_counter() - connect_started
+                    connect_started = None
+                if event == "connection.connect_tcp.complete":
+                    self._record_connection(origin)
+            elif event.endswith("send_request_headers.started") and not waited:
+                waited = True
+                self._record_wait(
+                    origin, max(0.0, perf_counter() - started - connecting)
+                )
+
+        self._in_use[origin] = self._in_use.get(origin, 0) + 1
+        self._record_utilisation(origin)
+        try:
+            return await client.post(url, extensions={"trace": trace}, **kwargs)
+        except httpx.TimeoutException as exc:
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceeded(f"deadline exceeded calling {origin}") from exc
+            raise
+        finally:
+            self._in_use[origin] -= 1
+            self._record_utilisation(origin)
+
+    async def warm(self, agents: Iterable[AgentSchema]) -> None:
+        """Open a connection to every new agent host so the first run skips the handshake."""
+
+        targets: Dict[str, AgentSchema] = {}
+        for agent in agents:
+            for url in agent.endpoint_urls():
+                origin = self._origin(url)
+                if origin not in self._warmed:
+                    targets.setdefault(origin, agent)
+        if not targets:
+            return
+
+        async def warm_one(origin: str, agent: AgentSchema) -> None:
+            client = self.client_for(agent, origin)
+            try:
+                await client.get(
+                    f"{origin}{self._warm_path}",
+                    timeout=self.settings_for(agent).connect_timeout,
+                )
+            except httpx.HTTPError as exc:
+                logger.debug("Pre-warming agent pool %s failed: %s", origin, exc)
+            self._warmed.add(origin)
+
+        await asyncio.gather(
+            *(warm_one(origin, agent) for origin, agent in targets.items())
+        )
+
+    async def use_transport(
+        self, transport: Optional[httpx.AsyncBaseTransport]
+    ) -> None:
+        """Route every pool through ``transport`` (tests and benchmarks)."""
+
+        await self.close()
+        self._transport = transport
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        self._limits.clear()
+        self._warmed.clear()
+        await asyncio.gather(*(client.aclose() for client in clients.values()))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            origin: {
+                "inUse": self._in_use.get(origin, 0),
+                "maxConnections": self._limits[origin],
+            }
+            for origin in self._clients
+        }
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = httpx.URL(url)
+        port = f":{parsed.port}" if parsed.port else ""
+        return f"{parsed.scheme}://{parsed.host}{port}"
+
+    def _record_utilisation(self, origin: str) -> None:
+        if self._metrics is None:
+            return
+        in_use = self._in_use.get(origin, 0)
+        self._metrics.agent_pool_in_flight.labels(pool=origin).set(in_use)
+        limit = self._limits.get(origin) or 1
+        self._metrics.agent_pool_saturation.labels(pool=origin).set(
+            min(1.0, in_use / limit)
+        )
+
+    def _record_wait(self, origin: str, seconds: float) -> None:
+        if self._metrics is not None:
+            self._metrics.agent_pool_wait_seconds.labels(pool=origin).observe(seconds)
+
+    def _record_connection(self, origin: str) -> None:
+        if self._metrics is not None:
+            self._metrics.agent_pool_connections_opened_total.labels(pool=origin).inc()
+
+
+def _cap_timeout(timeout: Any, remaining: float) -> httpx.Timeout:
+    timeout = timeout if isinstance(timeout, httpx.Timeout) else httpx.Timeout(timeout)
+
+    def cap(value: Optional[float]) -> float:
+        return remaining if value is None else min(value, remaining)
+
+    return httpx.Timeout(
+        connect=cap(timeout.connect),
+        read=cap(timeout.read),
+        write=cap(timeout.write),
+        pool=cap(timeout.pool),
+    )
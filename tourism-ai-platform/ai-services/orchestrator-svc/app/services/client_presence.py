@@ -0,0 +1,236 @@
+"""Hub client presence shared by every replica through Redis sorted sets."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from time import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ai_services.hub_core.context_manager import ContextManager
+
+logger = logging.getLogger(__name__)
+
+
+class ClientPresence:
+    """Track which hub clients of each tenant are alive.
+
+    Each tenant has a sorted set ``{namespace}:clients:{tenantId}`` of client
+    ids scored by their last heartbeat (epoch seconds), and
+    ``{namespace}:clients:tenants`` scores tenants by their latest heartbeat.
+    A client is alive for ``client_ttl`` seconds after its last heartbeat, so
+    every replica answers liveness queries the same way.
+
+    Once :meth:`start` has run, heartbeats are buffered and written every
+    ``flush_interval`` seconds in one pipeline; before that they are written
+    immediately. A sweep every ``sweep_interval`` seconds removes expired
+    clients; a short Redis lock lets a single replica sweep per interval.
+    """
+
+    def __init__(
+        self,
+        *,
+        context_manager: ContextManager,
+        namespace: str = "hub",
+        client_ttl: float = 90.0,
+        flush_interval: float = 1.0,
+        sweep_interval: float = 60.0,
+    ) -> None:
+        self._context_manager = context_manager
+        self._prefix = f"{namespace}:clients"
+        self._tenants_key = f"{self._prefix}:tenants"
+        self._sweep_lock_key = f"{self._prefix}:sweep-lock"
+        self._client_ttl = client_ttl
+        self._flush_interval = flush_interval
+        self._sweep_interval = sweep_interval
+        self._pending: Dict[str, Dict[str, float]] = {}
+        self._tasks: List[asyncio.Task[None]] = []
+
+    def _clients_key(self, tenant_id: str) -> str:
+        return f"{self._prefix}:{tenant_id}"
+
+    @property
+    def client_ttl(self) -> float:
+        return self._client_ttl
+
+    async def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._periodic(self._flush_interval, self.flush)),
+                asyncio.create_task(self._periodic(self._sweep_interval, self.sweep)),
+            ]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            await self.flush()
+        except Exception as exc:  # noqa: BLE001 - heartbeats are resent by clients
+            logger.warning("Flushing client heartbeats on shutdown failed: %s", exc)
+
+    async def heartbeat(self, tenant_id: str, client_id: str) -> None:
+        self._pending.setdefault(tenant_id, {})[client_id] = time()
+        if not self._tasks:
+            await self.flush()
+
+    async def unregister(self, tenant_id: str, client_id: str) -> None:
+        self._pending.get(tenant_id, {}).pop(client_id, None)
+        redis = await self._context_manager.connect()
+        await redis.zrem(self._clients_key(tenant_id), client_id)
+
+    async def flush(self) -> None:
+        """Write buffered heartbeats in a single pipeline."""
+
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        expire = int(self._client_ttl * 2) + 1
+        redis = await self._context_manager.connect()
+        pipeline = redis.pipeline(transaction=False)
+        for tenant_id, clients in pending.items():
+            key = self._clients_key(tenant_id)
+            pipeline.zadd(key, clients)
+            pipeline.expire(key, expire)
+        latest = {
+            tenant_id: max(clients.values()) for tenant_id, clients in pending.items()
+        }
+        pipeline.zadd(self._tenants_key, latest)
+        try:
+            await pipeline.execute()
+        except Exception:
+            # Requeue for the next flush without overwriting newer heartbeats.
+            for tenant_id, clients in pending.items():
+                buffered = self._pending.setdefault(tenant_id, {})
+                for client_id, seen in clients.items():
+                    buffered.setdefault(client_id, seen)
+            raise
+
+    async def is_alive(self, tenant_id: str, client_id: str) -> bool:
+        await self.flush()
+        redis = await self._context_manager.connect()
+        seen = await redis.zscore(self._clients_key(tenant_id), client_id)
+        return seen is not None and float(seen) > time() - self._client_ttl
+
+    async def count_clients(self, tenant_id: str) -> int:
+        await self.flush()
+        redis = await self._context_manager.connect()
+        return int(
+            await redis.zcount(
+                self._clients_key(tenant_id), f"({time() - self._client_ttl}", "+inf"
+            )
+        )
+
+    async def list_clients(
+        self, tenant_id: Optional[str] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """Live clients by tenant, ``{tenantId: {clientId: lastHeartbeat}}``."""
+
+        await self.flush()
+        redis = await self._context_manager.connect()
+        since = f"({time() - self._client_ttl}"
+        if tenant_id:
+            tenants = [tenant_id]
+        else:
+            tenants = await redis.zrangebyscore(self._tenants_key, since, "+inf")
+        pipeline = redis.pipeline(transaction=False)
+        for tenant in tenants:
+            pipeline.zrangebyscore(
+                self._clients_key(tenant), since, "+inf", withscores=True
+            )
+        results = await pipeline.execute() if tenants else []
+        listing = {
+            tenant: {client: float(seen) for client, seen in clients}
+            for tenant, clients in zip(tenants, results)
+        }
+        if tenant_id:
+            return listing
+        return {tenant: clients for tenant, clients in listing.items() if clients}
+
+    async def page_clients(
+        self,
+        tenant_id: str,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """One page of a tenant's live clients, oldest heartbeat first.
+
+        ``cursor`` is the opaque ``nextCursor`` of the previous page. It
+        records the last heartbeat score returned, so clients that heartbeat
+        while a listing is paged move to a later page instead of shifting
+        others out of it; a client may appear twice, but none is skipped.
+        """
+
+        await self.flush()
+        low, skip = _parse_cursor(cursor)
+        cutoff = time() - self._client_ttl
+        if cutoff > low:
+            low, skip = cutoff, 0
+        redis = await self._context_manager.connect()
+        members: List[Tuple[str, float]] = await redis.zrangebyscore(
+            self._clients_key(tenant_id),
+            low,
+            "+inf",
+            start=skip,
+            num=limit,
+            withscores=True,
+        )
+        next_cursor = None
+        if len(members) == limit:
+            last = float(members[-1][1])
+            ties = sum(1 for _, seen in members if float(seen) == last)
+            if ties == len(members) and last == low:
+                ties += skip
+            next_cursor = f"{last!r}:{ties}"
+        return {
+            "tenantId": tenant_id,
+            "clients": [
+                {"clientId": client, "lastHeartbeat": float(seen)}
+                for client, seen in members
+            ],
+            "nextCursor": next_cursor,
+        }
+
+    async def sweep(self) -> int:
+        """Remove expired clients and idle tenants; returns the clients removed."""
+
+        await self.flush()
+        redis = await self._context_manager.connect()
+        lock_ttl = max(1, int(self._sweep_interval) - 1)
+        if not await redis.set(self._sweep_lock_key, "1", ex=lock_ttl, nx=True):
+            return 0
+        cutoff = time() - self._client_ttl
+        tenants = await redis.zrangebyscore(self._tenants_key, "-inf", "+inf")
+        if not tenants:
+            return 0
+        pipeline = redis.pipeline(transaction=False)
+        for tenant in tenants:
+            pipeline.zremrangebyscore(self._clients_key(tenant), "-inf", cutoff)
+        pipeline.zremrangebyscore(self._tenants_key, "-inf", cutoff)
+        *removed, _ = await pipeline.execute()
+        expired = sum(int(count or 0) for count in removed)
+        if expired:
+            logger.debug("Swept %s expired hub clients", expired)
+        return expired
+
+    async def _periodic(self, interval: float, action: Any) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await action()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - retry on the next tick
+                logger.warning("Client presence %s failed: %s", action.__name__, exc)
+
+
+def _parse_cursor(cursor: Optional[str]) -> Tuple[float, int]:
+    if not cursor:
+        return float("-inf"), 0
+    try:
+        score, skip = cursor.rsplit(":", 1)
+        return float(score), max(0, int(skip))
+    except ValueError:
+        raise ValueError(f"Invalid client cursor {cursor!r}") from None
@@ -5,7 +5,8 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
 
 from ai_services.hub_core.context_manager import ContextManager
 from ai_services.interfaces.schemas.event_schema import HubEvent
@@ -33,20 +34,86 @@ class EventBus:
         self._hub_topic_suffix = hub_topic_suffix
         self._redis_stream = redis_stream
 
-    async def publish(self, event: HubEvent) -> None:
+    async def publish(
+        self, event: HubEvent, *, persist_stream: Optional[str] = None
+    ) -> None:
         payload = event.model_dump(mode="json", by_alias=True)
-        tenant_stream = self._tenant_stream(event.tenant_id)
         kafka_task = asyncio.create_task(
             self._kafka_producer.send_event(self._resolve_topic(event), payload)
         )
         redis_task = asyncio.create_task(
-            self._context_manager.append_stream(tenant_stream, payload)
+            self._context_manager.append_events(
+                self._stream_entries(event, payload, persist_stream)
+            )
         )
         results = await asyncio.gather(kafka_task, redis_task, return_exceptions=True)
         for result in results:
             if isinstance(result, Exception):
                 logger.warning("Event publish encountered an error: %s", result)
 
+    async def publish_many(
+        self,
+        events: Sequence[HubEvent],
+        *,
+        persist_stream: Optional[str] = None,
+    ) -> List[Optional[BaseException]]:
+        """Publish a batch with one Kafka flush and one pipelined Redis round-trip.
+
+        ``persist_stream`` adds a second tenant-prefixed stream write per event,
+        skipped when it resolves to the same key as the bus stream. Returns the
+        first publish error for each event (``None`` when it was published).
+        """
+
+        if not events:
+            return []
+        messages: List[Tuple[str, Dict[str, Any]]] = []
+        stream_entries: List[Tuple[str, str, str, Dict[str, Any]]] = []
+        for event in events:
+            payload = event.model_dump(mode="json", by_alias=True)
+            messages.append((self._resolve_topic(event), payload))
+            stream_entries.extend(self._stream_entries(event, payload, persist_stream))
+        kafka_result, redis_result = await asyncio.gather(
+            self._kafka_producer.send_events(messages),
+            self._context_manager.append_events(stream_entries),
+            return_exceptions=True,
+        )
+        if isinstance(redis_result, BaseException):
+            logger.warning(
+                "Batch stream append failed for %s events: %s",
+                len(events),
+                redis_result,
+            )
+        if isinstance(kafka_result, BaseException):
+            logger.warning(
+                "Batch Kafka publish failed for %s events: %s",
+                len(events),
+                kafka_result,
+            )
+            kafka_errors: List[Optional[BaseException]] = [kafka_result] * len(events)
+        else:
+            kafka_errors = list(kafka_result)
+        redis_error = redis_result if isinstance(redis_result, BaseException) else None
+        return [kafka_error or redis_error for kafka_error in kafka_errors]
+
+    async def record(
+        self,
+        events: Sequence[HubEvent],
+        *,
+        persist_stream: Optional[str] = None,
+    ) -> None:
+        """Write ``events`` to their streams and the event-id index without publishing them to Kafka."""
+
+        stream_entries: List[Tuple[str, str, str, Dict[str, Any]]] = []
+        for event in events:
+            payload = event.model_dump(mode="json", by_alias=True)
+            stream_entries.extend(self._stream_entries(event, payload, persist_stream))
+        if not stream_entries:
+            return
+        try:
+            await self._context_manager.append_events(stream_entries)
+        except Exception as exc:  # noqa: BLE001 - recording must not block dispatch
+            logger.warning("Recording %s events failed: %s", len(events), exc)
+
     async def publish_raw(self, payload: Dict[str, Any]) -> None:
         event = HubEvent.model_validate(payload)
         await self.publish(event)
@@ -59,8 +126,10 @@ class EventBus:
         *,
         correlation_id: Optional[str] = None,
     ) -> None:
+        # Responses get their own id so the event-id index of the triggering
+        # event (``correlation_id``) never points at them.
         event = HubEvent(
-            id=response.get("id") or correlation_id or agent_name,
+            id=uuid4().hex,
             tenant_id=tenant_id,
             event_type="agent.response",
             source=agent_name,
@@ -93,6 +162,23 @@ class EventBus:
         )
         return f"tenant.{tenant_id}.{suffix}"
 
+    def _stream_entries(
+        self,
+        event: HubEvent,
+        payload: Dict[str, Any],
+        persist_stream: Optional[str],
+    ) -> List[Tuple[str, str, str, Dict[str, Any]]]:
+        """Indexed stream writes for ``event``; ``persist_stream`` is skipped when it is the bus stream."""
+
+        tenant_id = event.tenant_id or "system"
+        tenant_stream = self._tenant_stream(event.tenant_id)
+        entries = [(tenant_id, tenant_stream, event.id, payload)]
+        if persist_stream:
+            persist_key = f"{tenant_id}:{persist_stream}"
+            if persist_key != tenant_stream:
+                entries.append((tenant_id, persist_key, event.id, payload))
+        return entries
+
     def _tenant_stream(self, tenant_id: str | None) -> str:
         tenant = tenant_id or "system"
         return f"{tenant}:{self._redis_stream}"
@@ -3,52 +3,301 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from time import time
-from typing import Any, Dict, List, Optional
+from functools import partial
+from time import perf_counter, time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from uuid import uuid4
 
+import httpx
+
+from ai_services.hub_core.agent_index import AgentIndex
+from ai_services.hub_core.context_manager import ContextManager
+from ai_services.hub_core.local_cache import LocalCache
+from ai_services.hub_core.metrics_collector import MetricsCollector
 from ai_services.hub_core.registry_client import RegistryClient
+from ai_services.hub_core.single_flight import SingleFlight, should_refresh_early
 from ai_services.interfaces.schemas.agent_schema import AgentSchema
 from ai_services.interfaces.schemas.tenant_schema import TenantSchema
 
 logger = logging.getLogger(__name__)
 
+AgentsListener = Callable[[List[AgentSchema]], Awaitable[None]]
+
+_EMPTY_INDEX = AgentIndex()
+
 
 class HubRegistry:
-    """Cache of hub metadata with active client tracking."""
+    """Cache of hub metadata (agents and tenants) from the registry service.
+
+    Only the first load waits on the registry. After that a background task
+    started by :meth:`start` revalidates every ``refresh_interval`` seconds
+    with conditional requests; without it, a lookup that finds the cache
+    stale starts one revalidation in the background and answers from the
+    stale copy. Revalidation keeps the cached objects of unchanged agents and
+    tenants, and only changed agents reach the agents listeners.
+
+    With a ``context_manager``, :meth:`sync_agent` and :meth:`sync_tenant`
+    bump ``{namespace}:registry:version`` in Redis and broadcast the affected
+    tenants on ``{namespace}:registry:invalidate``; every replica reloads just
+    those maps in the background. A version gap (a missed broadcast) triggers
+    a full revalidation, and tenant maps older than ``tenant_ttl`` are
+    reloaded on access as a safety net.
+
+    Tenant maps not looked up within ``tenant_ttl`` are dropped rather than
+    revalidated, and at most ``max_tenant_maps`` are kept, evicting the least
+    recently looked up; the system map is always kept. A revalidation sends at
+    most ``revalidate_concurrency`` agent requests at a time; changes in
+    between are picked up through invalidations and ``tenant_ttl``.
+
+    Concurrent first lookups of a tenant share one registry call. Tenant maps
+    are reloaded in the background slightly before ``tenant_ttl`` with a
+    probability scaled by ``early_refresh_beta``, and tenants the registry
+    answers with ``404`` get an empty map for ``negative_ttl`` seconds.
+
+    Each tenant map has an :class:`AgentIndex` rebuilt whenever the map is
+    replaced, so :meth:`find_agents` looks agents up by capability or channel
+    without scanning them.
+    """
 
     def __init__(
         self,
         *,
         client: RegistryClient,
         refresh_interval: int = 60,
+        metrics: Optional[MetricsCollector] = None,
+        context_manager: Optional[ContextManager] = None,
+        namespace: str = "hub",
+        tenant_ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+        early_refresh_beta: float = 1.0,
+        max_tenant_maps: int = 4096,
+        revalidate_concurrency: int = 8,
     ) -> None:
         self._client = client
         self._refresh_interval = refresh_interval
+        self._metrics = metrics
         self._agents: Dict[str, Dict[str, AgentSchema]] = {}
+        self._indexes: Dict[str, AgentIndex] = {}
         self._tenants: Dict[str, TenantSchema] = {}
-        self._active_clients: Dict[str, Dict[str, float]] = {}
-        self._lock = asyncio.Lock()
+        self._loaded = False
         self._last_refresh: float = 0.0
+        self._last_attempt: float = 0.0
+        self._revalidation: Optional[asyncio.Task[None]] = None
+        self._refresh_task: Optional[asyncio.Task[None]] = None
+        self._agent_listeners: List[AgentsListener] = []
+        self._listener_tasks: Set[asyncio.Task[None]] = set()
+        self._context_manager = context_manager
+        self._version_key = f"{namespace}:registry:version"
+        self._invalidation_channel = f"{namespace}:registry:invalidate"
+        self._instance_id = uuid4().hex
+        self._version = 0
+        self._tenant_ttl = tenant_ttl
+        self._loaded_at: Dict[str, float] = {}
+        self._accessed_at: Dict[str, float] = {}
+        self._max_tenant_maps = max_tenant_maps
+        self._revalidate_slots = asyncio.Semaphore(max(1, revalidate_concurrency))
+        self._reloading: Set[str] = set()
+        self._early_refresh_beta = early_refresh_beta
+        self._agents_fetch_seconds = 0.0
+        self._agent_loads: SingleFlight[Dict[str, AgentSchema]] = SingleFlight()
+        self._negative_ttl = negative_ttl
+        self._unknown_tenants: LocalCache[bool] = LocalCache(4096, negative_ttl)
+        self._invalidation_task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def version(self) -> int:
+        """Last registry version this replica has seen."""
+
+        return self._version
+
+    def add_agents_listener(self, listener: AgentsListener) -> None:
+        """Call ``listener`` in the background with agents fetched from the registry."""
+
+        self._agent_listeners.append(listener)
+
+    def _notify_agents(self, agents: List[AgentSchema]) -> None:
+        if not agents:
+            return
+        for listener in self._agent_listeners:
+            self._spawn(self._run_listener(listener, agents))
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._listener_tasks.add(task)
+        task.add_done_callback(self._listener_tasks.discard)
+
+    @staticmethod
+    async def _run_listener(
+        listener: AgentsListener, agents: List[AgentSchema]
+    ) -> None:
+        try:
+            await listener(agents)
+        except Exception as exc:  # noqa: BLE001 - listeners must not break refresh
+            logger.warning("Hub registry agents listener failed: %s", exc)
+
+    async def start(self) -> None:
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+        if self._context_manager is not None and self._invalidation_task is None:
+            self._invalidation_task = asyncio.create_task(
+                self._listen_for_invalidations()
+            )
+
+    async def stop(self) -> None:
+        owned = (self._refresh_task, self._revalidation, self._invalidation_task)
+        tasks = [task for task in (*owned, *self._listener_tasks) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refresh_task = None
+        self._revalidation = None
+        self._invalidation_task = None
 
     async def refresh(self, *, force: bool = False) -> None:
-        now = time()
-        if not force and now - self._last_refresh < self._refresh_interval:
+        """Load the cache on first use (or when forced); otherwise revalidate in the background."""
+
+        if force or not self._loaded:
+            await self._revalidate_once()
             return
-        async with self._lock:
-            logger.debug("Refreshing hub registry cache")
-            agents = await self._client.list_agents("system")
-            tenants = await self._client.list_tenants()
-            self._agents["system"] = {agent.name: agent for agent in agents}
-            self._tenants = {tenant.id: tenant for tenant in tenants}
-            self._last_refresh = now
+        if self._refresh_task is not None or self._revalidation is not None:
+            return
+        if (
+            time() - max(self._last_refresh, self._last_attempt)
+            >= self._refresh_interval
+        ):
+            self._revalidation = asyncio.create_task(self._revalidate())
+            self._revalidation.add_done_callback(self._revalidation_done)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                await self._revalidate_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - keep serving the cached copy
+                logger.warning(
+                    "Hub registry refresh failed; serving cached data: %s", exc
+                )
+
+    async def _revalidate_once(self) -> None:
+        if self._revalidation is None:
+            self._revalidation = asyncio.create_task(self._revalidate())
+            self._revalidation.add_done_callback(self._revalidation_done)
+        await asyncio.shield(self._revalidation)
+
+    async def _revalidate_in_background(self) -> None:
+        try:
+            await self._revalidate_once()
+        except Exception:  # noqa: BLE001 - logged by _revalidation_done
+            pass
+
+    def _revalidation_done(self, task: "asyncio.Task[None]") -> None:
+        if self._revalidation is task:
+            self._revalidation = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Hub registry revalidation failed: %s", task.exception())
+
+    async def _revalidate(self) -> None:
+        logger.debug("Revalidating hub registry cache")
+        self._last_attempt = time()
+        version = await self._read_version()
+        self._evict_tenant_maps()
+        tenant_maps = [tenant for tenant in self._agents if tenant != "system"]
+        try:
+            tenants, *agent_lists = await asyncio.gather(
+                self._client.list_tenants_if_modified(),
+                *(self._fetch_agents(tenant) for tenant in ["system", *tenant_maps]),
+            )
+        except Exception:
+            self._record("failed")
+            raise
+        changed: List[AgentSchema] = []
+        for tenant, fetched in zip(["system", *tenant_maps], agent_lists):
+            if fetched is not None:
+                changed.extend(self._apply_agents(tenant, fetched))
+        if tenants is not None:
+            self._apply_tenants(tenants)
+        self._record("modified" if changed or tenants is not None else "not_modified")
+        self._loaded = True
+        self._last_refresh = time()
+        self._version = max(self._version, version)
+        self._notify_agents(changed)
+
+    async def _fetch_agents(self, tenant: str) -> Optional[List[AgentSchema]]:
+        async with self._revalidate_slots:
+            fetched = await self._client.list_agents_if_modified(tenant)
+            if fetched is None and tenant not in self._agents:
+                # Unchanged for the client, but this replica no longer holds the map.
+                fetched = await self._client.list_agents(tenant)
+        return fetched
+
+    def _apply_agents(
+        self, tenant: str, fetched: List[AgentSchema]
+    ) -> List[AgentSchema]:
+        """Replace the tenant's map, keeping cached objects of unchanged agents; return changes."""
+
+        current = self._agents.get(tenant, {})
+        mapping: Dict[str, AgentSchema] = {}
+        changed: List[AgentSchema] = []
+        for agent in fetched:
+            previous = current.get(agent.name)
+            if previous is not None and previous == agent:
+                mapping[agent.name] = previous
+            else:
+                mapping[agent.name] = agent
+                changed.append(agent)
+        self._agents[tenant] = mapping
+        self._indexes[tenant] = AgentIndex(mapping.values())
+        self._loaded_at[tenant] = time()
+        self._record_age("agents", min(self._loaded_at.values()))
+        return changed
+
+    def _evict_tenant_maps(self) -> None:
+        """Drop tenant maps idle for ``tenant_ttl``, then the least used beyond the cap."""
+
+        idle_since = time() - self._tenant_ttl
+        tenants = sorted(
+            (tenant for tenant in self._agents if tenant != "system"),
+            key=lambda tenant: self._accessed_at.get(tenant, 0.0),
+        )
+        excess = len(tenants) - self._max_tenant_maps
+        for position, tenant in enumerate(tenants):
+            if position >= excess and self._accessed_at.get(tenant, 0.0) > idle_since:
+                break
+            self._agents.pop(tenant, None)
+            self._indexes.pop(tenant, None)
+            self._loaded_at.pop(tenant, None)
+            self._accessed_at.pop(tenant, None)
+
+    def _apply_tenants(self, fetched: List[TenantSchema]) -> None:
+        tenants: Dict[str, TenantSchema] = {}
+        for tenant in fetched:
+            previous = self._tenants.get(tenant.id)
+            tenants[tenant.id] = (
+                previous if previous is not None and previous == tenant else tenant
+            )
+        self._tenants = tenants
+        self._record_age("tenants", time())
+
+    def _record(self, result: str) -> None:
+        if self._metrics is not None:
+            self._metrics.registry_refresh_total.labels(result=result).inc()
+
+    def _record_age(self, cache: str, loaded_at: float) -> None:
+        if self._metrics is not None:
+            self._metrics.registry_cache_loaded_at.labels(cache=cache).set(loaded_at)
 
     async def list_agents(self, tenant_id: str | None = None) -> List[AgentSchema]:
         await self.refresh()
         agents = await self._ensure_agents_for_tenant(tenant_id)
         return list(agents.values())
 
-    async def get_agent(self, name: str, tenant_id: str | None = None) -> Optional[AgentSchema]:
+    async def get_agent(
+        self, name: str, tenant_id: str | None = None
+    ) -> Optional[AgentSchema]:
         await self.refresh()
         agents = await self._ensure_agents_for_tenant(tenant_id)
         agent = agents.get(name)
@@ -57,6 +306,32 @@ class HubRegistry:
             return fallback.get(name)
         return agent
 
+    async def find_agents(
+        self,
+        tenant_id: str | None = None,
+        *,
+        capability: Optional[str] = None,
+        channel: Optional[str] = None,
+    ) -> List[AgentSchema]:
+        """Agents of the tenant advertising ``capability`` and/or serving ``channel``.
+
+        Like :meth:`get_agent`, falls back to the system agents available to
+        the tenant when the tenant's own map has no match.
+        """
+
+        await self.refresh()
+        tenant = tenant_id or "system"
+        await self._ensure_agents_for_tenant(tenant)
+        found = self._indexes.get(tenant, _EMPTY_INDEX).find(
+            capability=capability, channel=channel
+        )
+        if not found and tenant != "system":
+            await self._ensure_agents_for_tenant("system")
+            found = self._indexes.get("system", _EMPTY_INDEX).find(
+                capability=capability, channel=channel, tenant_id=tenant
+            )
+        return found
+
     async def list_tenants(self) -> List[TenantSchema]:
         await self.refresh()
         return list(self._tenants.values())
@@ -65,51 +340,191 @@ class HubRegistry:
         await self.refresh()
         return self._tenants.get(tenant_id)
 
-    def register_client(self, tenant_id: str, client_id: str) -> None:
-        logger.debug("Registering hub client %s for tenant %s", client_id, tenant_id)
-        tenant_clients = self._active_clients.setdefault(tenant_id, {})
-        tenant_clients[client_id] = time()
-
-    def heartbeat_client(self, tenant_id: str, client_id: str) -> None:
-        if tenant_id in self._active_clients and client_id in self._active_clients[tenant_id]:
-            self._active_clients[tenant_id][client_id] = time()
-        else:
-            self.register_client(tenant_id, client_id)
-
-    def unregister_client(self, tenant_id: str, client_id: str) -> None:
-        tenant_clients = self._active_clients.get(tenant_id)
-        if tenant_clients and client_id in tenant_clients:
-            tenant_clients.pop(client_id)
-            if not tenant_clients:
-                self._active_clients.pop(tenant_id, None)
-
-    def list_clients(self, tenant_id: Optional[str] = None) -> Dict[str, Dict[str, float]]:
-        if tenant_id:
-            return {tenant_id: dict(self._active_clients.get(tenant_id, {}))}
-        return {tenant: dict(clients) for tenant, clients in self._active_clients.items()}
-
     async def sync_agent(self, agent: AgentSchema) -> AgentSchema:
         logger.debug("Syncing agent %s with registry", agent.name)
         saved = await self._client.register_agent(agent, tenant_id="system")
-        async with self._lock:
-            system_agents = self._agents.setdefault("system", {})
-            system_agents[saved.name] = saved
+        affected = self._tenants_with_agent(saved.name, ["system", *saved.tenants])
+        system = self._agents.setdefault("system", {})
+        system[saved.name] = saved
+        self._indexes["system"] = AgentIndex(system.values())
+        self._reload_agents([tenant for tenant in affected if tenant != "system"])
+        await self._broadcast(scope="agents", tenants=affected, agent=saved.name)
         return saved
 
     async def sync_tenant(self, tenant: TenantSchema) -> TenantSchema:
         logger.debug("Syncing tenant %s", tenant.id)
         saved = await self._client.register_tenant(tenant)
         self._tenants[saved.id] = saved
+        self._unknown_tenants.invalidate(saved.id)
+        await self._broadcast(scope="tenants", tenants=[saved.id])
         return saved
 
-    async def _ensure_agents_for_tenant(self, tenant_id: str | None) -> Dict[str, AgentSchema]:
+    async def _ensure_agents_for_tenant(
+        self, tenant_id: str | None
+    ) -> Dict[str, AgentSchema]:
         tenant = tenant_id or "system"
-        async with self._lock:
-            cached = self._agents.get(tenant)
+        cached = self._agents.get(tenant)
         if cached is not None:
+            self._accessed_at[tenant] = time()
+            remaining = self._tenant_ttl - (time() - self._loaded_at.get(tenant, 0.0))
+            if should_refresh_early(
+                remaining, self._agents_fetch_seconds, self._early_refresh_beta
+            ):
+                self._reload_agents([tenant])
             return cached
-        fetched = await self._client.list_agents(tenant)
-        mapping = {agent.name: agent for agent in fetched}
-        async with self._lock:
-            self._agents[tenant] = mapping
+        if self._unknown_tenants.get(tenant, False):
+            return {}
+        return await self._agent_loads.do(
+            tenant, partial(self._load_tenant_agents, tenant)
+        )
+
+    async def _load_tenant_agents(self, tenant: str) -> Dict[str, AgentSchema]:
+        try:
+            fetched = await self._list_agents(tenant)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code != 404:
+                raise
+            if self._negative_ttl > 0:
+                self._unknown_tenants.put(tenant, True)
+            return {}
+        self._notify_agents(self._apply_agents(tenant, fetched))
+        mapping = self._agents[tenant]
+        self._accessed_at[tenant] = time()
+        if len(self._agents) > self._max_tenant_maps:
+            self._evict_tenant_maps()
         return mapping
+
+    async def _list_agents(self, tenant: str) -> List[AgentSchema]:
+        started = perf_counter()
+        fetched = await self._client.list_agents(tenant)
+        self._agents_fetch_seconds = perf_counter() - started
+        return fetched
+
+    def _tenants_with_agent(
+        self, agent_name: Optional[str], tenants: Iterable[str]
+    ) -> List[str]:
+        affected = set(tenants)
+        if agent_name:
+            affected.update(
+                tenant
+                for tenant, agents in self._agents.items()
+                if agent_name in agents
+            )
+        return sorted(affected)
+
+    def _reload_agents(self, tenants: Iterable[str]) -> None:
+        """Refetch the cached agent maps of ``tenants`` in the background, serving the old ones meanwhile."""
+
+        for tenant in tenants:
+            if tenant in self._agents and tenant not in self._reloading:
+                self._reloading.add(tenant)
+                self._spawn(self._reload_tenant_agents(tenant))
+
+    async def _reload_tenant_agents(self, tenant: str) -> None:
+        try:
+            fetched = await self._list_agents(tenant)
+        except Exception as exc:  # noqa: BLE001 - keep the cached map
+            logger.warning("Reloading agents for tenant %s failed: %s", tenant, exc)
+            return
+        finally:
+            self._reloading.discard(tenant)
+        self._notify_agents(self._apply_agents(tenant, fetched))
+
+    async def _reload_tenants(self) -> None:
+        try:
+            fetched = await self._client.list_tenants_if_modified()
+        except Exception as exc:  # noqa: BLE001 - keep the cached tenants
+            logger.warning("Reloading tenants failed: %s", exc)
+            return
+        if fetched is not None:
+            self._apply_tenants(fetched)
+
+    async def _read_version(self) -> int:
+        if self._context_manager is None:
+            return 0
+        try:
+            redis = await self._context_manager.connect()
+            return int(await redis.get(self._version_key) or 0)
+        except Exception as exc:  # noqa: BLE001 - versioning is best effort
+            logger.debug("Reading registry version failed: %s", exc)
+            return 0
+
+    async def _broadcast(
+        self, *, scope: str, tenants: List[str], agent: Optional[str] = None
+    ) -> None:
+        if self._context_manager is None:
+            return
+        try:
+            redis = await self._context_manager.connect()
+            version = int(await redis.incr(self._version_key))
+            message = {
+                "origin": self._instance_id,
+                "version": version,
+                "scope": scope,
+                "tenants": tenants,
+                "agent": agent,
+            }
+            await redis.publish(self._invalidation_channel, json.dumps(message))
+        except Exception as exc:  # noqa: BLE001 - TTLs and revalidation still converge
+            logger.warning("Registry invalidation broadcast failed: %s", exc)
+            return
+        if version == self._version + 1:
+            self._version = version
+        self._record_invalidation("local")
+
+    def _apply_invalidation(self, raw: Any) -> None:
+        try:
+            message = json.loads(raw)
+            version = int(message.get("version") or 0)
+        except (TypeError, ValueError):
+            logger.debug("Ignoring malformed registry invalidation %r", raw)
+            return
+        if message.get("origin") == self._instance_id or version <= self._version:
+            return
+        missed = version > self._version + 1
+        self._version = version
+        if missed:
+            # A broadcast was lost: only a full revalidation is safe.
+            self._record_invalidation("gap")
+            self._spawn(self._revalidate_in_background())
+        self._record_invalidation("remote")
+        for tenant in message.get("tenants") or []:
+            self._unknown_tenants.invalidate(tenant)
+        if message.get("scope") == "tenants":
+            self._spawn(self._reload_tenants())
+        else:
+            self._reload_agents(
+                self._tenants_with_agent(
+                    message.get("agent"), message.get("tenants") or []
+                )
+            )
+
+    def _record_invalidation(self, source: str) -> None:
+        if self._metrics is not None:
+            self._metrics.registry_invalidations_total.labels(source=source).inc()
+
+    async def _listen_for_invalidations(self) -> None:
+        backoff = 0.5
+        while True:
+            pubsub = None
+            try:
+                redis = await self._context_manager.connect()  # type: ignore[union-attr]
+                self._version = max(self._version, await self._read_version())
+                pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self._invalidation_channel)
+                backoff = 0.5
+                async for message in pubsub.listen():
+                    if message and message.get("type") == "message":
+                        self._apply_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Registry invalidation listener failed: %s", exc)
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+            # Broadcasts may have been missed while disconnected.
+            if self._loaded:
+                self._spawn(self._revalidate_in_background())
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
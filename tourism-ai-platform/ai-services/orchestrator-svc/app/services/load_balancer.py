@@ -0,0 +1,281 @@
+"""Latency-aware load balancing across agent replica endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Collection, Deque, Dict, Iterable, List, Optional
+
+import httpx
+
+from ai_services.hub_core.metrics_collector import MetricsCollector
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+
+from .agent_pools import AgentConnectionPools
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EndpointState:
+    url: str
+    ewma: float = 0.0
+    outstanding: int = 0
+    failures: int = 0
+    healthy: bool = True
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+    def cost(self, default_latency: float) -> float:
+        # Endpoints without samples are priced at ``default_latency``.
+        return (self.ewma or default_latency) * (self.outstanding + 1)
+
+
+class AgentLoadBalancer:
+    """Spread agent runs over ``AgentSchema.endpoint_urls()``.
+
+    Endpoints are chosen with power-of-two-choices on EWMA latency scaled by
+    outstanding requests. Endpoints without samples count as
+    ``default_latency``, kept low so new endpoints get tried. Errors
+    (transport errors, timeouts or 5xx) are folded into the EWMA as
+    ``failure_penalty`` seconds, or twice the current EWMA if that is larger,
+    so a failing endpoint loses to a working one long before
+    ``failure_threshold`` consecutive errors take it out of rotation.
+    Unhealthy endpoints return after a background health probe succeeds; if
+    every endpoint is unhealthy all of them are used.
+
+    With ``hedge`` enabled, a second request goes to another endpoint when the
+    first has not answered within the agent's observed ``hedge_quantile``
+    latency, and the first response wins. Only enable it for agents whose
+    ``/run`` is safe to execute twice.
+    """
+
+    def __init__(
+        self,
+        *,
+        pools: AgentConnectionPools,
+        ewma_alpha: float = 0.3,
+        failure_threshold: int = 3,
+        default_latency: float = 0.01,
+        failure_penalty: float = 5.0,
+        probe_interval: float = 10.0,
+        probe_path: str = "/health",
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_delay: float = 0.01,
+        hedge_min_samples: int = 20,
+        metrics: Optional[MetricsCollector] = None,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self._pools = pools
+        self._alpha = ewma_alpha
+        self._failure_threshold = max(1, failure_threshold)
+        self._default_latency = default_latency
+        self._failure_penalty = failure_penalty
+        self._probe_interval = probe_interval
+        self._probe_path = probe_path
+        self._hedge = hedge
+        self._hedge_quantile = hedge_quantile
+        self._hedge_min_delay = hedge_min_delay
+        self._hedge_min_samples = hedge_min_samples
+        self._metrics = metrics
+        self._rng = rng or random.Random()
+        self._endpoints: Dict[str, EndpointState] = {}
+        self._agents: Dict[str, AgentSchema] = {}
+        self._probe_task: Optional[asyncio.Task[None]] = None
+
+    def state(self, url: str) -> EndpointState:
+        endpoint = self._endpoints.get(url)
+        if endpoint is None:
+            endpoint = self._endpoints[url] = EndpointState(url=url)
+        return endpoint
+
+    def track(self, agents: Iterable[AgentSchema]) -> None:
+        """Remember agent endpoints so health probes cover them before first use."""
+
+        for agent in agents:
+            for url in agent.endpoint_urls():
+                self._agents[url] = agent
+                self.state(url)
+
+    def choose(self, agent: AgentSchema, exclude: Collection[str] = ()) -> str:
+        urls = agent.endpoint_urls()
+        candidates = [self.state(url) for url in urls if url not in exclude]
+        if not candidates:
+            return urls[0]
+        healthy = [endpoint for endpoint in candidates if endpoint.healthy]
+        pool = healthy or candidates
+        if len(pool) == 1:
+            return pool[0].url
+        first, second = self._rng.sample(pool, 2)
+        cost = self._default_latency
+        return (first if first.cost(cost) <= second.cost(cost) else second).url
+
+    def hedge_delay(self, agent: AgentSchema) -> Optional[float]:
+        if not self._hedge:
+            return None
+        endpoints = [self.state(url) for url in agent.endpoint_urls()]
+        if sum(endpoint.healthy for endpoint in endpoints) < 2:
+            return None
+        samples = sorted(
+            value for endpoint in endpoints for value in endpoint.latencies
+        )
+        if len(samples) < self._hedge_min_samples:
+            return None
+        index = min(len(samples) - 1, int(self._hedge_quantile * len(samples)))
+        return max(self._hedge_min_delay, samples[index])
+
+    async def send(
+        self, agent: AgentSchema, path: str, **kwargs: Any
+    ) -> httpx.Response:
+        """POST ``path`` to one of the agent's endpoints, hedging when configured."""
+
+        if agent.endpoint_urls()[0] not in self._agents:
+            self.track([agent])
+        primary_url = self.choose(agent)
+        delay = self.hedge_delay(agent)
+        if delay is None:
+            return await self._attempt(agent, primary_url, path, kwargs)
+
+        primary = asyncio.create_task(self._attempt(agent, primary_url, path, kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        hedge_url = self.choose(agent, exclude={primary_url})
+        if done or hedge_url == primary_url:
+            return await primary
+
+        hedge = asyncio.create_task(self._attempt(agent, hedge_url, path, kwargs))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self._record_hedge(
+                            agent, "hedge" if task is hedge else "primary"
+                        )
+                        return task.result()
+                    if error is None or task is primary:
+                        error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _attempt(
+        self, agent: AgentSchema, url: str, path: str, kwargs: Dict[str, Any]
+    ) -> httpx.Response:
+        endpoint = self.state(url)
+        endpoint.outstanding += 1
+        started = perf_counter()
+        try:
+            response = await self._pools.post(agent, f"{url}{path}", **kwargs)
+        except httpx.RequestError:
+            self._record_failure(agent, endpoint)
+            raise
+        finally:
+            endpoint.outstanding -= 1
+        if response.status_code >= 500:
+            self._record_failure(agent, endpoint)
+        else:
+            self._record_success(endpoint, perf_counter() - started)
+        return response
+
+    def _observe(self, endpoint: EndpointState, latency: float) -> None:
+        endpoint.ewma = (
+            latency
+            if endpoint.ewma == 0.0
+            else (self._alpha * latency + (1 - self._alpha) * endpoint.ewma)
+        )
+
+    def _record_success(self, endpoint: EndpointState, latency: float) -> None:
+        self._observe(endpoint, latency)
+        endpoint.latencies.append(latency)
+        endpoint.failures = 0
+
+    def _record_failure(self, agent: AgentSchema, endpoint: EndpointState) -> None:
+        # Hedge delays only use successful latencies; the penalty steers choose().
+        self._observe(endpoint, max(self._failure_penalty, 2 * endpoint.ewma))
+        endpoint.failures += 1
+        if endpoint.healthy and endpoint.failures >= self._failure_threshold:
+            logger.warning(
+                "Agent endpoint marked unhealthy agent=%s endpoint=%s failures=%s",
+                agent.name,
+                endpoint.url,
+                endpoint.failures,
+            )
+            self._set_health(agent, endpoint, False)
+
+    def _set_health(
+        self, agent: AgentSchema, endpoint: EndpointState, healthy: bool
+    ) -> None:
+        endpoint.healthy = healthy
+        if healthy:
+            endpoint.failures = 0
+        if self._metrics is not None:
+            self._metrics.agent_endpoint_healthy.labels(
+                agent_name=agent.name, endpoint=endpoint.url
+            ).set(1 if healthy else 0)
+
+    def _record_hedge(self, agent: AgentSchema, winner: str) -> None:
+        if self._metrics is not None:
+            self._metrics.agent_hedged_requests_total.labels(
+                agent_name=agent.name, winner=winner
+            ).inc()
+
+    async def probe_once(self) -> None:
+        """GET ``probe_path`` on every known endpoint and update its health."""
+
+        async def probe(url: str, agent: AgentSchema) -> None:
+            endpoint = self.state(url)
+            try:
+                response = await self._pools.client_for(agent, url).get(
+                    f"{url}{self._probe_path}",
+                    timeout=self._pools.settings_for(agent).connect_timeout,
+                )
+                healthy = response.status_code < 500
+            except httpx.HTTPError:
+                healthy = False
+            if healthy != endpoint.healthy:
+                logger.info("Agent endpoint %s healthy=%s", url, healthy)
+                self._set_health(agent, endpoint, healthy)
+
+        await asyncio.gather(
+            *(probe(url, agent) for url, agent in list(self._agents.items()))
+        )
+
+    async def start(self) -> None:
+        if self._probe_task is None and self._probe_interval > 0:
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+    async def stop(self) -> None:
+        task, self._probe_task = self._probe_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _probe_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._probe_interval)
+            try:
+                await self.probe_once()
+            except Exception as exc:  # noqa: BLE001 - keep probing
+                logger.warning("Agent endpoint probes failed: %s", exc)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "url": endpoint.url,
+                "healthy": endpoint.healthy,
+                "ewmaSeconds": endpoint.ewma,
+                "outstanding": endpoint.outstanding,
+                "failures": endpoint.failures,
+            }
+            for endpoint in self._endpoints.values()
+        ]
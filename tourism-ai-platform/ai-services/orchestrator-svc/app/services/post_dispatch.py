@@ -0,0 +1,161 @@
+"""Background pipeline for side effects that follow an agent run."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import zlib
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from ai_services.hub_core.metrics_collector import MetricsCollector
+
+logger = logging.getLogger(__name__)
+
+SYNC_SESSION_METADATA_KEY = "syncSession"
+
+Work = Callable[[], Awaitable[None]]
+Task = Tuple[str, Work, Optional["asyncio.Future[None]"]]
+
+
+class PostDispatchPipeline:
+    """Run post-dispatch side effects (session writes, response events) off the request path.
+
+    Work is sharded by key over ``workers`` bounded queues, so all work
+    submitted with one key (the tenant session) runs in submission order while
+    different sessions proceed in parallel. ``submit`` waits for room when the
+    shard is full, which applies backpressure instead of dropping writes.
+    Failures are logged and counted by step; they never reach the caller.
+    :meth:`run` queues work the same way but waits for it, so a caller can
+    write synchronously without overtaking work already queued for the key.
+
+    With ``sync`` set, or before :meth:`start`, work runs inline and errors
+    propagate, matching the previous behaviour.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 4,
+        max_queue: int = 1024,
+        sync: bool = False,
+        drain_timeout: float = 10.0,
+        metrics: Optional[MetricsCollector] = None,
+    ) -> None:
+        self._workers = max(1, workers)
+        self._shard_size = max(1, max_queue // self._workers)
+        self._sync = sync
+        self._drain_timeout = drain_timeout
+        self._metrics = metrics
+        self._queues: List["asyncio.Queue[Task]"] = []
+        self._tasks: List[asyncio.Task[None]] = []
+
+    @property
+    def sync(self) -> bool:
+        return self._sync
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    async def start(self) -> None:
+        if self._tasks or self._sync:
+            return
+        self._queues = [
+            asyncio.Queue(maxsize=self._shard_size) for _ in range(self._workers)
+        ]
+        self._tasks = [
+            asyncio.create_task(self._drain_loop(queue)) for queue in self._queues
+        ]
+
+    async def stop(self) -> None:
+        """Finish queued work (up to ``drain_timeout``), then stop the workers."""
+
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self.drain(), timeout=self._drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Post-dispatch pipeline stopped with %s tasks still queued",
+                self.depth(),
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for queue in self._queues:
+            while not queue.empty():
+                _, _, done = queue.get_nowait()
+                if done is not None:
+                    done.cancel()
+        self._tasks = []
+        self._queues = []
+
+    async def drain(self) -> None:
+        """Wait until everything submitted so far has run."""
+
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+
+    async def submit(self, key: str, step: str, work: Work) -> None:
+        if not self._tasks:
+            await self._run_inline(step, work)
+            return
+        await self._enqueue(key, (step, work, None))
+
+    async def run(self, key: str, step: str, work: Work) -> None:
+        """Run ``work`` after the work already queued for ``key`` and wait for it.
+
+        Errors propagate to the caller instead of being logged.
+        """
+
+        if not self._tasks:
+            await self._run_inline(step, work)
+            return
+        done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        await self._enqueue(key, (step, work, done))
+        await done
+
+    async def _enqueue(self, key: str, task: Task) -> None:
+        queue = self._queues[zlib.crc32(key.encode("utf-8")) % self._workers]
+        await queue.put(task)
+        if self._metrics is not None:
+            self._metrics.post_dispatch_queue_depth.inc()
+
+    async def _run_inline(self, step: str, work: Work) -> None:
+        try:
+            await work()
+        except Exception:
+            self._record(step, "failed")
+            raise
+        self._record(step, "ok")
+
+    async def _drain_loop(self, queue: "asyncio.Queue[Task]") -> None:
+        while True:
+            step, work, done = await queue.get()
+            if self._metrics is not None:
+                self._metrics.post_dispatch_queue_depth.dec()
+            try:
+                await work()
+                self._record(step, "ok")
+                if done is not None and not done.done():
+                    done.set_result(None)
+            except asyncio.CancelledError:
+                if done is not None:
+                    done.cancel()
+                raise
+            except Exception as exc:  # noqa: BLE001 - keep the worker alive
+                self._record(step, "failed")
+                if done is None:
+                    logger.warning("Post-dispatch %s failed: %s", step, exc)
+                elif not done.done():
+                    done.set_exception(exc)
+            finally:
+                queue.task_done()
+
+    def _record(self, step: str, result: str) -> None:
+        if self._metrics is not None:
+            self._metrics.post_dispatch_tasks_total.labels(
+                step=step, result=result
+            ).inc()
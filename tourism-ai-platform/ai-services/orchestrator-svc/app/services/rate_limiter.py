@@ -0,0 +1,230 @@
+"""Distributed per-tenant rate limiting (GCRA) backed by Redis."""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ai_services.hub_core.context_manager import ContextManager
+from ai_services.hub_core.local_cache import LocalCache
+from ai_services.hub_core.metrics_collector import MetricsCollector
+from ai_services.interfaces.schemas.tenant_schema import TenantSchema
+
+logger = logging.getLogger(__name__)
+
+TenantResolver = Callable[[str], Awaitable[Optional[TenantSchema]]]
+
+# GCRA with partial grants. KEYS[1]=theoretical arrival time (ms);
+# ARGV: emission interval ms, burst tolerance ms, requested tokens.
+# Returns {granted, retry_after_ms, remaining}.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local available = math.floor((now + tolerance - tat) / interval)
+if available < 1 then
+  return {0, math.ceil(tat + interval - tolerance - now), 0}
+end
+local granted = math.min(requested, available)
+tat = tat + granted * interval
+redis.call('SET', KEYS[1], tat, 'PX', math.ceil(tat - now) + 1)
+return {granted, 0, available - granted}
+"""
+
+ROUTE_CLASSES = ("agents", "events", "orchestrate", "default")
+_EXEMPT_PATHS = ("/health", "/metrics", "/docs", "/openapi.json", "/redoc")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rate: float
+    burst: int
+
+    @property
+    def interval_ms(self) -> float:
+        return 1000.0 / self.rate
+
+    @classmethod
+    def parse(cls, value: Any, fallback: "RateLimit") -> "RateLimit":
+        if not isinstance(value, dict):
+            return fallback
+        try:
+            rate = float(value.get("rate", fallback.rate))
+            burst = int(value.get("burst", max(1, math.ceil(rate))))
+        except (TypeError, ValueError):
+            return fallback
+        if rate <= 0 or burst < 1:
+            return fallback
+        return cls(rate=rate, burst=burst)
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: RateLimit
+    retry_after: float = 0.0
+
+
+def classify_route(method: str, path: str) -> Optional[str]:
+    """Map a request onto a rate-limit class; ``None`` for exempt endpoints."""
+
+    if method == "OPTIONS" or path.startswith(_EXEMPT_PATHS):
+        return None
+    if path.startswith("/agents/"):
+        return "agents"
+    if path.startswith("/hub/events") and method == "POST":
+        return "events"
+    if path.startswith("/orchestrate"):
+        return "orchestrate"
+    return "default"
+
+
+class TenantRateLimiter:
+    """GCRA limits per ``(tenant, route class)`` shared by every replica through Redis.
+
+    The script grants tokens in leases: a replica asks for up to
+    ``lease_size`` tokens and serves the following requests from the local
+    lease until it runs out or ``lease_ttl`` passes, so tenants well under
+    their limit only reach Redis once per lease. Unused leased tokens are
+    forfeited, which can only make the limit stricter. Limits come from
+    ``TenantSchema.metadata.rateLimits.{class}.{rate,burst}`` (falling back to
+    ``rateLimits.default`` and then the configured defaults). Redis errors
+    fail open.
+
+    Leases and resolved limits are kept for at most ``max_tenants`` tenants
+    (least recently used first out), and a lease is dropped once its tokens
+    are spent.
+    """
+
+    def __init__(
+        self,
+        *,
+        context_manager: ContextManager,
+        defaults: Dict[str, RateLimit],
+        tenant_resolver: Optional[TenantResolver] = None,
+        namespace: str = "hub",
+        lease_size: int = 8,
+        lease_ttl: float = 1.0,
+        policy_ttl: float = 30.0,
+        max_tenants: int = 10000,
+        metrics: Optional[MetricsCollector] = None,
+    ) -> None:
+        if "default" not in defaults:
+            raise ValueError("defaults must include a 'default' route class")
+        self._context_manager = context_manager
+        self._defaults = defaults
+        self._tenant_resolver = tenant_resolver
+        self._namespace = namespace
+        self._lease_size = max(1, lease_size)
+        self._lease_ttl = lease_ttl
+        self._metrics = metrics
+        self._script: Any = None
+        # (tenant, route class) -> (unspent tokens, expiry on the monotonic clock)
+        self._leases: LocalCache[Tuple[int, float]] = LocalCache(
+            max_tenants * len(ROUTE_CLASSES), lease_ttl
+        )
+        self._policies: LocalCache[Dict[str, RateLimit]] = LocalCache(
+            max_tenants, policy_ttl
+        )
+
+    async def check(self, tenant_id: str, route_class: str) -> RateLimitDecision:
+        limit = await self._limit(tenant_id, route_class)
+        lease_key = (tenant_id, route_class)
+        lease = self._leases.get(lease_key)
+        now = monotonic()
+        if lease is not None:
+            tokens, expires_at = lease
+            if tokens > 1:
+                self._leases.put(
+                    lease_key, (tokens - 1, expires_at), ttl=expires_at - now
+                )
+            else:
+                self._leases.invalidate(lease_key)
+            self._record(tenant_id, route_class, "allowed_local")
+            return RateLimitDecision(True, limit)
+
+        # Lease at most a fraction of the burst so replicas cannot hoard it.
+        requested = max(1, min(self._lease_size, limit.burst // 4))
+        try:
+            granted, retry_after_ms, _ = await self._acquire(
+                tenant_id, route_class, limit, requested
+            )
+        except Exception as exc:  # noqa: BLE001 - fail open when Redis is unavailable
+            logger.warning(
+                "Rate limit check failed for %s/%s: %s", tenant_id, route_class, exc
+            )
+            self._record(tenant_id, route_class, "error")
+            return RateLimitDecision(True, limit)
+        if granted < 1:
+            self._leases.invalidate(lease_key)
+            self._record(tenant_id, route_class, "limited")
+            return RateLimitDecision(False, limit, retry_after=retry_after_ms / 1000.0)
+        if granted > 1:
+            self._leases.put(lease_key, (granted - 1, now + self._lease_ttl))
+        else:
+            self._leases.invalidate(lease_key)
+        self._record(tenant_id, route_class, "allowed")
+        return RateLimitDecision(True, limit)
+
+    async def _acquire(
+        self,
+        tenant_id: str,
+        route_class: str,
+        limit: RateLimit,
+        requested: int,
+    ) -> Tuple[int, int, int]:
+        redis = await self._context_manager.connect()
+        if self._script is None:
+            self._script = redis.register_script(GCRA_SCRIPT)
+        result = await self._script(
+            keys=[f"{tenant_id}:{self._namespace}:ratelimit:{route_class}"],
+            args=[limit.interval_ms, limit.interval_ms * limit.burst, requested],
+        )
+        granted, retry_after_ms, remaining = (int(value) for value in result)
+        return granted, retry_after_ms, remaining
+
+    async def _limit(self, tenant_id: str, route_class: str) -> RateLimit:
+        overrides = await self._tenant_limits(tenant_id)
+        default = self._defaults.get(route_class, self._defaults["default"])
+        return overrides.get(route_class) or overrides.get("default") or default
+
+    async def _tenant_limits(self, tenant_id: str) -> Dict[str, RateLimit]:
+        cached = self._policies.get(tenant_id)
+        if cached is not None:
+            return cached
+        limits: Dict[str, RateLimit] = {}
+        if self._tenant_resolver is not None:
+            try:
+                tenant = await self._tenant_resolver(tenant_id)
+            except Exception as exc:  # noqa: BLE001 - use defaults
+                logger.debug(
+                    "Rate limit policy lookup failed for %s: %s", tenant_id, exc
+                )
+                tenant = None
+            configured = tenant.metadata.get("rateLimits") if tenant else None
+            if isinstance(configured, dict):
+                for route_class, value in configured.items():
+                    fallback = self._defaults.get(
+                        route_class, self._defaults["default"]
+                    )
+                    limits[route_class] = RateLimit.parse(value, fallback)
+        self._policies.put(tenant_id, limits)
+        return limits
+
+    def _record(self, tenant_id: str, route_class: str, decision: str) -> None:
+        if self._metrics is not None:
+            self._metrics.rate_limit_decisions_total.labels(
+                **self._metrics.bounded_labels(
+                    "rate_limit_decisions_total",
+                    tenant_id=tenant_id,
+                    route_class=route_class,
+                    decision=decision,
+                )
+            ).inc()
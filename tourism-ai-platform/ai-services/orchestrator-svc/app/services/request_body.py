@@ -0,0 +1,114 @@
+"""Agent ``/run`` request bodies assembled from pre-encoded JSON fragments."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Optional, Tuple, TypeVar
+
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+from ai_services.interfaces.schemas.event_schema import HubEvent
+from ai_services.interfaces.schemas.tenant_schema import TenantSchema
+
+_Model = TypeVar("_Model", AgentSchema, TenantSchema)
+
+
+def encode_json(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class RequestBodyEncoder:
+    """Build agent run bodies without re-serialising registry data per call.
+
+    The ``agent`` and ``tenant`` sections only change when the registry does,
+    so they are encoded once and kept as bytes. A cached fragment is reused
+    for the same model object, or for a replacement with the same agent
+    ``version`` / tenant ``updatedAt`` (registry refreshes build new objects).
+    Only the event, payload, session and channel are encoded per call. The
+    body has the same shape and key order as the previous ``dict`` body.
+    """
+
+    def __init__(self, *, max_tenants: int = 4096) -> None:
+        self._max_tenants = max_tenants
+        self._agents: Dict[str, Tuple[AgentSchema, bytes]] = {}
+        self._tenants: Dict[str, Tuple[Optional[TenantSchema], bytes]] = {}
+
+    def encode(
+        self,
+        *,
+        agent: AgentSchema,
+        tenant_id: str,
+        payload: Dict[str, Any],
+        event: HubEvent,
+        tenant: Optional[TenantSchema],
+        session_context: Optional[Dict[str, Any]],
+        channel: Optional[str],
+    ) -> bytes:
+        return b"".join(
+            (
+                b'{"agent":',
+                self.agent_fragment(agent),
+                b',"tenant":',
+                self.tenant_fragment(tenant_id, tenant),
+                b',"event":',
+                event.model_dump_json(by_alias=True).encode("utf-8"),
+                b',"payload":',
+                encode_json(payload),
+                b',"session":',
+                encode_json(session_context or {}),
+                b',"channel":',
+                encode_json(channel or event.channel or "system"),
+                b"}",
+            )
+        )
+
+    def agent_fragment(self, agent: AgentSchema) -> bytes:
+        cached = self._agents.get(agent.name)
+        if cached is not None and _same(cached[0], agent, agent.id, "version"):
+            return cached[1]
+        fragment = encode_json(
+            {
+                "id": agent.id,
+                "name": agent.name,
+                "capabilities": [
+                    cap.model_dump(mode="json") for cap in agent.capabilities
+                ],
+            }
+        )
+        self._agents[agent.name] = (agent, fragment)
+        return fragment
+
+    def tenant_fragment(self, tenant_id: str, tenant: Optional[TenantSchema]) -> bytes:
+        cached = self._tenants.get(tenant_id)
+        if cached is not None and (
+            cached[0] is tenant
+            or (
+                tenant is not None and _same(cached[0], tenant, tenant.id, "updated_at")
+            )
+        ):
+            return cached[1]
+        if tenant is not None:
+            fragment = tenant.model_dump_json(by_alias=True).encode("utf-8")
+        else:
+            fragment = encode_json({"id": tenant_id})
+        self._tenants.pop(tenant_id, None)
+        while len(self._tenants) >= self._max_tenants:
+            self._tenants.pop(next(iter(self._tenants)))
+        self._tenants[tenant_id] = (tenant, fragment)
+        return fragment
+
+    def forget_agent(self, name: str) -> None:
+        self._agents.pop(name, None)
+
+    def forget_tenant(self, tenant_id: str) -> None:
+        self._tenants.pop(tenant_id, None)
+
+
+def _same(
+    cached: Optional[_Model], current: _Model, identity: str, version_field: str
+) -> bool:
+    if cached is current:
+        return True
+    if cached is None or cached.id != identity:
+        return False
+    version = getattr(current, version_field)
+    return version is not None and getattr(cached, version_field) == version
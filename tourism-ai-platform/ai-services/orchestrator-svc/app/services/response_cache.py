@@ -0,0 +1,196 @@
+"""Two-tier result cache for idempotent agent capabilities."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from ai_services.hub_core.context_manager import ContextManager
+from ai_services.hub_core.local_cache import LocalCache
+from ai_services.hub_core.metrics_collector import MetricsCollector
+from ai_services.hub_core.single_flight import SingleFlight
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+
+logger = logging.getLogger(__name__)
+
+Compute = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class AgentResponseCache:
+    """Cache agent results for capabilities declared cacheable.
+
+    A capability is cacheable when its ``AgentCapability.cacheable`` flag is
+    set or it is listed in ``agent.metadata.cache.capabilities``. The TTL comes
+    from ``cacheTtl`` on the capability, then ``metadata.cache.ttl``, then
+    ``default_ttl``. Entries are keyed by tenant, agent, agent version,
+    capability and a hash of the canonical JSON payload, and live in an
+    in-process LRU in front of Redis. Concurrent misses for one key share a
+    single agent call. A new agent version never matches old keys; local
+    entries for the previous version are dropped as soon as the registry
+    reports it, and Redis entries expire on their TTL.
+    """
+
+    def __init__(
+        self,
+        *,
+        context_manager: ContextManager,
+        namespace: str = "hub",
+        local_size: int = 1024,
+        local_ttl: float = 30.0,
+        default_ttl: float = 300.0,
+        metrics: Optional[MetricsCollector] = None,
+    ) -> None:
+        self._context_manager = context_manager
+        self._namespace = namespace
+        self._local: Optional[LocalCache[Dict[str, Any]]] = (
+            LocalCache(local_size, local_ttl) if local_size > 0 else None
+        )
+        self._default_ttl = default_ttl
+        self._metrics = metrics
+        self._loads: SingleFlight[Dict[str, Any]] = SingleFlight()
+        self._versions: Dict[str, Optional[str]] = {}
+
+    def ttl_for(self, agent: AgentSchema, capability: Optional[str]) -> Optional[float]:
+        """Cache TTL for ``capability`` on ``agent``; ``None`` when it is not cacheable."""
+
+        if not capability:
+            return None
+        settings = agent.metadata.get("cache")
+        settings = settings if isinstance(settings, dict) else {}
+        declared = next(
+            (cap for cap in agent.capabilities if cap.name == capability), None
+        )
+        listed = capability in (settings.get("capabilities") or ())
+        if not listed and (declared is None or not declared.cacheable):
+            return None
+        for candidate in (
+            declared.cache_ttl if declared else None,
+            settings.get("ttl"),
+        ):
+            try:
+                if candidate is not None and float(candidate) > 0:
+                    return float(candidate)
+            except (TypeError, ValueError):
+                continue
+        return self._default_ttl
+
+    async def get_or_compute(
+        self,
+        *,
+        agent: AgentSchema,
+        tenant_id: str,
+        capability: str,
+        payload: Dict[str, Any],
+        ttl: float,
+        compute: Compute,
+    ) -> Tuple[Dict[str, Any], str]:
+        """Return ``(result, source)``; ``source`` is ``agent``, ``local``, ``redis`` or ``shared``.
+
+        Cached results are shared between callers and must not be mutated.
+        """
+
+        key = self._key(agent, tenant_id, capability, payload)
+        if self._local is not None:
+            cached = self._local.get(key)
+            if cached is not None:
+                self._record(agent, "local_hit")
+                return cached, "local"
+
+        loaded: Dict[str, str] = {}
+
+        async def load() -> Dict[str, Any]:
+            result, loaded["source"] = await self._load(key, ttl, compute)
+            return result
+
+        result = await self._loads.do(key, load)
+        source = loaded.get("source")
+        if source is None:
+            self._record(agent, "coalesced")
+            return result, "shared"
+        self._record(agent, "redis_hit" if source == "redis" else "miss")
+        return result, source
+
+    async def _load(
+        self, key: str, ttl: float, compute: Compute
+    ) -> Tuple[Dict[str, Any], str]:
+        token = self._local.fill_token() if self._local is not None else None
+        result = await self._read_redis(key)
+        source = "redis"
+        if result is None:
+            result = await compute()
+            source = "agent"
+            await self._write_redis(key, result, ttl)
+        if self._local is not None:
+            self._local.put(key, result, ttl=min(ttl, self._local.ttl), token=token)
+        return result, source
+
+    async def observe_agents(self, agents: Iterable[AgentSchema]) -> None:
+        """Registry listener: drop local entries of agents whose version changed."""
+
+        for agent in agents:
+            previous = self._versions.get(agent.name, agent.version)
+            self._versions[agent.name] = agent.version
+            if previous != agent.version and self._local is not None:
+                prefix = f":{self._namespace}:agent-cache:{agent.name}:"
+                dropped = self._local.invalidate_where(
+                    lambda key: isinstance(key, str) and prefix in key
+                )
+                logger.info(
+                    "Agent %s changed version %s -> %s; dropped %s cached results",
+                    agent.name,
+                    previous,
+                    agent.version,
+                    dropped,
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        return self._local.stats() if self._local is not None else {}
+
+    def _key(
+        self,
+        agent: AgentSchema,
+        tenant_id: str,
+        capability: str,
+        payload: Dict[str, Any],
+    ) -> str:
+        canonical = json.dumps(
+            payload,
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        version = agent.version or "unversioned"
+        return f"{tenant_id}:{self._namespace}:agent-cache:{agent.name}:{version}:{capability}:{digest}"
+
+    async def _read_redis(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            redis = await self._context_manager.connect()
+            raw = await redis.get(key)
+        except Exception as exc:  # noqa: BLE001 - a cache outage must not fail the call
+            logger.warning("Agent cache read failed for %s: %s", key, exc)
+            return None
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+
+    async def _write_redis(self, key: str, result: Dict[str, Any], ttl: float) -> None:
+        try:
+            redis = await self._context_manager.connect()
+            await redis.set(
+                key, json.dumps(result, ensure_ascii=False), ex=max(1, int(ttl))
+            )
+        except Exception as exc:  # noqa: BLE001 - best effort
+            logger.warning("Agent cache write failed for %s: %s", key, exc)
+
+    def _record(self, agent: AgentSchema, result: str) -> None:
+        if self._metrics is not None:
+            self._metrics.agent_cache_requests_total.labels(
+                agent_name=agent.name, result=result
+            ).inc()
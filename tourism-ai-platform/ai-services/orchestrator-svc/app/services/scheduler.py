@@ -0,0 +1,234 @@
+"""Weighted fair admission control for agent executions."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+
+from ai_services.hub_core.local_cache import LocalCache
+from ai_services.hub_core.metrics_collector import MetricsCollector
+from ai_services.interfaces.schemas.tenant_schema import TenantSchema
+
+logger = logging.getLogger(__name__)
+
+TenantResolver = Callable[[str], Awaitable[Optional[TenantSchema]]]
+
+
+@dataclass(frozen=True)
+class TenantPolicy:
+    weight: float = 1.0
+    max_concurrency: Optional[int] = None
+
+    @classmethod
+    def from_tenant(cls, tenant: Optional[TenantSchema]) -> "TenantPolicy":
+        """Read ``metadata.scheduling.{weight,maxConcurrency}``; invalid values fall back to defaults."""
+
+        scheduling = (tenant.metadata.get("scheduling") if tenant else None) or {}
+        if not isinstance(scheduling, dict):
+            return cls()
+        try:
+            weight = float(scheduling.get("weight", 1.0))
+        except (TypeError, ValueError):
+            weight = 1.0
+        try:
+            cap = scheduling.get("maxConcurrency")
+            max_concurrency = int(cap) if cap is not None else None
+        except (TypeError, ValueError):
+            max_concurrency = None
+        return cls(
+            weight=weight if weight > 0 else 1.0,
+            max_concurrency=(
+                max_concurrency if max_concurrency and max_concurrency > 0 else None
+            ),
+        )
+
+
+class TenantScheduler:
+    """Deficit round-robin over per-tenant queues with global and per-tenant caps.
+
+    Every admission costs one unit. Tenants with queued work take turns; a
+    tenant whose deficit is below one unit is topped up by ``quantum * weight``
+    and moved to the back of the ring, so over time tenants are admitted in
+    proportion to their weights regardless of how much each one submits.
+
+    Only tenants with queued or running work keep queue state; resolved
+    policies are cached for ``policy_ttl`` seconds, at most ``max_policies``
+    tenants at a time.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 64,
+        tenant_concurrency: Optional[int] = 16,
+        quantum: float = 1.0,
+        tenant_resolver: Optional[TenantResolver] = None,
+        policy_ttl: float = 30.0,
+        max_policies: int = 4096,
+        metrics: Optional[MetricsCollector] = None,
+    ) -> None:
+        self._max_concurrency = max(1, max_concurrency)
+        self._tenant_concurrency = tenant_concurrency
+        self._quantum = quantum
+        self._tenant_resolver = tenant_resolver
+        self._metrics = metrics
+        self._policies: LocalCache[TenantPolicy] = LocalCache(max_policies, policy_ttl)
+        self._queues: Dict[str, Deque[asyncio.Future[None]]] = {}
+        self._ring: Deque[str] = deque()
+        self._deficits: Dict[str, float] = {}
+        self._inflight: Dict[str, int] = {}
+        self._total_inflight = 0
+
+    @property
+    def inflight(self) -> int:
+        return self._total_inflight
+
+    def queue_depth(self, tenant_id: str) -> int:
+        return len(self._queues.get(tenant_id, ()))
+
+    @asynccontextmanager
+    async def slot(self, tenant_id: str) -> AsyncIterator[None]:
+        """Wait for this tenant's turn, hold an execution slot for the block."""
+
+        # _dispatch cannot await, so resolve the policy before queueing.
+        await self._policy(tenant_id)
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        queue = self._queues.setdefault(tenant_id, deque())
+        if not queue:
+            self._ring.append(tenant_id)
+            self._deficits.setdefault(tenant_id, 0.0)
+        queue.append(waiter)
+        self._record_depth(tenant_id)
+        started = perf_counter()
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(tenant_id)
+            else:
+                self._discard(tenant_id, waiter)
+            raise
+        self._record_wait(tenant_id, perf_counter() - started)
+        try:
+            yield
+        finally:
+            self._release(tenant_id)
+
+    async def run(self, tenant_id: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        async with self.slot(tenant_id):
+            return await func()
+
+    async def _policy(self, tenant_id: str) -> TenantPolicy:
+        cached = self._policies.get(tenant_id)
+        if cached is not None:
+            return cached
+        policy = TenantPolicy()
+        if self._tenant_resolver is not None:
+            try:
+                policy = TenantPolicy.from_tenant(
+                    await self._tenant_resolver(tenant_id)
+                )
+            except Exception as exc:  # noqa: BLE001 - schedule with defaults
+                logger.debug(
+                    "Scheduling policy lookup failed for %s: %s", tenant_id, exc
+                )
+        self._policies.put(tenant_id, policy)
+        return policy
+
+    def _cached_policy(self, tenant_id: str) -> TenantPolicy:
+        return self._policies.get(tenant_id) or TenantPolicy()
+
+    def _tenant_cap(self, tenant_id: str) -> Optional[int]:
+        cap = self._cached_policy(tenant_id).max_concurrency
+        if cap is None:
+            return self._tenant_concurrency
+        if self._tenant_concurrency is None:
+            return cap
+        return min(cap, self._tenant_concurrency)
+
+    def _dispatch(self) -> None:
+        capped = 0
+        while self._total_inflight < self._max_concurrency and self._ring:
+            if capped >= len(self._ring):
+                return  # every waiting tenant is at its own cap
+            tenant_id = self._ring[0]
+            queue = self._queues.get(tenant_id)
+            if not queue:
+                self._retire(tenant_id)
+                continue
+            cap = self._tenant_cap(tenant_id)
+            if cap is not None and self._inflight.get(tenant_id, 0) >= cap:
+                self._ring.rotate(-1)
+                capped += 1
+                continue
+            if self._deficits[tenant_id] < 1.0:
+                self._deficits[tenant_id] += (
+                    self._quantum * self._cached_policy(tenant_id).weight
+                )
+                self._ring.rotate(-1)
+                capped = 0  # a top-up is progress; recount capped tenants
+                continue
+            capped = 0
+            waiter = queue.popleft()
+            if waiter.done():
+                continue
+            self._deficits[tenant_id] -= 1.0
+            self._inflight[tenant_id] = self._inflight.get(tenant_id, 0) + 1
+            self._total_inflight += 1
+            waiter.set_result(None)
+            self._record_depth(tenant_id)
+            if not queue:
+                self._retire(tenant_id)
+
+    def _retire(self, tenant_id: str) -> None:
+        """Drop a tenant with an empty queue from the ring and forget its state.
+
+        DRR does not let idle tenants bank deficit, so nothing is kept for a
+        tenant until it queues again.
+        """
+
+        if self._ring and self._ring[0] == tenant_id:
+            self._ring.popleft()
+        elif tenant_id in self._ring:
+            self._ring.remove(tenant_id)
+        self._deficits.pop(tenant_id, None)
+        self._queues.pop(tenant_id, None)
+
+    def _release(self, tenant_id: str) -> None:
+        remaining = self._inflight.get(tenant_id, 0) - 1
+        if remaining > 0:
+            self._inflight[tenant_id] = remaining
+        else:
+            self._inflight.pop(tenant_id, None)
+        self._total_inflight -= 1
+        self._dispatch()
+
+    def _discard(self, tenant_id: str, waiter: asyncio.Future[None]) -> None:
+        queue = self._queues.get(tenant_id)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            self._record_depth(tenant_id)
+            if not queue:
+                self._retire(tenant_id)
+
+    def _record_depth(self, tenant_id: str) -> None:
+        if self._metrics is not None:
+            self._metrics.scheduler_queue_depth.labels(
+                **self._metrics.bounded_labels(
+                    "scheduler_queue_depth", tenant_id=tenant_id
+                )
+            ).set(self.queue_depth(tenant_id))
+
+    def _record_wait(self, tenant_id: str, seconds: float) -> None:
+        if self._metrics is not None:
+            self._metrics.scheduler_wait_seconds.labels(
+                **self._metrics.bounded_labels(
+                    "scheduler_wait_seconds", tenant_id=tenant_id
+                )
+            ).observe(seconds)
@@ -4,17 +4,25 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Dict, Optional
+from functools import partial
+from typing import Any, Dict, Iterable, Optional
 
 from ai_services.hub_core.context_manager import ContextManager
+from ai_services.hub_core.local_cache import LocalCache
 from ai_services.hub_core.registry_client import RegistryClient
+from ai_services.hub_core.single_flight import SingleFlight
 from ai_services.interfaces.schemas.tenant_schema import TenantSchema
 
 logger = logging.getLogger(__name__)
 
 
 class TenantContextService:
-    """Provide isolation and caching for tenant level configuration."""
+    """Provide isolation and caching for tenant level configuration.
+
+    Concurrent lookups of one tenant share a single Redis/registry load, and
+    tenants the registry does not know are remembered for ``negative_ttl``
+    seconds (at most ``max_unknown`` of them) before being looked up again.
+    """
 
     def __init__(
         self,
@@ -22,22 +30,39 @@ class TenantContextService:
         context_manager: ContextManager,
         registry_client: RegistryClient,
         default_ttl: int = 3600,
+        negative_ttl: float = 30.0,
+        max_unknown: int = 4096,
     ) -> None:
         self._context_manager = context_manager
         self._registry_client = registry_client
         self._default_ttl = default_ttl
+        self._negative_ttl = negative_ttl
         self._tenant_cache: Dict[str, TenantSchema] = {}
+        self._unknown: LocalCache[bool] = LocalCache(max_unknown, negative_ttl)
+        self._loads: SingleFlight[Optional[TenantSchema]] = SingleFlight()
         self._lock = asyncio.Lock()
 
-    async def get_tenant(self, tenant_id: str, *, use_cache: bool = True) -> Optional[TenantSchema]:
-        if use_cache and tenant_id in self._tenant_cache:
-            return self._tenant_cache[tenant_id]
+    async def get_tenant(
+        self, tenant_id: str, *, use_cache: bool = True
+    ) -> Optional[TenantSchema]:
+        if use_cache:
+            if tenant_id in self._tenant_cache:
+                return self._tenant_cache[tenant_id]
+            if self._unknown.get(tenant_id, False):
+                return None
+        return await self._loads.do(
+            (tenant_id, use_cache), partial(self._load_tenant, tenant_id, use_cache)
+        )
 
+    async def _load_tenant(
+        self, tenant_id: str, use_cache: bool
+    ) -> Optional[TenantSchema]:
         context = await self._context_manager.get_tenant_context(tenant_id)
         if context and "tenant" in context:
             tenant = TenantSchema.model_validate(context["tenant"])
             if use_cache:
                 self._tenant_cache[tenant_id] = tenant
+            self._unknown.invalidate(tenant_id)
             return tenant
 
         tenant = await self._registry_client.get_tenant(tenant_id)
@@ -49,10 +74,70 @@ class TenantContextService:
             )
             if use_cache:
                 self._tenant_cache[tenant_id] = tenant
+            self._unknown.invalidate(tenant_id)
         else:
             logger.warning("Tenant %s not found in registry", tenant_id)
+            self._remember_unknown([tenant_id])
         return tenant
 
+    def _remember_unknown(self, tenant_ids: Iterable[str]) -> None:
+        if self._negative_ttl > 0:
+            for tenant_id in tenant_ids:
+                self._unknown.put(tenant_id, True)
+
+    async def get_tenants(
+        self, tenant_ids: Iterable[str], *, use_cache: bool = True
+    ) -> Dict[str, TenantSchema]:
+        """Bulk :meth:`get_tenant`; unknown tenants are omitted.
+
+        Costs one ``MGET`` of tenant contexts, one batched registry lookup for
+        the misses and one pipelined write-back, whatever the number of ids.
+        """
+
+        wanted = list(dict.fromkeys(tenant_ids))
+        found: Dict[str, TenantSchema] = {}
+        if use_cache:
+            found = {
+                tenant_id: self._tenant_cache[tenant_id]
+                for tenant_id in wanted
+                if tenant_id in self._tenant_cache
+            }
+            wanted = [
+                tenant_id
+                for tenant_id in wanted
+                if not self._unknown.get(tenant_id, False)
+            ]
+        pending = [tenant_id for tenant_id in wanted if tenant_id not in found]
+        if pending:
+            contexts = await self._context_manager.get_tenant_contexts(pending)
+            for tenant_id, context in contexts.items():
+                if "tenant" in context:
+                    found[tenant_id] = TenantSchema.model_validate(context["tenant"])
+            pending = [tenant_id for tenant_id in pending if tenant_id not in found]
+        if pending:
+            fetched = await self._registry_client.get_tenants(pending)
+            await self._context_manager.set_tenant_contexts(
+                {
+                    tenant_id: {"tenant": tenant.model_dump(mode="json", by_alias=True)}
+                    for tenant_id, tenant in fetched.items()
+                },
+                ttl=self._default_ttl,
+            )
+            found.update(fetched)
+            for tenant_id in fetched:
+                self._unknown.invalidate(tenant_id)
+            unknown = [tenant_id for tenant_id in pending if tenant_id not in fetched]
+            if unknown:
+                logger.warning(
+                    "%s of %s requested tenants not found in registry",
+                    len(unknown),
+                    len(pending),
+                )
+                self._remember_unknown(unknown)
+        if use_cache:
+            self._tenant_cache.update(found)
+        return found
+
     async def get_environment(self, tenant_id: str) -> Dict[str, str]:
         tenant = await self.get_tenant(tenant_id)
         if not tenant:
@@ -81,6 +166,52 @@ class TenantContextService:
     ) -> Optional[Dict[str, Any]]:
         return await self._context_manager.get_session_context(tenant_id, session_id)
 
+    async def update_session_state(
+        self,
+        tenant_id: str,
+        session_id: str,
+        changes: Dict[str, Any],
+        *,
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Merge ``changes`` into the session; ``None`` values remove fields."""
+
+        await self._context_manager.patch_session_context(
+            tenant_id,
+            session_id,
+            changes,
+            ttl=ttl or self._default_ttl,
+        )
+
+    async def increment_session_counter(
+        self,
+        tenant_id: str,
+        session_id: str,
+        field: str,
+        amount: int = 1,
+    ) -> int | float:
+        return await self._context_manager.increment_session_field(
+            tenant_id, session_id, field, amount, ttl=self._default_ttl
+        )
+
+    async def append_session_history(
+        self,
+        tenant_id: str,
+        session_id: str,
+        field: str,
+        item: Any,
+        *,
+        max_items: Optional[int] = None,
+    ) -> int:
+        return await self._context_manager.append_session_field(
+            tenant_id,
+            session_id,
+            field,
+            item,
+            max_items=max_items,
+            ttl=self._default_ttl,
+        )
+
     async def clear_session_state(self, tenant_id: str, session_id: str) -> None:
         await self._context_manager.delete_session_context(tenant_id, session_id)
 
@@ -91,8 +222,17 @@ class TenantContextService:
                 self._tenant_cache[tenant_id] = tenant
         return tenant
 
+    async def warm_tenants(self, tenant_ids: Iterable[str]) -> Dict[str, TenantSchema]:
+        """Load many tenants into the in-process cache, bypassing what it already holds."""
+
+        tenants = await self.get_tenants(tenant_ids, use_cache=False)
+        self._tenant_cache.update(tenants)
+        return tenants
+
     def discard_cache(self, tenant_id: Optional[str] = None) -> None:
         if tenant_id:
             self._tenant_cache.pop(tenant_id, None)
+            self._unknown.invalidate(tenant_id)
         else:
             self._tenant_cache.clear()
+            self._unknown.clear()
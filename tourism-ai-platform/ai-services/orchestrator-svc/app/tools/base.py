@@ -9,6 +9,12 @@ from typing import Any, Dict, Optional
 import httpx
 from opentelemetry import trace
 
+from ai_services.hub_core.deadline import (
+    DeadlineExceeded,
+    check_deadline,
+    current_deadline,
+)
+
 from .metrics import integration_histogram
 
 logger = logging.getLogger(__name__)
@@ -60,7 +66,11 @@ class BaseTool(ABC):
         span_name = f"{self.provider_name}.{method.lower()}"
         while attempt < retries:
             attempt += 1
-            async with tracer.start_as_current_span(span_name) as span:
+            # Each attempt gets what is left of the request deadline, if any.
+            check_deadline(f"calling {self.provider_name}")
+            deadline = current_deadline()
+            timeout = self.timeout if deadline is None else deadline.cap(self.timeout)
+            with tracer.start_as_current_span(span_name) as span:
                 span.set_attribute("integration_call", self.provider_name)
                 span.set_attribute("http.method", method.upper())
                 span.set_attribute("http.url", url)
@@ -71,6 +81,7 @@ class BaseTool(ABC):
                         url=url,
                         json=json_payload,
                         headers=headers,
+                        timeout=timeout,
                     )
                     duration = perf_counter() - start_time
                     span.set_attribute("http.status_code", response.status_code)
@@ -91,6 +102,11 @@ class BaseTool(ABC):
                     ).observe(duration)
                     span.record_exception(exc)
                     span.set_attribute("error", True)
+                    if deadline is not None and deadline.expired:
+                        # Out of budget: not the provider's fault, and no time to retry.
+                        raise DeadlineExceeded(
+                            f"deadline exceeded calling {self.provider_name}"
+                        ) from exc
                     self._failure_count += 1
                     if self._failure_count >= retries:
                         self._trip_circuit()
@@ -103,5 +119,9 @@ class BaseTool(ABC):
                         )
                         raise
                     sleep_for = backoff_base * (2 ** (attempt - 1))
+                    if deadline is not None and deadline.remaining() <= sleep_for:
+                        raise DeadlineExceeded(
+                            f"no deadline budget left to retry {self.provider_name}"
+                        ) from exc
                     await asyncio.sleep(sleep_for)
         raise RuntimeError(f"Failed to contact {self.provider_name}")
@@ -4,7 +4,7 @@ import asyncio
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from aiokafka import AIOKafkaProducer
 
@@ -29,7 +29,9 @@ class KafkaEventProducer:
                 return
             self._producer = AIOKafkaProducer(
                 bootstrap_servers=self._brokers,
-                value_serializer=lambda v: json.dumps(v, ensure_ascii=False).encode("utf-8"),
+                value_serializer=lambda v: json.dumps(v, ensure_ascii=False).encode(
+                    "utf-8"
+                ),
             )
             try:
                 await self._producer.start()
@@ -58,6 +60,47 @@ class KafkaEventProducer:
         except Exception as exc:  # pragma: no cover
             logger.warning("Failed to publish Kafka event %s: %s", topic, exc)
 
+    async def send_events(
+        self, messages: Sequence[Tuple[str, Dict[str, Any]]]
+    ) -> List[Optional[Exception]]:
+        """Enqueue all messages before awaiting delivery so the producer can batch them.
+
+        Returns one entry per message: ``None`` on success or the delivery error.
+        """
+
+        if not messages:
+            return []
+        if not self._brokers:
+            logger.debug(
+                "Dropping %s Kafka events; no brokers configured", len(messages)
+            )
+            return [None] * len(messages)
+        await self.start()
+        if not self._producer:
+            logger.debug(
+                "Kafka producer unavailable; dropping %s events", len(messages)
+            )
+            return [None] * len(messages)
+        deliveries: List[Any] = []
+        for topic, payload in messages:
+            try:
+                deliveries.append(await self._producer.send(topic, payload))
+            except Exception as exc:  # pragma: no cover
+                deliveries.append(exc)
+        pending = [
+            delivery for delivery in deliveries if not isinstance(delivery, Exception)
+        ]
+        outcomes = iter(await asyncio.gather(*pending, return_exceptions=True))
+        errors: List[Optional[Exception]] = []
+        for (topic, _), delivery in zip(messages, deliveries):
+            outcome = delivery if isinstance(delivery, Exception) else next(outcomes)
+            if isinstance(outcome, Exception):
+                logger.warning("Failed to publish Kafka event %s: %s", topic, outcome)
+                errors.append(outcome)
+            else:
+                errors.append(None)
+        return errors
+
 
 async def emit_case_event(
     producer: KafkaEventProducer,
@@ -0,0 +1,42 @@
+"""Standalone hub worker process: ``python -m app.worker``.
+
+Builds the same dependency graph as the API, runs its startup hooks and
+consumes tenant hub streams until SIGINT/SIGTERM. Run several processes
+with the same ``HUB_WORKER_GROUP`` to scale dispatch horizontally.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+
+from .main import create_app
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker() -> None:
+    app = create_app()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    await app.router.startup()
+    worker = app.state.hub_worker
+    await worker.start()
+    logger.info("Hub worker %s running", worker.consumer)
+    try:
+        await stop.wait()
+    finally:
+        await app.router.shutdown()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
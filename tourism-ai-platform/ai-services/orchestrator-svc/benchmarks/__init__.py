@@ -0,0 +1,27 @@
+"""Performance harnesses for the orchestrator service."""
+
+import sys
+from pathlib import Path
+
+# Ensure the shared ai_services package is available when run with ``python -m``
+BASE_DIR = Path(__file__).resolve().parents[2]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from .stand_ins import (
+    InMemoryKafkaProducer,
+    InMemoryRedis,
+    InMemoryS3Client,
+    StandInLatency,
+    StandInRegistry,
+    install_stand_ins,
+)
+
+__all__ = [
+    "InMemoryKafkaProducer",
+    "InMemoryRedis",
+    "InMemoryS3Client",
+    "StandInLatency",
+    "StandInRegistry",
+    "install_stand_ins",
+]
@@ -0,0 +1,126 @@
+"""Hub event ingestion throughput: ``/hub/events/publish`` vs ``publish:batch``.
+
+Usage::
+
+    python -m benchmarks.hub_ingest --events 2000 --batch-size 100 \
+        --redis-latency-ms 1 --kafka-latency-ms 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.main import create_app
+
+from .stand_ins import StandInLatency, install_stand_ins
+
+
+def build_events(count: int, *, tenants: int = 4) -> List[Dict[str, Any]]:
+    timestamp = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "id": f"evt-{index}",
+            "tenantId": f"bench-tenant-{index % tenants}",
+            "type": "channel.message",
+            "source": "whatsapp",
+            "channel": "whatsapp",
+            "timestamp": timestamp,
+            "payload": {"text": f"message {index}"},
+        }
+        for index in range(count)
+    ]
+
+
+async def run_ingest(
+    *,
+    events: int = 1000,
+    batch_size: int = 100,
+    concurrency: int = 8,
+    latency: Optional[StandInLatency] = None,
+) -> Dict[str, Any]:
+    """Publish ``events`` one-by-one and in batches; return events/sec for each mode."""
+
+    app = create_app()
+    await install_stand_ins(app, latency or StandInLatency())
+    documents = build_events(events)
+    transport = httpx.ASGITransport(app=app)
+    report: Dict[str, Any] = {
+        "events": events,
+        "batchSize": batch_size,
+        "concurrency": concurrency,
+    }
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://orchestrator"
+    ) as client:
+        single_queue = list(documents)
+
+        async def single_worker() -> None:
+            while single_queue:
+                await client.post("/hub/events/publish", json=single_queue.pop())
+
+        started = perf_counter()
+        await asyncio.gather(*(single_worker() for _ in range(concurrency)))
+        single_elapsed = perf_counter() - started
+
+        batches = [
+            documents[i : i + batch_size] for i in range(0, len(documents), batch_size)
+        ]
+
+        async def batch_worker() -> None:
+            while batches:
+                await client.post("/hub/events/publish:batch", json=batches.pop())
+
+        started = perf_counter()
+        await asyncio.gather(*(batch_worker() for _ in range(concurrency)))
+        batch_elapsed = perf_counter() - started
+
+    await app.state.agent_executor.close()
+    await app.state.registry_client.close()
+    await app.state.context_manager.close()
+
+    report["single"] = {
+        "elapsedSeconds": single_elapsed,
+        "eventsPerSecond": events / single_elapsed,
+    }
+    report["batch"] = {
+        "elapsedSeconds": batch_elapsed,
+        "eventsPerSecond": events / batch_elapsed,
+    }
+    report["speedup"] = single_elapsed / batch_elapsed if batch_elapsed else None
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--redis-latency-ms", type=float, default=0.5)
+    parser.add_argument("--kafka-latency-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+    latency = StandInLatency(
+        redis=args.redis_latency_ms / 1000, kafka=args.kafka_latency_ms / 1000
+    )
+    report = asyncio.run(
+        run_ingest(
+            events=args.events,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            latency=latency,
+        )
+    )
+    print(json.dumps(report, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
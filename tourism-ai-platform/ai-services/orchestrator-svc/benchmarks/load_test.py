@@ -0,0 +1,304 @@
+"""End-to-end load test for the orchestrator ``/orchestrate`` routes.
+
+Boots ``create_app()`` with in-process stand-ins, drives ``/orchestrate/start``
+and ``/orchestrate/approval`` at a fixed concurrency and writes a JSON report
+with throughput, latency percentiles and a per-node breakdown.
+
+Usage::
+
+    python -m benchmarks.load_test --requests 500 --concurrency 32 \
+        --redis-latency-ms 1 --amadeus-latency-ms 40 --output report.json
+
+Compare two runs (e.g. before/after a commit)::
+
+    python -m benchmarks.load_test --compare baseline.json --output current.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import subprocess
+import sys
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from pathlib import Path
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from app.graph.workflow import configure_workflow_dependencies
+from app.main import create_app
+from app.middleware.langsmith_trace import LangsmithTracer
+
+from .stand_ins import StandInLatency, install_stand_ins
+
+START_ROUTE = "/orchestrate/start"
+APPROVAL_ROUTE = "/orchestrate/approval"
+
+
+class NodeTimingTracer(LangsmithTracer):
+    """Langsmith tracer replacement that records per-node wall time."""
+
+    def __init__(self) -> None:
+        super().__init__(None)
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    @asynccontextmanager
+    async def trace(self, node_name: str, case_id: str) -> AsyncIterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[node_name].append(perf_counter() - start)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile over an already sorted list."""
+
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def summarise(
+    samples: List[float], *, elapsed: Optional[float] = None
+) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    summary: Dict[str, Any] = {
+        "count": len(ordered),
+        "meanMs": (sum(ordered) / len(ordered) * 1000) if ordered else 0.0,
+        "p50Ms": percentile(ordered, 50) * 1000,
+        "p95Ms": percentile(ordered, 95) * 1000,
+        "p99Ms": percentile(ordered, 99) * 1000,
+        "maxMs": (ordered[-1] * 1000) if ordered else 0.0,
+    }
+    if elapsed is not None:
+        summary["throughputRps"] = len(ordered) / elapsed if elapsed > 0 else 0.0
+    return summary
+
+
+def _journey_payload(index: int, *, needs_approval: bool) -> Dict[str, Any]:
+    return {
+        "tenantId": f"bench-tenant-{index % 4}",
+        "caseId": f"bench-case-{index}",
+        "patient": {"firstName": "Bench"},
+        "intake": {
+            "targetProcedure": "Rhinoplasty",
+            "metrics": {"bmi": 35 if needs_approval else 24},
+        },
+    }
+
+
+async def run_load_test(
+    *,
+    requests: int = 200,
+    concurrency: int = 16,
+    approval_ratio: float = 0.5,
+    latency: Optional[StandInLatency] = None,
+) -> Dict[str, Any]:
+    """Run ``requests`` patient journeys and return the JSON-ready report.
+
+    A journey is one ``/orchestrate/start`` call; journeys that end in
+    ``awaiting-approval`` are followed by an ``/orchestrate/approval`` call.
+    """
+
+    latency = latency or StandInLatency()
+    app = create_app()
+    stand_ins = await install_stand_ins(app, latency)
+    tracer = NodeTimingTracer()
+    configure_workflow_dependencies(
+        redis=app.state.redis_store,
+        kafka=app.state.kafka_producer,
+        langsmith=tracer,
+        d365=app.state.d365_tool,
+        amadeus=app.state.amadeus_tool,
+        s3=app.state.s3_tool,
+    )
+    app.state.langsmith_tracer = tracer
+
+    route_samples: Dict[str, List[float]] = {START_ROUTE: [], APPROVAL_ROUTE: []}
+    errors: Dict[str, int] = {START_ROUTE: 0, APPROVAL_ROUTE: 0}
+    approvals_every = int(round(1 / approval_ratio)) if approval_ratio > 0 else 0
+    next_index = 0
+
+    async def timed_post(
+        client: httpx.AsyncClient, route: str, body: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        start = perf_counter()
+        try:
+            response = await client.post(
+                route, json=body, headers={"X-Tenant": body["tenantId"]}
+            )
+        except Exception:
+            errors[route] += 1
+            return None
+        route_samples[route].append(perf_counter() - start)
+        if response.status_code != 200:
+            errors[route] += 1
+            return None
+        return response.json()
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            needs_approval = bool(approvals_every) and index % approvals_every == 0
+            body = _journey_payload(index, needs_approval=needs_approval)
+            state = await timed_post(client, START_ROUTE, body)
+            if state and state.get("status") == "awaiting-approval":
+                await timed_post(
+                    client,
+                    APPROVAL_ROUTE,
+                    {
+                        "tenantId": body["tenantId"],
+                        "caseId": body["caseId"],
+                        "decision": "APPROVED",
+                    },
+                )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://orchestrator"
+    ) as client:
+        started = perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(max(1, concurrency))))
+        elapsed = perf_counter() - started
+
+    await app.state.d365_tool.close()
+    await app.state.amadeus_tool.close()
+    await app.state.agent_executor.close()
+    await app.state.registry_client.close()
+    await app.state.context_manager.close()
+
+    all_samples = [sample for samples in route_samples.values() for sample in samples]
+    return {
+        "revision": _git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "config": {
+            "requests": requests,
+            "concurrency": concurrency,
+            "approvalRatio": approval_ratio,
+            "latencySeconds": asdict(latency),
+        },
+        "elapsedSeconds": elapsed,
+        "overall": {
+            **summarise(all_samples, elapsed=elapsed),
+            "errors": sum(errors.values()),
+        },
+        "routes": {
+            route: {**summarise(samples, elapsed=elapsed), "errors": errors[route]}
+            for route, samples in route_samples.items()
+        },
+        "nodes": {
+            node: summarise(samples) for node, samples in sorted(tracer.samples.items())
+        },
+        "standIns": {
+            "redisCommands": stand_ins["redis"].commands,
+            "kafkaMessages": stand_ins["kafka"].total_sent,
+            "s3Objects": len(stand_ins["s3"].objects),
+        },
+    }
+
+
+def compare_reports(
+    baseline: Dict[str, Any], current: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Relative change (current vs baseline) for throughput and percentiles."""
+
+    def delta(before: float, after: float) -> Optional[float]:
+        if not before:
+            return None
+        return (after - before) / before
+
+    keys = ("throughputRps", "p50Ms", "p95Ms", "p99Ms")
+    result: Dict[str, Any] = {
+        "baselineRevision": baseline.get("revision"),
+        "currentRevision": current.get("revision"),
+        "overall": {
+            key: delta(
+                baseline["overall"].get(key, 0.0), current["overall"].get(key, 0.0)
+            )
+            for key in keys
+        },
+        "routes": {},
+    }
+    for route, stats in current.get("routes", {}).items():
+        before = baseline.get("routes", {}).get(route)
+        if before:
+            result["routes"][route] = {
+                key: delta(before.get(key, 0.0), stats.get(key, 0.0)) for key in keys
+            }
+    return result
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except Exception:
+        return None
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--approval-ratio", type=float, default=0.5)
+    parser.add_argument("--redis-latency-ms", type=float, default=0.5)
+    parser.add_argument("--kafka-latency-ms", type=float, default=2.0)
+    parser.add_argument("--amadeus-latency-ms", type=float, default=40.0)
+    parser.add_argument("--d365-latency-ms", type=float, default=25.0)
+    parser.add_argument("--s3-latency-ms", type=float, default=10.0)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    latency = StandInLatency(
+        redis=args.redis_latency_ms / 1000,
+        kafka=args.kafka_latency_ms / 1000,
+        amadeus=args.amadeus_latency_ms / 1000,
+        doctor365=args.d365_latency_ms / 1000,
+        s3=args.s3_latency_ms / 1000,
+        jitter=args.jitter,
+        seed=args.seed,
+    )
+    report = asyncio.run(
+        run_load_test(
+            requests=args.requests,
+            concurrency=args.concurrency,
+            approval_ratio=args.approval_ratio,
+            latency=latency,
+        )
+    )
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        report["comparison"] = compare_reports(baseline, report)
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(rendered)
+    print(rendered)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Requests/sec through the tenant middleware: ``BaseHTTPMiddleware`` vs pure ASGI.
+
+Drives the ASGI callables directly (no HTTP client) so the numbers isolate
+middleware overhead. Usage::
+
+    python -m benchmarks.middleware_stack --requests 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+
+from app.middleware.tenant_context import TENANT_HEADER, TenantContextMiddleware
+
+
+class LegacyTenantContextMiddleware(BaseHTTPMiddleware):
+    """The previous ``BaseHTTPMiddleware`` implementation, kept as the baseline."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        tenant_id = request.headers.get(TENANT_HEADER) or "system"
+        request.state.tenant_id = tenant_id
+        request.scope["tenant_id"] = tenant_id
+        TenantContextMiddleware._annotate_trace(tenant_id)
+        response = await call_next(request)
+        response.headers.setdefault("X-Tenant", tenant_id)
+        return response
+
+
+def build_app(middleware: type) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/ping")
+    async def ping(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(request.state.tenant_id)
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            for index in range(8):
+                yield f"data: {index}\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
+
+
+async def call(app: Any, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"x-tenant", b"bench-tenant")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    received = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    status = 0
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app: Any, path: str, requests: int, concurrency: int) -> float:
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await call(app, path)
+
+    await call(app, path)  # build the middleware stack outside the timing
+    started = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (perf_counter() - started)
+
+
+async def run_benchmark(
+    *, requests: int = 5000, concurrency: int = 16
+) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"requests": requests, "concurrency": concurrency}
+    for label, middleware in (
+        ("baseHttp", LegacyTenantContextMiddleware),
+        ("pureAsgi", TenantContextMiddleware),
+    ):
+        app = build_app(middleware)
+        report[label] = {
+            path.strip("/"): await measure(app, path, requests, concurrency)
+            for path in ("/ping", "/stream")
+        }
+    report["speedup"] = {
+        route: report["pureAsgi"][route] / report["baseHttp"][route]
+        for route in report["pureAsgi"]
+    }
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args(argv)
+    report = asyncio.run(
+        run_benchmark(requests=args.requests, concurrency=args.concurrency)
+    )
+    print(json.dumps(report, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Time and memory per agent dispatch body: per-call ``model_dump`` vs pre-encoded fragments.
+
+Builds the ``/run`` body the way ``httpx`` would send it (the legacy ``dict``
+passed as ``json=``) and through :class:`RequestBodyEncoder`, and reports
+microseconds and bytes allocated per body. Usage::
+
+    python -m benchmarks.request_body --iterations 20000 --capabilities 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+from httpx._content import encode_json
+
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+from ai_services.interfaces.schemas.event_schema import HubEvent
+from ai_services.interfaces.schemas.tenant_schema import TenantSchema
+from app.services.request_body import RequestBodyEncoder
+from benchmarks.hub_ingest import build_events
+
+
+def build_inputs(capabilities: int) -> Dict[str, Any]:
+    agent = AgentSchema.model_validate(
+        {
+            "id": "agent-1",
+            "name": "booking",
+            "version": "1.4.0",
+            "endpoint": "http://booking-agent",
+            "capabilities": [
+                {
+                    "name": f"capability-{index}",
+                    "description": "Looks things up for travellers",
+                    "version": "1",
+                }
+                for index in range(capabilities)
+            ],
+        }
+    )
+    tenant = TenantSchema.model_validate(
+        {
+            "id": "bench-tenant-0",
+            "name": "Bench Travel",
+            "organization": "bench",
+            "environment": "production",
+            "env_vars": {f"KEY_{index}": "value" * 4 for index in range(16)},
+            "metadata": {"locale": "en-GB", "currency": "EUR", "tier": "gold"},
+            "updatedAt": "2026-01-01T00:00:00Z",
+        }
+    )
+    event = HubEvent.model_validate(build_events(1)[0])
+    return {
+        "agent": agent,
+        "tenant_id": tenant.id,
+        "tenant": tenant,
+        "event": event,
+        "payload": {"text": "Find me a hotel in Lisbon", "nights": 3},
+        "session_context": {"history": ["hi", "hello"]},
+        "channel": None,
+    }
+
+
+def legacy_body(
+    *,
+    agent: AgentSchema,
+    tenant_id: str,
+    payload: Dict[str, Any],
+    event: HubEvent,
+    tenant: Optional[TenantSchema],
+    session_context: Optional[Dict[str, Any]],
+    channel: Optional[str],
+) -> bytes:
+    """The previous ``_build_request_body`` plus httpx's ``json=`` encoding."""
+
+    body = {
+        "agent": {
+            "id": agent.id,
+            "name": agent.name,
+            "capabilities": [cap.model_dump(mode="json") for cap in agent.capabilities],
+        },
+        "tenant": (
+            tenant.model_dump(mode="json", by_alias=True)
+            if tenant is not None
+            else {"id": tenant_id}
+        ),
+        "event": event.model_dump(mode="json", by_alias=True),
+        "payload": payload,
+        "session": session_context or {},
+        "channel": channel or event.channel or "system",
+    }
+    _, stream = encode_json(body)
+    return b"".join(stream)
+
+
+def measure(
+    build: Callable[..., bytes], inputs: Dict[str, Any], iterations: int
+) -> Dict[str, float]:
+    size = len(build(**inputs))  # warm caches outside the measurement
+    started = perf_counter()
+    for _ in range(iterations):
+        build(**inputs)
+    elapsed = perf_counter() - started
+
+    sample = max(1, iterations // 10)
+    allocated = 0
+    tracemalloc.start()
+    for _ in range(sample):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        build(**inputs)
+        allocated += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return {
+        "bodyBytes": size,
+        "microsPerBody": elapsed / iterations * 1e6,
+        "peakBytesPerBody": allocated / sample,
+    }
+
+
+def run_benchmark(*, iterations: int = 10000, capabilities: int = 12) -> Dict[str, Any]:
+    inputs = build_inputs(capabilities)
+    encoder = RequestBodyEncoder()
+    legacy = measure(legacy_body, inputs, iterations)
+    fragments = measure(encoder.encode, inputs, iterations)
+    assert json.loads(legacy_body(**inputs)) == json.loads(encoder.encode(**inputs))
+    return {
+        "iterations": iterations,
+        "capabilities": capabilities,
+        "legacy": legacy,
+        "fragments": fragments,
+        "speedup": legacy["microsPerBody"] / fragments["microsPerBody"],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--capabilities", type=int, default=12)
+    args = parser.parse_args(argv)
+    report = run_benchmark(iterations=args.iterations, capabilities=args.capabilities)
+    print(json.dumps(report, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,987 @@
+"""In-process stand-ins for the orchestrator's external dependencies.
+
+The stand-ins replace the wire-level clients (Redis connection, Kafka
+producer, HTTP transports and the boto3 S3 client) rather than the
+orchestrator services themselves, so a benchmark still exercises the real
+``RedisStore``, ``ContextManager``, ``KafkaEventProducer`` and ``BaseTool``
+code paths. Each stand-in sleeps for a configurable latency per call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import json
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from redis.exceptions import ResponseError
+
+from ai_services.hub_core.context_manager import (
+    APPEND_FIELD_SCRIPT,
+    APPEND_INDEXED_EVENT_SCRIPT,
+    MIGRATE_SESSION_SCRIPT,
+)
+from app.services.rate_limiter import GCRA_SCRIPT
+
+
+@dataclass
+class StandInLatency:
+    """Injected per-call latency, in seconds, for every stand-in."""
+
+    redis: float = 0.0
+    kafka: float = 0.0
+    amadeus: float = 0.0
+    doctor365: float = 0.0
+    s3: float = 0.0
+    registry: float = 0.0
+    agent: float = 0.0
+    jitter: float = 0.0
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        self._random = random.Random(self.seed)
+
+    def sample(self, base: float) -> float:
+        if base <= 0:
+            return 0.0
+        if not self.jitter:
+            return base
+        spread = base * self.jitter
+        return max(0.0, base + self._random.uniform(-spread, spread))
+
+
+def _command(name: str):
+    """Build an async Redis command that pays one round-trip of latency."""
+
+    async def command(self: "InMemoryRedis", *args: Any, **kwargs: Any) -> Any:
+        await self._delay()
+        return getattr(self, f"_cmd_{name}")(*args, **kwargs)
+
+    command.__name__ = name
+    return command
+
+
+def _score_bound(bound: Any, *, lower: bool) -> Callable[[float], bool]:
+    """Parse a ZRANGEBYSCORE bound (``-inf``, ``+inf``, ``(1.5``, ``1.5``) into a predicate."""
+
+    text = str(bound)
+    exclusive = text.startswith("(")
+    value = float(text[1:] if exclusive else text)
+    if lower:
+        return (
+            (lambda score: score > value)
+            if exclusive
+            else (lambda score: score >= value)
+        )
+    return (
+        (lambda score: score < value) if exclusive else (lambda score: score <= value)
+    )
+
+
+class InMemoryPipeline:
+    """Buffers commands and replays them for the latency of a single round-trip."""
+
+    def __init__(self, redis: "InMemoryRedis") -> None:
+        self._redis = redis
+        self._queued: List[Tuple[str, Tuple[Any, ...], Dict[str, Any]]] = []
+
+    def __getattr__(self, name: str):
+        if not hasattr(self._redis, f"_cmd_{name}"):
+            raise AttributeError(name)
+
+        def queue(*args: Any, **kwargs: Any) -> "InMemoryPipeline":
+            self._queued.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        await self._redis._delay()
+        queued, self._queued = self._queued, []
+        return [
+            getattr(self._redis, f"_cmd_{name}")(*args, **kwargs)
+            for name, args, kwargs in queued
+        ]
+
+    async def reset(self) -> None:
+        self._queued = []
+
+    async def __aenter__(self) -> "InMemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.reset()
+
+
+class InMemoryScript:
+    """``register_script`` result that runs a Python emulation of known Lua sources."""
+
+    def __init__(self, redis: "InMemoryRedis", source: str) -> None:
+        if source not in _SCRIPT_EMULATIONS:
+            raise NotImplementedError("No in-memory emulation for this script")
+        self._redis = redis
+        self._source = source
+
+    async def __call__(
+        self,
+        keys: Sequence[str] = (),
+        args: Sequence[Any] = (),
+        client: Any = None,
+    ) -> Any:
+        if isinstance(client, InMemoryPipeline):
+            client._queued.append(
+                ("evalscript", (self._source, list(keys), list(args)), {})
+            )
+            return client
+        await self._redis._delay()
+        return self._redis._cmd_evalscript(self._source, list(keys), list(args))
+
+
+class InMemoryPubSub:
+    """Channel subscription fed synchronously by ``InMemoryRedis.publish``."""
+
+    def __init__(
+        self, redis: "InMemoryRedis", ignore_subscribe_messages: bool = False
+    ) -> None:
+        self._redis = redis
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._channels: List[str] = []
+
+    async def subscribe(self, *channels: str) -> None:
+        for channel in channels:
+            self._redis._subscribers.setdefault(channel, []).append(self._queue)
+            self._channels.append(channel)
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def aclose(self) -> None:
+        for channel in self._channels:
+            queues = self._redis._subscribers.get(channel, [])
+            if self._queue in queues:
+                queues.remove(self._queue)
+        self._channels = []
+
+
+class InMemoryRedis:
+    """Subset of the ``redis.asyncio.Redis`` API backed by dictionaries.
+
+    Values are stored as strings to mirror ``decode_responses=True``. Each
+    command is a synchronous ``_cmd_*`` method so pipelines can replay them
+    for a single round-trip of latency.
+    """
+
+    def __init__(
+        self, latency: float = 0.0, profile: Optional[StandInLatency] = None
+    ) -> None:
+        self._latency = latency
+        self._profile = profile or StandInLatency()
+        self._values: Dict[str, str] = {}
+        self._expiry: Dict[str, float] = {}
+        self._streams: Dict[str, List[Tuple[str, Dict[str, str]]]] = {}
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        self._zsets: Dict[str, Dict[str, float]] = {}
+        self._groups: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._stream_appended = asyncio.Event()
+        self._last_stream_id: Tuple[int, int] = (0, 0)
+        self._subscribers: Dict[str, List["asyncio.Queue[Dict[str, Any]]"]] = {}
+        self.commands = 0
+
+    get = _command("get")
+    mget = _command("mget")
+    set = _command("set")
+    delete = _command("delete")
+    xadd = _command("xadd")
+    xrange = _command("xrange")
+    xrevrange = _command("xrevrange")
+    publish = _command("publish")
+    getex = _command("getex")
+    incr = _command("incr")
+    expire = _command("expire")
+    pttl = _command("pttl")
+    hset = _command("hset")
+    hget = _command("hget")
+    hgetall = _command("hgetall")
+    hdel = _command("hdel")
+    hincrby = _command("hincrby")
+    hincrbyfloat = _command("hincrbyfloat")
+    zadd = _command("zadd")
+    zrem = _command("zrem")
+    zscore = _command("zscore")
+    zcount = _command("zcount")
+    zrangebyscore = _command("zrangebyscore")
+    zremrangebyscore = _command("zremrangebyscore")
+
+    xgroup_create = _command("xgroup_create")
+    xack = _command("xack")
+    xpending_range = _command("xpending_range")
+    xautoclaim = _command("xautoclaim")
+
+    async def xreadgroup(
+        self,
+        groupname: str,
+        consumername: str,
+        streams: Dict[str, str],
+        count: Optional[int] = None,
+        block: Optional[int] = None,
+        noack: bool = False,
+    ) -> List[List[Any]]:
+        await self._delay()
+        response = self._cmd_xreadgroup(groupname, consumername, streams, count)
+        if response or block is None:
+            return response
+        self._stream_appended.clear()
+        try:
+            await asyncio.wait_for(
+                self._stream_appended.wait(), timeout=block / 1000 if block else None
+            )
+        except asyncio.TimeoutError:
+            return []
+        return self._cmd_xreadgroup(groupname, consumername, streams, count)
+
+    def register_script(self, source: str) -> InMemoryScript:
+        return InMemoryScript(self, source)
+
+    def pipeline(self, transaction: bool = True) -> InMemoryPipeline:
+        return InMemoryPipeline(self)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> InMemoryPubSub:
+        return InMemoryPubSub(self, ignore_subscribe_messages)
+
+    async def close(self) -> None:
+        return None
+
+    async def _delay(self) -> None:
+        self.commands += 1
+        delay = self._profile.sample(self._latency)
+        if delay:
+            await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+
+    def _expired(self, key: str) -> bool:
+        deadline = self._expiry.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._values.pop(key, None)
+            self._hashes.pop(key, None)
+            self._zsets.pop(key, None)
+            self._expiry.pop(key, None)
+            return True
+        return False
+
+    def _exists(self, key: str) -> bool:
+        return not self._expired(key) and (
+            key in self._values
+            or key in self._hashes
+            or key in self._streams
+            or key in self._zsets
+        )
+
+    def _cmd_get(self, name: str) -> Optional[str]:
+        if self._expired(name):
+            return None
+        return self._values.get(name)
+
+    def _cmd_mget(self, keys: Any, *args: str) -> List[Optional[str]]:
+        names = [keys, *args] if isinstance(keys, str) else [*keys, *args]
+        return [self._cmd_get(name) for name in names]
+
+    def _cmd_set(
+        self,
+        name: str,
+        value: Any,
+        ex: Optional[int] = None,
+        nx: bool = False,
+        **_: Any,
+    ) -> Optional[bool]:
+        if nx and self._cmd_get(name) is not None:
+            return None
+        self._values[name] = value if isinstance(value, str) else str(value)
+        if ex:
+            self._expiry[name] = time.monotonic() + ex
+        else:
+            self._expiry.pop(name, None)
+        return True
+
+    def _cmd_delete(self, *names: str) -> int:
+        removed = 0
+        for name in names:
+            if self._values.pop(name, None) is not None:
+                removed += 1
+            if self._streams.pop(name, None) is not None:
+                removed += 1
+            if self._hashes.pop(name, None) is not None:
+                removed += 1
+            if self._zsets.pop(name, None) is not None:
+                removed += 1
+            self._expiry.pop(name, None)
+        return removed
+
+    def _cmd_getex(
+        self, name: str, ex: Optional[int] = None, **_: Any
+    ) -> Optional[str]:
+        value = self._cmd_get(name)
+        if value is not None and ex:
+            self._expiry[name] = time.monotonic() + ex
+        return value
+
+    def _cmd_incr(self, name: str, amount: int = 1) -> int:
+        value = int(self._cmd_get(name) or 0) + int(amount)
+        self._values[name] = str(value)
+        return value
+
+    def _cmd_expire(self, name: str, time_seconds: int) -> bool:
+        if not self._exists(name):
+            return False
+        self._expiry[name] = time.monotonic() + int(time_seconds)
+        return True
+
+    def _cmd_pttl(self, name: str) -> int:
+        if not self._exists(name):
+            return -2
+        deadline = self._expiry.get(name)
+        if deadline is None:
+            return -1
+        return max(0, int((deadline - time.monotonic()) * 1000))
+
+    def _hash(self, name: str, *, create: bool = False) -> Optional[Dict[str, str]]:
+        self._expired(name)
+        if create:
+            return self._hashes.setdefault(name, {})
+        return self._hashes.get(name)
+
+    def _cmd_hset(
+        self,
+        name: str,
+        key: Optional[str] = None,
+        value: Any = None,
+        mapping: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        fields = dict(mapping or {})
+        if key is not None:
+            fields[key] = value
+        target = self._hash(name, create=True)
+        added = sum(1 for field in fields if field not in target)
+        target.update({field: str(item) for field, item in fields.items()})
+        return added
+
+    def _cmd_hget(self, name: str, key: str) -> Optional[str]:
+        return (self._hash(name) or {}).get(key)
+
+    def _cmd_hgetall(self, name: str) -> Dict[str, str]:
+        return dict(self._hash(name) or {})
+
+    def _cmd_hdel(self, name: str, *keys: str) -> int:
+        target = self._hash(name)
+        if not target:
+            return 0
+        removed = sum(1 for key in keys if target.pop(key, None) is not None)
+        if not target:
+            self._hashes.pop(name, None)
+            self._expiry.pop(name, None)
+        return removed
+
+    def _cmd_hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        target = self._hash(name, create=True)
+        value = int(target.get(key, 0)) + int(amount)
+        target[key] = str(value)
+        return value
+
+    def _cmd_hincrbyfloat(self, name: str, key: str, amount: float = 1.0) -> float:
+        target = self._hash(name, create=True)
+        value = float(target.get(key, 0)) + float(amount)
+        target[key] = repr(value)
+        return value
+
+    def _zset(self, name: str) -> Dict[str, float]:
+        self._expired(name)
+        return self._zsets.get(name, {})
+
+    def _cmd_zadd(self, name: str, mapping: Dict[str, float], **_: Any) -> int:
+        self._expired(name)
+        target = self._zsets.setdefault(name, {})
+        added = sum(1 for member in mapping if member not in target)
+        target.update({member: float(score) for member, score in mapping.items()})
+        return added
+
+    def _cmd_zrem(self, name: str, *members: str) -> int:
+        target = self._zset(name)
+        removed = sum(1 for member in members if target.pop(member, None) is not None)
+        if not target:
+            self._zsets.pop(name, None)
+        return removed
+
+    def _cmd_zscore(self, name: str, member: str) -> Optional[float]:
+        return self._zset(name).get(member)
+
+    def _zrange(self, name: str, low: Any, high: Any) -> List[Tuple[str, float]]:
+        above, below = _score_bound(low, lower=True), _score_bound(high, lower=False)
+        members = [
+            (member, score)
+            for member, score in self._zset(name).items()
+            if above(score) and below(score)
+        ]
+        return sorted(members, key=lambda item: (item[1], item[0]))
+
+    def _cmd_zcount(self, name: str, min: Any, max: Any) -> int:
+        return len(self._zrange(name, min, max))
+
+    def _cmd_zrangebyscore(
+        self,
+        name: str,
+        min: Any,
+        max: Any,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+        **_: Any,
+    ) -> List[Any]:
+        members = self._zrange(name, min, max)
+        if start is not None and num is not None:
+            members = members[start:] if num < 0 else members[start : start + num]
+        return members if withscores else [member for member, _ in members]
+
+    def _cmd_zremrangebyscore(self, name: str, min: Any, max: Any) -> int:
+        target = self._zset(name)
+        stale = self._zrange(name, min, max)
+        for member, _ in stale:
+            target.pop(member, None)
+        if not target:
+            self._zsets.pop(name, None)
+        return len(stale)
+
+    def _cmd_evalscript(self, source: str, keys: List[str], args: List[Any]) -> Any:
+        return _SCRIPT_EMULATIONS[source](self, keys, args)
+
+    def _cmd_xadd(
+        self,
+        name: str,
+        fields: Dict[str, Any],
+        id: str = "*",
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+    ) -> str:
+        entry_id = self._next_stream_id()
+        stream = self._streams.setdefault(name, [])
+        stream.append((entry_id, {key: str(value) for key, value in fields.items()}))
+        if maxlen is not None and len(stream) > maxlen:
+            del stream[: len(stream) - maxlen]
+        self._stream_appended.set()
+        return entry_id
+
+    def _cmd_xgroup_create(
+        self,
+        name: str,
+        groupname: str,
+        id: str = "$",
+        mkstream: bool = False,
+        **_: Any,
+    ) -> bool:
+        if name not in self._streams:
+            if not mkstream:
+                raise ResponseError(
+                    "ERR The XGROUP subcommand requires the key to exist"
+                )
+            self._streams[name] = []
+        groups = self._groups.setdefault(name, {})
+        if groupname in groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        if id == "$":
+            id = self._streams[name][-1][0] if self._streams[name] else "0-0"
+        groups[groupname] = {"last": id, "pending": {}}
+        return True
+
+    def _group(self, name: str, groupname: str) -> Dict[str, Any]:
+        group = self._groups.get(name, {}).get(groupname)
+        if group is None or name not in self._streams:
+            raise ResponseError(
+                f"NOGROUP No such key '{name}' or consumer group '{groupname}'"
+            )
+        return group
+
+    def _cmd_xreadgroup(
+        self,
+        groupname: str,
+        consumername: str,
+        streams: Dict[str, str],
+        count: Optional[int] = None,
+    ) -> List[List[Any]]:
+        response: List[List[Any]] = []
+        for name in streams:
+            group = self._group(name, groupname)
+            last = _parse_stream_id(group["last"], upper=False)
+            entries = [
+                entry
+                for entry in self._streams[name]
+                if _parse_stream_id(entry[0], upper=False) > last
+            ][: count or None]
+            if not entries:
+                continue
+            now = time.monotonic()
+            for entry_id, _ in entries:
+                group["pending"][entry_id] = [consumername, now, 1]
+            group["last"] = entries[-1][0]
+            response.append([name, entries])
+        return response
+
+    def _cmd_xack(self, name: str, groupname: str, *ids: str) -> int:
+        pending = self._group(name, groupname)["pending"]
+        return sum(1 for entry_id in ids if pending.pop(entry_id, None) is not None)
+
+    def _cmd_xpending_range(
+        self,
+        name: str,
+        groupname: str,
+        min: str = "-",
+        max: str = "+",
+        count: int = 10,
+        consumername: Optional[str] = None,
+        idle: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        items = []
+        for entry_id, (consumer, delivered_at, deliveries) in sorted(
+            self._group(name, groupname)["pending"].items(),
+            key=lambda item: _parse_stream_id(item[0], upper=False),
+        ):
+            idle_ms = int((now - delivered_at) * 1000)
+            if idle is not None and idle_ms < idle:
+                continue
+            if consumername is not None and consumer != consumername:
+                continue
+            if not _in_range(entry_id, min, max):
+                continue
+            items.append(
+                {
+                    "message_id": entry_id,
+                    "consumer": consumer,
+                    "time_since_delivered": idle_ms,
+                    "times_delivered": deliveries,
+                }
+            )
+        return items[:count]
+
+    def _cmd_xautoclaim(
+        self,
+        name: str,
+        groupname: str,
+        consumername: str,
+        min_idle_time: int,
+        start_id: str = "0-0",
+        count: Optional[int] = None,
+        justid: bool = False,
+    ) -> List[Any]:
+        pending = self._group(name, groupname)["pending"]
+        entries = dict(self._streams.get(name, []))
+        now = time.monotonic()
+        claimed: List[Tuple[str, Optional[Dict[str, str]]]] = []
+        deleted: List[str] = []
+        for entry_id in sorted(
+            pending, key=lambda value: _parse_stream_id(value, upper=False)
+        ):
+            if not _in_range(entry_id, start_id, "+"):
+                continue
+            _, delivered_at, deliveries = pending[entry_id]
+            if (now - delivered_at) * 1000 < min_idle_time:
+                continue
+            if entry_id not in entries:
+                del pending[entry_id]
+                deleted.append(entry_id)
+                continue
+            pending[entry_id] = [consumername, now, deliveries + 1]
+            claimed.append((entry_id, entries[entry_id]))
+            if count and len(claimed) >= count:
+                break
+        return ["0-0", claimed, deleted]
+
+    def _cmd_xrange(
+        self,
+        name: str,
+        min: str = "-",
+        max: str = "+",
+        count: Optional[int] = None,
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        entries = [
+            entry
+            for entry in self._streams.get(name, [])
+            if _in_range(entry[0], min, max)
+        ]
+        return entries[:count] if count else entries
+
+    def _cmd_xrevrange(
+        self,
+        name: str,
+        max: str = "+",
+        min: str = "-",
+        count: Optional[int] = None,
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        entries = [
+            entry
+            for entry in reversed(self._streams.get(name, []))
+            if _in_range(entry[0], min, max)
+        ]
+        return entries[:count] if count else entries
+
+    def _cmd_publish(self, channel: str, message: Any) -> int:
+        queues = self._subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(queues)
+
+    def _next_stream_id(self) -> str:
+        millis = int(time.time() * 1000)
+        last_millis, last_seq = self._last_stream_id
+        if millis <= last_millis:
+            millis, seq = last_millis, last_seq + 1
+        else:
+            seq = 0
+        self._last_stream_id = (millis, seq)
+        return f"{millis}-{seq}"
+
+
+def _parse_stream_id(value: str, *, upper: bool) -> Tuple[int, int]:
+    if value in {"+", "$"}:
+        return (2**63, 2**63)
+    if value == "-":
+        return (0, 0)
+    if "-" in value:
+        millis, seq = value.split("-", 1)
+        return int(millis), int(seq)
+    return int(value), (2**63 if upper else 0)
+
+
+def _in_range(entry_id: str, lower: str, upper: str) -> bool:
+    parsed = _parse_stream_id(entry_id, upper=False)
+    try:
+        return (
+            _parse_stream_id(lower, upper=False)
+            <= parsed
+            <= _parse_stream_id(upper, upper=True)
+        )
+    except ValueError:
+        return False
+
+
+def _append_field(redis: InMemoryRedis, keys: List[str], args: List[Any]) -> int:
+    field, item, limit, ttl = args
+    raw = redis._cmd_hget(keys[0], field)
+    items = json.loads(raw) if raw else []
+    if not isinstance(items, list):
+        items = [items]
+    items.append(json.loads(item))
+    if int(limit) > 0:
+        items = items[-int(limit) :]
+    redis._cmd_hset(keys[0], field, json.dumps(items, ensure_ascii=False))
+    if int(ttl) > 0:
+        redis._cmd_expire(keys[0], ttl)
+    return len(items)
+
+
+def _append_indexed_event(
+    redis: InMemoryRedis, keys: List[str], args: List[Any]
+) -> str:
+    max_length, data, ttl = args
+    entry_id = redis._cmd_xadd(keys[0], {"data": data}, maxlen=int(max_length) or None)
+    redis._cmd_set(keys[1], f"{keys[0]} {entry_id}", ex=int(ttl), nx=True)
+    return entry_id
+
+
+def _migrate_session(redis: InMemoryRedis, keys: List[str], args: List[Any]) -> int:
+    raw = redis._cmd_get(keys[1])
+    if raw is None:
+        return 0
+    if raw != args[0]:
+        return -1
+    if not redis._exists(keys[0]) and len(args) > 1:
+        pairs = args[1:]
+        redis._cmd_hset(keys[0], mapping=dict(zip(pairs[::2], pairs[1::2])))
+        ttl = redis._cmd_pttl(keys[1])
+        if ttl > 0:
+            redis._expiry[keys[0]] = time.monotonic() + ttl / 1000
+    redis._cmd_delete(keys[1])
+    return 1
+
+
+def _gcra(redis: InMemoryRedis, keys: List[str], args: List[Any]) -> List[int]:
+    interval, tolerance, requested = (float(value) for value in args)
+    now = int(time.time() * 1000)
+    stored = redis._cmd_get(keys[0])
+    tat = max(float(stored) if stored else now, now)
+    available = math.floor((now + tolerance - tat) / interval)
+    if available < 1:
+        return [0, math.ceil(tat + interval - tolerance - now), 0]
+    granted = int(min(requested, available))
+    tat += granted * interval
+    redis._cmd_set(keys[0], repr(tat), ex=max(1, math.ceil((tat - now) / 1000)))
+    return [granted, 0, available - granted]
+
+
+_SCRIPT_EMULATIONS: Dict[str, Callable[[InMemoryRedis, List[str], List[Any]], Any]] = {
+    APPEND_FIELD_SCRIPT: _append_field,
+    APPEND_INDEXED_EVENT_SCRIPT: _append_indexed_event,
+    MIGRATE_SESSION_SCRIPT: _migrate_session,
+    GCRA_SCRIPT: _gcra,
+}
+
+
+class InMemoryKafkaProducer:
+    """Stand-in for ``AIOKafkaProducer`` that records recent sends."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        profile: Optional[StandInLatency] = None,
+        history: int = 1000,
+    ) -> None:
+        self._latency = latency
+        self._profile = profile or StandInLatency()
+        self.sent: Deque[Tuple[str, Any]] = deque(maxlen=history)
+        self.total_sent = 0
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    async def send_and_wait(self, topic: str, value: Any = None, **_: Any) -> None:
+        delay = self._profile.sample(self._latency)
+        if delay:
+            await asyncio.sleep(delay)
+        self.sent.append((topic, value))
+        self.total_sent += 1
+
+    async def send(
+        self, topic: str, value: Any = None, **_: Any
+    ) -> "asyncio.Future[None]":
+        """Enqueue like ``AIOKafkaProducer.send``; the returned future resolves on delivery."""
+
+        return asyncio.ensure_future(self.send_and_wait(topic, value))
+
+
+class InMemoryS3Client:
+    """Synchronous boto3-style client; ``S3Tool`` calls it from an executor."""
+
+    def __init__(
+        self, latency: float = 0.0, profile: Optional[StandInLatency] = None
+    ) -> None:
+        self._latency = latency
+        self._profile = profile or StandInLatency()
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+
+    def _delay(self) -> None:
+        delay = self._profile.sample(self._latency)
+        if delay:
+            time.sleep(delay)
+
+    def put_object(
+        self, *, Bucket: str, Key: str, Body: bytes, ContentType: str = ""
+    ) -> Dict[str, Any]:
+        self._delay()
+        self.objects[(Bucket, Key)] = Body
+        return {"ETag": f'"{len(Body)}"'}
+
+    def generate_presigned_url(
+        self,
+        operation: str,
+        Params: Dict[str, str],
+        ExpiresIn: int = 3600,
+    ) -> str:
+        self._delay()
+        return (
+            f"https://s3.local/{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
+        )
+
+
+def _amadeus_handler(request: httpx.Request) -> Dict[str, Any]:
+    path = request.url.path
+    if path.endswith("/flights/search"):
+        return {
+            "itineraries": [
+                {
+                    "carrier": "TK",
+                    "number": "TK1980",
+                    "origin": "LHR",
+                    "destination": "IST",
+                }
+            ]
+        }
+    if path.endswith("/hotels/search"):
+        return {"options": [{"name": "Harbiye Surgical Suites", "nights": 7}]}
+    return {"bundles": []}
+
+
+def _doctor365_handler(request: httpx.Request) -> Dict[str, Any]:
+    if request.url.path.endswith("/start-agent"):
+        return {"sessionId": "stand-in-session"}
+    return {"status": "ok"}
+
+
+def _agent_handler(request: httpx.Request) -> Dict[str, Any]:
+    body = json.loads(request.content or b"{}")
+    event = body.get("event") or {}
+    return {
+        "status": "ok",
+        "agent": request.headers.get("X-Agent-Name"),
+        "tenantId": request.headers.get("X-Tenant-ID"),
+        "eventId": event.get("id"),
+    }
+
+
+class StandInRegistry:
+    """Serves the hub registry REST API from in-memory agent/tenant documents."""
+
+    def __init__(
+        self,
+        agents: Optional[List[Dict[str, Any]]] = None,
+        tenants: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        self.agents: List[Dict[str, Any]] = list(agents or [])
+        self.tenants: List[Dict[str, Any]] = list(tenants or [])
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> Any:
+        self.requests += 1
+        parts = [part for part in request.url.path.split("/") if part]
+        if request.method == "POST" and parts in (["agents"], ["tenants"]):
+            document = json.loads(request.content)
+            collection = self.agents if parts[0] == "agents" else self.tenants
+            key = "name" if parts[0] == "agents" else "id"
+            collection[:] = [
+                item for item in collection if item.get(key) != document.get(key)
+            ]
+            collection.append(document)
+            return document
+        if parts == ["agents"]:
+            return self._conditional(request, self.agents)
+        if parts == ["tenants"]:
+            ids = request.url.params.get("ids")
+            if ids:
+                wanted = set(ids.split(","))
+                return [tenant for tenant in self.tenants if tenant.get("id") in wanted]
+            return self._conditional(request, self.tenants)
+        if len(parts) == 2 and parts[0] == "agents":
+            match = next(
+                (agent for agent in self.agents if agent.get("name") == parts[1]), None
+            )
+        elif len(parts) == 2 and parts[0] == "tenants":
+            match = next(
+                (tenant for tenant in self.tenants if tenant.get("id") == parts[1]),
+                None,
+            )
+        else:
+            match = None
+        if match is None:
+            return httpx.Response(404, json={"detail": "not found"})
+        return match
+
+    @staticmethod
+    def _conditional(
+        request: httpx.Request, documents: List[Dict[str, Any]]
+    ) -> httpx.Response:
+        body = json.dumps(documents, sort_keys=True).encode("utf-8")
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, content=body, headers={"ETag": etag})
+
+
+def latency_transport(
+    handler,
+    latency: float,
+    profile: Optional[StandInLatency] = None,
+) -> httpx.MockTransport:
+    """Wrap a handler into an ``httpx`` transport with latency.
+
+    The handler, sync or async, returns either an ``httpx.Response`` or a
+    JSON-serialisable body.
+    """
+
+    profile = profile or StandInLatency()
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        delay = profile.sample(latency)
+        if delay:
+            await asyncio.sleep(delay)
+        result = handler(request)
+        if inspect.isawaitable(result):
+            result = await result
+        if isinstance(result, httpx.Response):
+            return result
+        return httpx.Response(200, content=json.dumps(result).encode("utf-8"))
+
+    return httpx.MockTransport(respond)
+
+
+async def _swap_http_client(
+    owner: Any, attribute: str, transport: httpx.MockTransport
+) -> None:
+    current: httpx.AsyncClient = getattr(owner, attribute)
+    await current.aclose()
+    setattr(
+        owner,
+        attribute,
+        httpx.AsyncClient(
+            base_url=current.base_url,
+            headers=current.headers,
+            timeout=current.timeout,
+            transport=transport,
+        ),
+    )
+
+
+async def install_stand_ins(
+    app,
+    latency: Optional[StandInLatency] = None,
+    *,
+    registry: Optional[StandInRegistry] = None,
+) -> Dict[str, Any]:
+    """Swap the wire-level clients of an app built by ``create_app()``.
+
+    Returns the installed stand-ins keyed by dependency name so callers can
+    inspect recorded traffic.
+    """
+
+    latency = latency or StandInLatency()
+    registry = registry or StandInRegistry()
+    state = app.state
+    redis = InMemoryRedis(latency.redis, latency)
+    kafka = InMemoryKafkaProducer(latency.kafka, latency)
+    s3_client = InMemoryS3Client(latency.s3, latency)
+
+    state.redis_store._redis = redis
+    state.context_manager._redis = redis
+
+    state.kafka_producer._producer = kafka
+    state.kafka_producer._started = True
+
+    await _swap_http_client(
+        state.amadeus_tool,
+        "_client",
+        latency_transport(_amadeus_handler, latency.amadeus, latency),
+    )
+    await _swap_http_client(
+        state.d365_tool,
+        "_client",
+        latency_transport(_doctor365_handler, latency.doctor365, latency),
+    )
+    await _swap_http_client(
+        state.registry_client,
+        "_client",
+        latency_transport(registry, latency.registry, latency),
+    )
+    await state.agent_executor.pools.use_transport(
+        latency_transport(_agent_handler, latency.agent, latency)
+    )
+
+    state.s3_tool._client = s3_client
+
+    return {"redis": redis, "kafka": kafka, "s3": s3_client, "registry": registry}
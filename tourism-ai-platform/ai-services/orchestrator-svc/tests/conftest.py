@@ -0,0 +1,138 @@
+"""Shared fixtures wiring the orchestrator to the in-process stand-ins.
+
+The stand-ins live in ``benchmarks.stand_ins`` so the load-test harness can
+run without pytest; tests reach them only through the fixtures below.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from ai_services.hub_core import ContextManager, RegistryClient
+from ai_services.interfaces.schemas.event_schema import HubEvent
+from app.main import create_app
+from benchmarks.hub_ingest import build_events
+from benchmarks.stand_ins import (
+    InMemoryKafkaProducer,
+    InMemoryRedis,
+    StandInRegistry,
+    install_stand_ins,
+    latency_transport,
+)
+
+Handler = Callable[[httpx.Request], Any]
+
+
+@dataclass
+class StandInApp:
+    """An app built by ``create_app()`` whose Redis, Kafka and peers are stand-ins."""
+
+    app: FastAPI
+    redis: InMemoryRedis
+    kafka: InMemoryKafkaProducer
+    registry: StandInRegistry
+
+    @property
+    def state(self) -> Any:
+        return self.app.state
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.app), base_url="http://test"
+        )
+
+    async def use_agents(self, handler: Handler) -> None:
+        """Answer agent calls with ``handler`` instead of the stand-in agent."""
+
+        await self.state.agent_executor.pools.use_transport(
+            httpx.MockTransport(handler)
+        )
+
+
+@pytest.fixture
+def redis() -> InMemoryRedis:
+    return InMemoryRedis()
+
+
+@pytest.fixture
+def make_app() -> Callable[..., Awaitable[StandInApp]]:
+    async def build(
+        *,
+        agents: Optional[List[Dict[str, Any]]] = None,
+        tenants: Optional[List[Dict[str, Any]]] = None,
+    ) -> StandInApp:
+        app = create_app()
+        stand_ins = await install_stand_ins(
+            app, registry=StandInRegistry(agents=agents, tenants=tenants)
+        )
+        return StandInApp(
+            app=app,
+            redis=stand_ins["redis"],
+            kafka=stand_ins["kafka"],
+            registry=stand_ins["registry"],
+        )
+
+    return build
+
+
+@pytest.fixture
+def make_stand_in_registry() -> Callable[..., StandInRegistry]:
+    return StandInRegistry
+
+
+@pytest.fixture
+def make_context_manager(redis: InMemoryRedis) -> Callable[..., ContextManager]:
+    """Context managers backed by the test's ``redis`` unless given another."""
+
+    def build(
+        redis_stand_in: Optional[InMemoryRedis] = None, **kwargs: Any
+    ) -> ContextManager:
+        manager = ContextManager("redis://stand-in", **kwargs)
+        manager._redis = redis_stand_in or redis
+        return manager
+
+    return build
+
+
+@pytest.fixture
+def make_registry_client(
+    make_context_manager: Callable[..., ContextManager],
+) -> Callable[..., RegistryClient]:
+    """Registry clients served by ``handler``; ``redis`` enables the tenant cache."""
+
+    def build(
+        handler: Handler,
+        *,
+        redis: Optional[InMemoryRedis] = None,
+        latency: float = 0.0,
+    ) -> RegistryClient:
+        context_manager = make_context_manager(redis) if redis is not None else None
+        client = RegistryClient("http://registry", context_manager=context_manager)
+        client._client = httpx.AsyncClient(
+            base_url="http://registry", transport=latency_transport(handler, latency)
+        )
+        return client
+
+    return build
+
+
+@pytest.fixture
+def make_events() -> Callable[..., List[Dict[str, Any]]]:
+    """Raw event documents, ``make_events(count, tenants=4)``."""
+
+    return build_events
+
+
+@pytest.fixture
+def make_event() -> Callable[..., HubEvent]:
+    """One validated event; keyword arguments override its fields."""
+
+    def build(**fields: Any) -> HubEvent:
+        return HubEvent.model_validate({**build_events(1)[0], **fields})
+
+    return build
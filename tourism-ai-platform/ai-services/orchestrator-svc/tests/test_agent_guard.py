@@ -0,0 +1,117 @@
+import httpx
+import pytest
+
+from ai_services.hub_core import AgentUnavailableError, ContextManager
+from ai_services.interfaces.schemas.event_schema import HubEvent
+from app.services import AdaptiveConcurrencyLimit, AgentGuard, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_on_failure_ratio_and_closes_after_half_open_probes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        min_calls=4, failure_ratio=0.5, open_for=10, half_open_calls=2, clock=clock
+    )
+    for success in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(success)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now += 10
+    assert breaker.allow() and breaker.allow()
+    assert not breaker.allow()  # only two probes while half-open
+    breaker.record(True)
+    breaker.record(True)
+    assert breaker.state == "closed"
+
+    # Failures older than the rolling window are forgotten.
+    breaker.record(False)
+    clock.now += 60
+    for _ in range(3):
+        breaker.record(True)
+    breaker.record(False)
+    assert breaker.state == "closed"
+
+
+def test_calls_admitted_before_opening_do_not_count_as_probes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        min_calls=2, failure_ratio=0.5, open_for=10, half_open_calls=1, clock=clock
+    )
+    assert breaker.allow()
+    straggler = breaker.generation
+    for _ in range(2):
+        breaker.record(False, breaker.generation)
+    assert breaker.state == "open"
+
+    clock.now += 10
+    assert breaker.state == "half_open"
+    breaker.record(True, straggler)  # admitted while closed, finishes half-open
+    assert breaker.state == "half_open"
+
+    assert breaker.allow()
+    probe = breaker.generation
+    assert not breaker.allow()
+    breaker.release_probe(straggler)
+    assert not breaker.allow()  # a stale release does not free the probe slot
+    breaker.record(True, probe)
+    assert breaker.state == "closed"
+
+
+def test_adaptive_limit_backs_off_on_latency_and_grows_under_load():
+    limit = AdaptiveConcurrencyLimit(initial=10, backoff=0.5)
+    assert limit.try_acquire()
+    limit.release(0.01, dropped=False)
+    assert limit.try_acquire()
+    limit.release(0.1, dropped=False)  # 10x the baseline
+    assert limit.limit == 5
+
+    for _ in range(40):
+        for _ in range(limit.limit):
+            limit.try_acquire()
+        assert not limit.try_acquire()
+        for _ in range(limit.limit):
+            limit.release(0.01, dropped=False)
+    assert limit.limit > 5
+    assert limit.inflight == 0
+
+
+async def test_router_queues_events_while_agent_breaker_is_open(make_app, make_events):
+    hub = await make_app(
+        agents=[
+            {"id": "agent-1", "name": "booking", "endpoint": "http://booking-agent"}
+        ],
+    )
+    app = hub.app
+    app.state.agent_executor._guard = AgentGuard(
+        breaker_factory=lambda: CircuitBreaker(min_calls=2, failure_ratio=0.5)
+    )
+    await hub.use_agents(lambda request: httpx.Response(503))
+
+    events = [
+        HubEvent.model_validate({**event, "agentName": "booking"})
+        for event in make_events(3)
+    ]
+    for event in events[:2]:
+        with pytest.raises(httpx.HTTPStatusError):
+            await app.state.hub_router.route_event(event)
+
+    result = await app.state.hub_router.route_event(events[2])
+    assert result == {
+        "status": "queued",
+        "eventId": events[2].id,
+        "reason": "circuit_open",
+    }
+    stream = await hub.redis.xrange(f"{events[2].tenant_id}:hub:events")
+    assert ContextManager.decode_stream_entry(stream[-1][1])["id"] == events[2].id
+
+    with pytest.raises(AgentUnavailableError):
+        await app.state.hub_router.dispatch_event(events[2])
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+
+import httpx
+
+from ai_services.hub_core import MetricsCollector
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+from app.services import AgentConnectionPools, HubRegistry
+from app.services import agent_pools
+
+
+def agent(name: str, endpoint: str, **metadata) -> AgentSchema:
+    return AgentSchema(id=name, name=name, endpoint=endpoint, metadata=metadata)
+
+
+class FakeRegistryClient:
+    def __init__(self, agents):
+        self.agents = agents
+
+    async def list_agents(self, tenant_id=None):
+        return list(self.agents)
+
+    async def list_agents_if_modified(self, tenant_id=None):
+        return list(self.agents)
+
+    async def list_tenants(self):
+        return []
+
+    async def list_tenants_if_modified(self):
+        return []
+
+
+async def test_pools_are_isolated_per_origin_and_honour_agent_metadata():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.host, request.extensions["timeout"]))
+        return httpx.Response(200, json={"ok": True})
+
+    metrics = MetricsCollector(registry=None)
+    pools = AgentConnectionPools(
+        metrics=metrics, transport=httpx.MockTransport(handler)
+    )
+    booking = agent(
+        "booking", "http://booking:8080", http={"timeout": 5, "maxConnections": 4}
+    )
+    search = agent("search", "http://search:8080")
+
+    await pools.post(booking, "http://booking:8080/run", json={})
+    await pools.post(booking, "http://booking:8080/run", json={})
+    await pools.post(search, "http://search:8080/run", json={})
+
+    assert pools.client_for(booking) is not pools.client_for(search)
+    assert pools.stats() == {
+        "http://booking:8080": {"inUse": 0, "maxConnections": 4},
+        "http://search:8080": {"inUse": 0, "maxConnections": 100},
+    }
+    assert seen[0] == (
+        "booking",
+        {"connect": 5.0, "read": 5.0, "write": 5.0, "pool": 5.0},
+    )
+    assert seen[2][1]["read"] == 60.0
+    saturation = metrics.agent_pool_saturation.labels(pool="http://booking:8080")
+    assert saturation._value.get() == 0.0
+    await pools.close()
+
+
+async def test_registry_refresh_prewarms_new_agent_hosts():
+    warmed = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        warmed.append(str(request.url))
+        return httpx.Response(200)
+
+    pools = AgentConnectionPools(transport=httpx.MockTransport(handler))
+    registry = HubRegistry(
+        client=FakeRegistryClient([agent("booking", "http://booking:8080")])
+    )
+    registry.add_agents_listener(pools.warm)
+
+    await registry.refresh(force=True)
+    await asyncio.sleep(0.01)
+    await registry.refresh(force=True)
+    await asyncio.sleep(0.01)
+
+    assert warmed == ["http://booking:8080/health"]
+    await pools.close()
+
+
+async def test_http2_without_h2_falls_back_with_a_warning(monkeypatch, caplog):
+    monkeypatch.setattr(agent_pools, "HTTP2_AVAILABLE", False)
+    pools = AgentConnectionPools(transport=httpx.MockTransport(lambda r: None))
+
+    with caplog.at_level(logging.WARNING, logger=agent_pools.__name__):
+        pools.client_for(agent("booking", "http://booking:8080", http={"http2": True}))
+        pools.client_for(agent("search", "http://search:8080"))
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "Agent booking requests HTTP/2 but 'h2' is not installed "
+        "(install httpx[http2]); using HTTP/1.1 for http://booking:8080"
+    ]
+    await pools.close()
@@ -0,0 +1,100 @@
+import httpx
+import pytest
+
+from ai_services.hub_core import AgentIndex
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+from app.config import get_settings
+
+AGENTS = [
+    {
+        "id": "agent-1",
+        "name": "booking",
+        "endpoint": "http://booking-agent",
+        "supported_channels": ["web"],
+    },
+    {
+        "id": "agent-2",
+        "name": "flights",
+        "endpoint": "http://flights-agent",
+        "capabilities": [{"name": "travel"}],
+        "supported_channels": ["web"],
+    },
+    {
+        "id": "agent-3",
+        "name": "hotels",
+        "endpoint": "http://hotels-agent",
+        "capabilities": [{"name": "travel"}, {"name": "lodging"}],
+        "supported_channels": ["whatsapp"],
+        "tenants": ["bench-tenant-0"],
+    },
+]
+
+
+@pytest.fixture
+def routing_env(monkeypatch):
+    def configure(**env: str) -> None:
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        get_settings.cache_clear()
+
+    yield configure
+    get_settings.cache_clear()
+
+
+def test_index_intersects_capability_channel_and_tenant():
+    index = AgentIndex(AgentSchema.model_validate(agent) for agent in AGENTS)
+
+    assert [agent.name for agent in index.by_capability("travel")] == [
+        "flights",
+        "hotels",
+    ]
+    assert [agent.name for agent in index.by_channel("web")] == ["booking", "flights"]
+    assert [
+        agent.name for agent in index.find(capability="travel", channel="whatsapp")
+    ] == ["hotels"]
+    assert [
+        agent.name
+        for agent in index.find(capability="travel", tenant_id="bench-tenant-1")
+    ] == ["flights"]
+    assert [agent.name for agent in index.find(tenant_id="bench-tenant-0")] == [
+        "booking",
+        "flights",
+        "hotels",
+    ]
+    assert index.find(capability="unknown") == []
+
+
+async def test_events_without_agent_name_route_by_intent_and_channel(
+    make_app, make_event, routing_env
+):
+    async def build_router():
+        hub = await make_app(agents=AGENTS)
+        await hub.use_agents(
+            lambda request: httpx.Response(
+                200, json={"answeredBy": request.headers["X-Agent-Name"]}
+            )
+        )
+        return hub.state.hub_router
+
+    event = make_event
+    router = await build_router()
+    by_intent_disabled = await router.route_event(event(payload={"intent": "travel"}))
+
+    routing_env(HUB_ROUTE_BY_INTENT="true")
+    router = await build_router()
+    by_intent = await router.route_event(event(payload={"intent": "travel"}))
+    by_intent_on_web = await router.route_event(
+        event(payload={"intent": "travel"}, channel="web")
+    )
+    unmatched = await router.route_event(event(payload={"intent": "weather"}))
+    by_channel_disabled = await router.route_event(event(channel="web"))
+
+    routing_env(HUB_ROUTE_BY_CHANNEL="true")
+    router = await build_router()
+    by_channel = await router.route_event(event(channel="web"))
+
+    assert by_intent_disabled["status"] == "queued"
+    assert by_intent["result"]["answeredBy"] == "hotels"
+    assert by_intent_on_web["result"]["answeredBy"] == "flights"
+    assert unmatched["status"] == by_channel_disabled["status"] == "queued"
+    assert by_channel["result"]["answeredBy"] == "booking"
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.services import ClientPresence
+
+
+@pytest.fixture
+def presence(make_context_manager):
+    def build(**kwargs) -> ClientPresence:
+        return ClientPresence(context_manager=make_context_manager(), **kwargs)
+
+    return build
+
+
+async def test_clients_are_listed_consistently_across_replicas(make_app):
+    origin, peer = await make_app(), await make_app()
+    peer.state.context_manager._redis = origin.redis
+
+    async with origin.client() as client:
+        for client_id in ("web-1", "web-2"):
+            response = await client.post(
+                f"/hub/clients/bench-tenant-0/{client_id}/heartbeat"
+            )
+            assert response.status_code == 200
+        await client.post("/hub/clients/bench-tenant-1/mobile-1/heartbeat")
+        await client.delete("/hub/clients/bench-tenant-0/web-2")
+
+    async with peer.client() as client:
+        listing = (await client.get("/hub/clients")).json()
+        invalid = await client.get(
+            "/hub/clients/bench-tenant-0", params={"cursor": "oops"}
+        )
+
+    assert {tenant: sorted(clients) for tenant, clients in listing.items()} == {
+        "bench-tenant-0": ["web-1"],
+        "bench-tenant-1": ["mobile-1"],
+    }
+    assert invalid.status_code == 400
+
+
+async def test_heartbeats_are_batched_and_pages_cover_every_client(redis, presence):
+    tracker = presence(flush_interval=60)
+    await tracker.start()
+    for index in range(25):
+        await tracker.heartbeat("tenant-1", f"client-{index:02d}")
+    assert redis.commands == 0
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = await tracker.page_clients("tenant-1", cursor=cursor, limit=10)
+        seen.extend(client["clientId"] for client in page["clients"])
+        pages += 1
+        # A heartbeat mid-listing moves the client to a later page without hiding others.
+        await tracker.heartbeat("tenant-1", "client-00")
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+    await tracker.stop()
+
+    assert set(seen) == {f"client-{index:02d}" for index in range(25)}
+    assert pages >= 3
+    assert await tracker.count_clients("tenant-1") == 25
+
+
+async def test_sweep_removes_expired_clients_once_per_interval(redis, presence):
+    tracker, other = presence(client_ttl=0.05), presence(client_ttl=0.05)
+    await tracker.heartbeat("tenant-1", "stale")
+    await asyncio.sleep(0.06)
+    await tracker.heartbeat("tenant-1", "fresh")
+
+    assert not await tracker.is_alive("tenant-1", "stale")
+    assert list((await other.list_clients("tenant-1"))["tenant-1"]) == ["fresh"]
+    assert await tracker.sweep() == 1
+    assert await other.sweep() == 0  # another replica swept this interval
+    assert await redis.zscore("hub:clients:tenant-1", "stale") is None
@@ -0,0 +1,51 @@
+import asyncio
+
+from ai_services.hub_core import MetricsCollector
+
+
+async def test_local_cache_serves_repeat_reads_and_invalidates_across_replicas(
+    redis, make_context_manager
+):
+    metrics = MetricsCollector()
+    replica_a = make_context_manager(
+        local_cache_size=16, local_cache_ttl=60, metrics=metrics
+    )
+    replica_b = make_context_manager(local_cache_size=16, local_cache_ttl=60)
+    await asyncio.gather(replica_a.connect(), replica_b.connect())
+    await asyncio.sleep(0.01)  # let both invalidation listeners subscribe
+
+    await replica_b.set_tenant_context(
+        "tenant-1", {"tenant": {"id": "tenant-1", "name": "v1"}}
+    )
+    await asyncio.sleep(0.01)
+    assert (await replica_a.get_tenant_context("tenant-1"))["tenant"]["name"] == "v1"
+    commands = redis.commands
+    assert (await replica_a.get_tenant_context("tenant-1"))["tenant"]["name"] == "v1"
+    assert redis.commands == commands, "second read should be served from L1"
+
+    await replica_b.set_tenant_context(
+        "tenant-1", {"tenant": {"id": "tenant-1", "name": "v2"}}
+    )
+    await asyncio.sleep(0.01)
+    assert (await replica_a.get_tenant_context("tenant-1"))["tenant"]["name"] == "v2"
+
+    await replica_b.delete_tenant_context("tenant-1")
+    await asyncio.sleep(0.01)
+    assert await replica_a.get_tenant_context("tenant-1") is None
+
+    stats = replica_a.cache_stats()
+    assert stats["hits"] == 1
+    assert 0 < stats["hitRatio"] < 1
+    hits = metrics.context_cache_requests_total.labels(
+        scope="tenant", result="hit"
+    )._value.get()
+    assert hits == 1
+
+    await asyncio.gather(replica_a.close(), replica_b.close())
+
+
+async def test_local_cache_disabled_by_default(make_context_manager):
+    manager = make_context_manager()
+    await manager.set_session_context("tenant-1", "session-1", {"step": 1})
+    assert await manager.get_session_context("tenant-1", "session-1") == {"step": 1}
+    assert manager.cache_stats() == {}
@@ -0,0 +1,93 @@
+import asyncio
+from time import perf_counter
+
+import httpx
+import pytest
+
+from ai_services.hub_core import AgentUnavailableError
+from ai_services.hub_core.deadline import Deadline, DeadlineExceeded, deadline_scope
+from app.tools.amadeus import AmadeusTool
+
+AGENTS = [{"id": "agent-1", "name": "booking", "endpoint": "http://booking-agent"}]
+
+
+@pytest.fixture
+def build_app(make_app):
+    async def build(agent_delay: float, seen_headers: list):
+        hub = await make_app(agents=AGENTS)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/run":
+                seen_headers.append(request.headers.get("X-Request-Timeout"))
+            await asyncio.sleep(agent_delay)
+            return httpx.Response(200, json={"status": "ok"})
+
+        await hub.use_agents(handler)
+        return hub
+
+    return build
+
+
+async def test_request_timeout_header_reaches_agents_and_cancels_slow_runs(build_app):
+    seen = []
+    hub = await build_app(agent_delay=5, seen_headers=seen)
+    async with hub.client() as client:
+        started = perf_counter()
+        response = await client.post(
+            "/agents/booking/run",
+            json={"tenantId": "bench-tenant-0"},
+            headers={"X-Request-Timeout": "0.2"},
+        )
+
+    assert response.status_code == 504
+    assert perf_counter() - started < 1
+    assert 0 < float(seen[0]) <= 0.2
+
+
+async def test_tool_retries_stop_at_the_deadline():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        return httpx.Response(503)
+
+    tool = AmadeusTool("http://amadeus")
+    tool._client = httpx.AsyncClient(
+        base_url="http://amadeus", transport=httpx.MockTransport(handler)
+    )
+
+    with deadline_scope(Deadline.after(0.1)):
+        with pytest.raises(DeadlineExceeded):
+            await tool.search_flights({})
+
+    assert len(attempts) == 1  # the 0.3s backoff does not fit in the budget
+    assert tool._failure_count == 1
+    await tool.close()
+
+
+async def test_only_inline_dispatches_carry_the_request_deadline(
+    monkeypatch, build_app, make_event
+):
+    app = (await build_app(agent_delay=0, seen_headers=[])).app
+    router = app.state.hub_router
+    inline, deferred, queued = (make_event(agentName="booking") for _ in range(3))
+
+    async def unavailable(agent, event):
+        raise AgentUnavailableError(agent.name, "circuit open")
+
+    with deadline_scope(Deadline.after(30)):
+        assert (await router.route_event(inline))["status"] == "completed"
+        with monkeypatch.context() as patch:
+            patch.setattr(router, "_dispatch_agent", unavailable)
+            assert (await router.route_event(deferred))["status"] == "queued"
+        router._dispatch_mode = "queue"
+        assert (await router.route_event(queued))["status"] == "queued"
+
+    assert inline.metadata["deadline"] > 0
+    assert "deadline" not in deferred.metadata
+    assert "deadline" not in queued.metadata
+
+    # A deadline the client set explicitly still expires queued work.
+    queued.metadata["deadline"] = 1.0
+    with pytest.raises(DeadlineExceeded):
+        await router.dispatch_event(queued)
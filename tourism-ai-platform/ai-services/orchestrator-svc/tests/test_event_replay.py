@@ -0,0 +1,105 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from ai_services.hub_core import HubWorker
+
+
+async def test_replay_by_event_id_uses_index(make_app, make_events):
+    hub = await make_app()
+    redis = hub.redis
+    event = make_events(1)[0]
+    headers = {"X-Tenant": event["tenantId"]}
+
+    async with hub.client() as client:
+        await client.post("/hub/events/publish", json=event)
+        assert len(await redis.xrange("bench-tenant-0:hub:events")) == 1
+
+        response = await client.post(
+            f"/hub/events/{event['id']}/replay", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json() == {"status": "queued", "eventId": event["id"]}
+
+        other_tenant = await client.post(
+            f"/hub/events/{event['id']}/replay", headers={"X-Tenant": "someone-else"}
+        )
+        assert other_tenant.status_code == 404
+
+        # Trimmed entries leave a dangling index that replay cleans up.
+        await redis.delete("bench-tenant-0:hub:events")
+        missing = await client.post(
+            f"/hub/events/{event['id']}/replay", headers=headers
+        )
+        assert missing.status_code == 404
+        assert await redis.get(f"bench-tenant-0:hub:event-index:{event['id']}") is None
+
+
+async def test_replay_time_range_is_throttled_and_skips_responses(
+    make_app, make_events
+):
+    hub = await make_app()
+    events = make_events(6, tenants=1)
+    events.append({**make_events(1)[0], "id": "evt-response", "type": "agent.response"})
+    start = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+    async with hub.client() as client:
+        await client.post("/hub/events/publish:batch", json=events)
+        response = await client.post(
+            "/hub/events/replay",
+            json={"start": start.isoformat(), "limit": 4, "rate": 200},
+            headers={"X-Tenant": "bench-tenant-0"},
+        )
+        assert response.json()["replayed"] == 4
+
+        response = await client.post(
+            "/hub/events/replay",
+            json={"start": start.isoformat(), "rate": 200},
+            headers={"X-Tenant": "bench-tenant-0"},
+        )
+
+    body = response.json()
+    assert response.status_code == 200
+    # 7 originals plus the 4 re-published above; the response is skipped.
+    assert (body["replayed"], body["skipped"], body["failed"]) == (10, 1, 0)
+
+
+async def test_replaying_an_inline_event_redispatches_the_event_not_its_response(
+    make_app, make_events
+):
+    agent = {"id": "agent-1", "name": "booking", "endpoint": "http://booking-agent"}
+    hub = await make_app(agents=[agent])
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(json.loads(request.content)["event"]["type"])
+        return httpx.Response(200, json={"ok": True})
+
+    await hub.use_agents(handler)
+    event = {**make_events(1)[0], "agentName": "booking"}
+    headers = {"X-Tenant": event["tenantId"]}
+
+    async with hub.client() as client:
+        first = await client.post("/hub/events/publish", json=event)
+        await hub.state.agent_executor.post_dispatch.drain()
+        replayed = await client.post(
+            f"/hub/events/{event['id']}/replay", headers=headers
+        )
+
+    assert first.json()["status"] == replayed.json()["status"] == "completed"
+    assert received == [event["type"], event["type"]]
+
+    async def tenants():
+        return [event["tenantId"]]
+
+    worker = HubWorker(
+        context_manager=hub.state.context_manager,
+        hub_router=hub.state.hub_router,
+        tenant_source=tenants,
+        start_id="0-0",
+    )
+    # The recorded event and both agent responses are skipped, not dispatched.
+    assert await worker.run_once() == 3
+    assert received == [event["type"], event["type"]]
+    await hub.state.agent_executor.close()
@@ -0,0 +1,41 @@
+async def test_batch_publish_returns_per_event_statuses(make_app, make_events):
+    hub = await make_app(
+        agents=[
+            {"id": "agent-1", "name": "booking", "endpoint": "http://booking-agent"}
+        ],
+    )
+    events = make_events(3, tenants=2)
+    events.append({"id": "evt-invalid", "tenantId": "bench-tenant-0"})
+    events.append({**make_events(1)[0], "id": "evt-agent", "agentName": "booking"})
+    events.append({**make_events(1)[0], "id": "evt-unknown", "agentName": "missing"})
+
+    async with hub.client() as client:
+        response = await client.post("/hub/events/publish:batch", json=events)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["accepted"] == 5
+    assert body["rejected"] == 1
+    statuses = {result["index"]: result["status"] for result in body["results"]}
+    assert statuses == {
+        0: "queued",
+        1: "queued",
+        2: "queued",
+        3: "rejected",
+        4: "completed",
+        5: "queued",
+    }
+    assert body["results"][4]["result"]["eventId"] == "evt-agent"
+
+    stream = await hub.redis.xrange("bench-tenant-0:hub:events")
+    # evt-0, evt-2, evt-unknown, the recorded evt-agent and its response, once each
+    assert len(stream) == 5
+    topics = [topic for topic, _ in hub.kafka.sent]
+    assert topics.count("tenant.bench-tenant-1.hub.events") == 1
+
+
+async def test_batch_publish_rejects_oversized_batches(make_app, make_events):
+    hub = await make_app()
+    async with hub.client() as client:
+        response = await client.post("/hub/events/publish:batch", json=make_events(501))
+    assert response.status_code == 413
@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+from ai_services.hub_core import HubWorker
+
+STREAM = "bench-tenant-0:hub:events"
+
+
+async def tenants():
+    return ["bench-tenant-0"]
+
+
+def build_worker(context_manager, hub_router, **kwargs) -> HubWorker:
+    return HubWorker(
+        context_manager=context_manager,
+        hub_router=hub_router,
+        tenant_source=tenants,
+        consumer="worker-1",
+        claim_idle=0,
+        start_id="0-0",
+        **kwargs,
+    )
+
+
+async def test_worker_dispatches_queued_agent_events_and_dead_letters_poison(
+    make_app, make_event
+):
+    hub = await make_app(
+        agents=[
+            {"id": "agent-1", "name": "booking", "endpoint": "http://booking-agent"}
+        ],
+    )
+    app, redis = hub.app, hub.redis
+    worker = build_worker(app.state.context_manager, app.state.hub_router)
+
+    event = make_event(agentName="booking")
+    await app.state.event_bus.publish(event)
+    await redis.xadd(STREAM, {"data": "not json"})
+
+    assert await worker.run_once() == 2
+    dead = await redis.xrange(f"{STREAM}:dead-letter")
+    assert len(dead) == 1 and dead[0][1]["reason"].startswith("invalid event")
+    assert await redis.xpending_range(STREAM, "hub-workers", "-", "+", 10) == []
+
+    # The agent response emitted by the dispatch is acknowledged without dispatching again.
+    entries = await redis.xrange(STREAM)
+    assert json.loads(entries[-1][1]["data"])["type"] == "agent.response"
+    assert await worker.run_once() == 1
+    assert await redis.xpending_range(STREAM, "hub-workers", "-", "+", 10) == []
+
+
+class FailingRouter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def dispatch_event(self, event):
+        self.calls += 1
+        raise RuntimeError("agent unavailable")
+
+
+async def test_failed_entries_are_reclaimed_then_dead_lettered(make_app, make_event):
+    hub = await make_app()
+    app, redis = hub.app, hub.redis
+    router = FailingRouter()
+    worker = build_worker(app.state.context_manager, router, max_deliveries=2)
+
+    event = make_event(agentName="booking")
+    await app.state.event_bus.publish(event)
+
+    await worker.run_once()  # first delivery fails and stays pending
+    await worker.run_once()  # reclaimed via XAUTOCLAIM, fails again
+    assert router.calls == 2
+    await worker.run_once()  # delivered twice: dead-lettered instead of retried
+    assert router.calls == 2
+
+    dead = await redis.xrange(f"{STREAM}:dead-letter")
+    assert [fields["deliveries"] for _, fields in dead] == ["2"]
+    assert await redis.xpending_range(STREAM, "hub-workers", "-", "+", 10) == []
+
+
+class SlowRouter:
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+        self.finished = []
+
+    async def dispatch_event(self, event):
+        self.started.set()
+        await asyncio.sleep(0.05)
+        self.finished.append(event.id)
+        return {"status": "completed"}
+
+
+async def test_new_tenant_streams_deliver_earlier_events_and_stop_drains(
+    make_app, make_event
+):
+    hub = await make_app()
+    app, redis = hub.app, hub.redis
+    event = make_event(agentName="booking")
+    await app.state.event_bus.publish(event)  # before any worker knows the tenant
+
+    router = SlowRouter()
+    worker = HubWorker(
+        context_manager=app.state.context_manager,
+        hub_router=router,
+        tenant_source=tenants,
+        block_ms=10,
+    )
+    await worker.start()
+    await asyncio.wait_for(router.started.wait(), timeout=1)
+    await worker.stop()
+
+    assert router.finished == [event.id]
+    assert await redis.xpending_range(STREAM, "hub-workers", "-", "+", 10) == []
+    assert not worker.running
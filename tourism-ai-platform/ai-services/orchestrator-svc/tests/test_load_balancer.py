@@ -0,0 +1,118 @@
+import asyncio
+import random
+from collections import Counter
+
+import httpx
+
+from ai_services.hub_core import MetricsCollector
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+from app.services import AgentConnectionPools, AgentLoadBalancer
+
+AGENT = AgentSchema(
+    id="agent-1",
+    name="booking",
+    endpoint="http://booking-a:8080",
+    endpoints=["http://booking-b:8080", "http://booking-c:8080"],
+)
+
+
+def balancer_for(handler, **kwargs) -> AgentLoadBalancer:
+    pools = AgentConnectionPools(transport=httpx.MockTransport(handler))
+    return AgentLoadBalancer(pools=pools, rng=random.Random(7), **kwargs)
+
+
+async def test_power_of_two_choices_avoids_the_slow_replica():
+    delays = {"booking-a": 0.05, "booking-b": 0.001, "booking-c": 0.001}
+    hits = Counter()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        hits[request.url.host] += 1
+        await asyncio.sleep(delays[request.url.host])
+        return httpx.Response(200, json={})
+
+    balancer = balancer_for(handler)
+    for _ in range(60):
+        await balancer.send(AGENT, "/run", json={})
+
+    assert AGENT.endpoint_urls() == [
+        "http://booking-a:8080",
+        "http://booking-b:8080",
+        "http://booking-c:8080",
+    ]
+    assert hits["booking-a"] < 10
+    assert hits["booking-b"] + hits["booking-c"] > 50
+
+
+async def test_failing_replica_leaves_rotation_until_probe_succeeds():
+    down = {"booking-a"}
+    hits = Counter()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/run":
+            hits[request.url.host] += 1
+        return httpx.Response(503 if request.url.host in down else 200, json={})
+
+    metrics = MetricsCollector(registry=None)
+    balancer = balancer_for(handler, failure_threshold=1, metrics=metrics)
+    for _ in range(40):
+        await balancer.send(AGENT, "/run", json={})
+
+    assert hits["booking-a"] == 1
+    assert (
+        metrics.agent_endpoint_healthy.labels(
+            agent_name="booking", endpoint="http://booking-a:8080"
+        )._value.get()
+        == 0
+    )
+
+    down.clear()
+    await balancer.probe_once()
+    assert all(endpoint["healthy"] for endpoint in balancer.snapshot())
+
+
+async def test_hedged_request_answers_from_the_fast_replica():
+    slow = set()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.5 if request.url.host in slow else 0.002)
+        return httpx.Response(200, json={"host": request.url.host})
+
+    metrics = MetricsCollector(registry=None)
+    balancer = balancer_for(handler, hedge=True, hedge_min_samples=5, metrics=metrics)
+    for _ in range(10):
+        await balancer.send(AGENT, "/run", json={})
+    assert balancer.hedge_delay(AGENT) < 0.1
+
+    slow.add("booking-a")
+    balancer.choose = lambda agent, exclude=(): (
+        "http://booking-b:8080" if exclude else "http://booking-a:8080"
+    )
+    response = await asyncio.wait_for(
+        balancer.send(AGENT, "/run", json={}), timeout=0.3
+    )
+
+    assert response.json() == {"host": "booking-b"}
+    assert (
+        metrics.agent_hedged_requests_total.labels(
+            agent_name="booking", winner="hedge"
+        )._value.get()
+        == 1
+    )
+
+
+async def test_always_failing_replica_loses_every_choice():
+    hits = Counter()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hits[request.url.host] += 1
+        return httpx.Response(503 if request.url.host == "booking-a" else 200, json={})
+
+    # A high threshold keeps the failing replica in rotation, so only cost steers.
+    balancer = balancer_for(handler, failure_threshold=1000)
+    for _ in range(60):
+        await balancer.send(AGENT, "/run", json={})
+
+    assert hits["booking-a"] <= 2
+    failing, *working = balancer.snapshot()
+    assert failing["ewmaSeconds"] >= 5.0
+    assert all(endpoint["healthy"] for endpoint in working)
@@ -0,0 +1,19 @@
+from benchmarks.load_test import (
+    APPROVAL_ROUTE,
+    START_ROUTE,
+    compare_reports,
+    run_load_test,
+)
+
+
+async def test_load_harness_reports_routes_and_nodes():
+    report = await run_load_test(requests=4, concurrency=2, approval_ratio=0.5)
+
+    assert report["overall"]["errors"] == 0
+    assert report["routes"][START_ROUTE]["count"] == 4
+    assert report["routes"][APPROVAL_ROUTE]["count"] == 2
+    assert {"intake", "travel", "approvals"} <= set(report["nodes"])
+    assert report["standIns"]["kafkaMessages"] > 0
+
+    comparison = compare_reports(report, report)
+    assert comparison["overall"]["p50Ms"] == 0.0
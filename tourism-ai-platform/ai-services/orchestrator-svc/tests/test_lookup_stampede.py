@@ -0,0 +1,189 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ai_services.hub_core import RegistryClient, SingleFlight, should_refresh_early
+from ai_services.hub_core import single_flight
+from app.services import HubRegistry, hub_registry
+from app.services.tenant_context import TenantContextService
+
+BOOKING = {
+    "id": "agent-1",
+    "name": "booking",
+    "version": "1",
+    "endpoint": "http://booking-agent",
+}
+TENANT = {"id": "tenant-1", "name": "Tenant 1"}
+
+
+@pytest.fixture
+def registry_client(redis, make_registry_client):
+    def build(handler) -> RegistryClient:
+        return make_registry_client(handler, redis=redis, latency=0.01)
+
+    return build
+
+
+@pytest.fixture
+def stand_in(make_stand_in_registry):
+    return make_stand_in_registry(tenants=[TENANT])
+
+
+async def test_single_flight_shares_result_and_errors():
+    flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    assert await asyncio.gather(*(flight.do("key", load) for _ in range(5))) == [1] * 5
+    assert len(flight) == 0
+
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("registry down")
+
+    results = await asyncio.gather(
+        *(flight.do("key", fail) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_should_refresh_early_bounds(monkeypatch):
+    assert should_refresh_early(0.0, 0.0)
+    assert not should_refresh_early(10.0, 5.0, beta=0.0)
+    monkeypatch.setattr(single_flight.random, "random", lambda: 0.5)
+    assert not should_refresh_early(10.0, 1.0)
+    assert should_refresh_early(0.5, 1.0)
+
+
+async def test_concurrent_tenant_misses_reach_the_registry_once(
+    stand_in, registry_client
+):
+    client = registry_client(stand_in)
+
+    tenants = await asyncio.gather(*(client.get_tenant("tenant-1") for _ in range(20)))
+
+    assert {tenant.name for tenant in tenants} == {"Tenant 1"}
+    assert stand_in.requests == 1
+
+
+async def test_cached_tenant_is_refreshed_early_near_expiry(
+    monkeypatch, stand_in, registry_client
+):
+    client = registry_client(stand_in)
+    await client.get_tenant("tenant-1")
+    await client.get_tenant("tenant-1")
+    assert stand_in.requests == 1
+
+    client._tenant_fetch_seconds = 1000.0
+    monkeypatch.setattr(single_flight.random, "random", lambda: 0.99)
+    await client.get_tenant("tenant-1")
+    assert stand_in.requests == 2
+
+
+async def test_unknown_tenants_are_cached_negatively(stand_in, registry_client):
+    client = registry_client(stand_in)
+    tenants = TenantContextService(
+        context_manager=client._context_manager, registry_client=client
+    )
+
+    assert await tenants.get_tenant("ghost") is None
+    assert await tenants.get_tenant("ghost") is None
+    assert stand_in.requests == 1
+
+    # Another replica finds the negative entry in Redis.
+    peer = registry_client(stand_in)
+    assert await peer.get_tenant("ghost") is None
+    assert await peer.get_tenants(["ghost"]) == {}
+    assert stand_in.requests == 1
+
+
+async def test_agent_maps_load_once_and_unknown_tenants_are_not_retried(
+    registry_client,
+):
+    calls = []
+
+    def handler(request: httpx.Request):
+        tenant = request.headers["X-Tenant"]
+        if request.url.path == "/tenants":
+            return [TENANT]
+        calls.append(tenant)
+        if tenant == "ghost":
+            return httpx.Response(404, json={"detail": "unknown tenant"})
+        return [BOOKING]
+
+    registry = HubRegistry(client=registry_client(handler))
+    await registry.refresh()
+    calls.clear()
+
+    agents = await asyncio.gather(
+        *(registry.list_agents("tenant-1") for _ in range(10))
+    )
+    assert all([agent.name for agent in found] == ["booking"] for found in agents)
+    assert calls == ["tenant-1"]
+
+    assert await registry.list_agents("ghost") == []
+    assert await registry.list_agents("ghost") == []
+    assert calls == ["tenant-1", "ghost"]
+
+
+async def test_idle_and_excess_tenant_maps_are_dropped_not_revalidated(
+    monkeypatch, registry_client
+):
+    calls = []
+
+    def handler(request: httpx.Request):
+        if request.url.path == "/tenants":
+            return []
+        calls.append(request.headers["X-Tenant"])
+        return []
+
+    registry = HubRegistry(
+        client=registry_client(handler), tenant_ttl=60.0, max_tenant_maps=3
+    )
+    await registry.refresh()
+    for index in range(5):
+        assert await registry.list_agents(f"tenant-{index}") == []
+    assert sorted(registry._agents) == ["system", "tenant-2", "tenant-3", "tenant-4"]
+
+    now = hub_registry.time
+    monkeypatch.setattr(hub_registry, "time", lambda: now() + 120.0)
+    await registry.list_agents("tenant-5")
+    calls.clear()
+    await registry.refresh(force=True)
+
+    assert sorted(registry._agents) == ["system", "tenant-5"]
+    assert sorted(registry._loaded_at) == ["system", "tenant-5"]
+    assert set(calls) <= {"system", "tenant-5"}
+
+
+async def test_revalidation_bounds_concurrent_agent_requests(registry_client):
+    def handler(request: httpx.Request):
+        return []
+
+    client = registry_client(handler)
+    registry = HubRegistry(client=client, revalidate_concurrency=2)
+    for index in range(6):
+        await registry.list_agents(f"tenant-{index}")
+
+    in_flight = peak = 0
+    list_agents_if_modified = client.list_agents_if_modified
+
+    async def counted(tenant_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await list_agents_if_modified(tenant_id)
+        finally:
+            in_flight -= 1
+
+    client.list_agents_if_modified = counted
+    await registry.refresh(force=True)
+
+    assert peak == 2
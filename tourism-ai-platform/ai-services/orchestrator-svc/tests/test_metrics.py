@@ -1,5 +1,7 @@
 from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry
 
+from ai_services.hub_core import MetricsCollector
 from app.main import create_app
 
 
@@ -11,3 +13,66 @@ def test_metrics_endpoint_exposes_prometheus_payload():
     assert response.status_code == 200
     body = response.text
     assert "process_cpu_seconds_total" in body
+
+
+def test_client_controlled_labels_fold_into_other():
+    metrics = MetricsCollector(
+        CollectorRegistry(), max_tenants=2, tenant_allowlist=["vip"], max_series=4
+    )
+
+    tenants = [
+        metrics.bounded_labels(
+            "hub_worker_events_total", tenant_id=tenant, outcome="acked"
+        )["tenant_id"]
+        for tenant in ("t-1", "t-2", "t-3", "vip")
+    ]
+    assert tenants == ["t-1", "t-2", "other", "vip"]
+
+    labels = metrics.bounded_labels(
+        "hub_worker_events_total", tenant_id="t-1", outcome="failed"
+    )
+    assert labels == {"tenant_id": "other", "outcome": "failed"}
+    assert (
+        metrics.metrics_folded_total.labels(
+            metric="hub_worker_events_total"
+        )._value.get()
+        == 2
+    )
+
+
+def test_metrics_exposition_is_cached_and_includes_hub_metrics():
+    app = create_app()
+    client = TestClient(app)
+    app.state.metrics.metrics_folded_total.labels(metric="probe").inc()
+
+    first = client.get("/metrics").text
+    app.state.metrics.metrics_folded_total.labels(metric="probe").inc()
+    assert 'metrics_folded_total{metric="probe"} 1.0' in first
+    assert client.get("/metrics").text == first
+
+
+async def test_routed_events_fold_tenants_and_event_types_into_other(
+    make_app, make_event
+):
+    hub = await make_app()
+    metrics = MetricsCollector(CollectorRegistry(), max_tenants=2, max_event_types=2)
+    router = hub.state.hub_router
+    router._metrics = metrics
+    events = [
+        make_event(id=f"evt-{index}", tenantId=f"t-{index}", type=f"custom.{index}")
+        for index in range(6)
+    ]
+
+    await router.route_event(events[0])
+    await router.route_events(events[1:])
+
+    counted = {
+        (sample.labels["tenant_id"], sample.labels["event_type"]): sample.value
+        for sample in metrics.tenant_request_count.collect()[0].samples
+        if sample.name.endswith("_total")
+    }
+    assert counted == {
+        ("t-0", "custom.0"): 1,
+        ("t-1", "custom.1"): 1,
+        ("other", "other"): 4,
+    }
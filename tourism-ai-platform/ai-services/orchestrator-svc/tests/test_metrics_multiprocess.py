@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from prometheus_client import generate_latest
+
+from ai_services.hub_core import cleanup_dead_workers, multiprocess_registry
+from app.config import get_settings
+from app.main import create_app
+
+AI_SERVICES = Path(__file__).resolve().parents[2]
+
+WORKER = """
+import sys
+from ai_services.hub_core import MetricsCollector
+
+metrics = MetricsCollector()
+metrics.tenant_request_count.labels(tenant_id="t-1", agent_name="booking", channel="web", event_type="x").inc(
+    int(sys.argv[1])
+)
+metrics.agent_latency_seconds.labels(agent_name="booking", tenant_id="t-1", event_type="x").observe(0.2)
+metrics.agent_concurrency_limit.labels(agent_name="booking").set(10)
+"""
+
+
+def run_worker(directory: Path, increment: int) -> None:
+    env = {
+        **os.environ,
+        "PROMETHEUS_MULTIPROC_DIR": str(directory),
+        "PYTHONPATH": str(AI_SERVICES),
+    }
+    subprocess.run([sys.executable, "-c", WORKER, str(increment)], env=env, check=True)
+
+
+def test_samples_from_every_worker_are_aggregated_and_dead_gauges_dropped(tmp_path):
+    run_worker(tmp_path, 2)
+    run_worker(tmp_path, 3)
+
+    body = generate_latest(multiprocess_registry(str(tmp_path))).decode()
+    assert (
+        'tenant_request_count_total{agent_name="booking",channel="web",event_type="x",tenant_id="t-1"} 5.0'
+        in body
+    )
+    assert (
+        'agent_latency_seconds_count{agent_name="booking",event_type="x",tenant_id="t-1"} 2.0'
+        in body
+    )
+    assert 'agent_concurrency_limit{agent_name="booking"} 20.0' in body
+
+    assert cleanup_dead_workers(str(tmp_path)) == 2
+    body = generate_latest(multiprocess_registry(str(tmp_path))).decode()
+    assert "tenant_request_count_total" in body
+    assert 'agent_concurrency_limit{agent_name="booking"}' not in body
+
+
+def test_each_worker_admits_its_share_of_the_label_bounds(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+    monkeypatch.setenv("METRICS_MAX_TENANTS", "4")
+    get_settings.cache_clear()
+    try:
+        metrics = create_app().state.metrics
+    finally:
+        get_settings.cache_clear()
+
+    tenants = [
+        metrics.bounded_labels("hub_worker_events_total", tenant_id=tenant)["tenant_id"]
+        for tenant in ("t-1", "t-2", "t-3")
+    ]
+    assert tenants == ["t-1", "t-2", "other"]
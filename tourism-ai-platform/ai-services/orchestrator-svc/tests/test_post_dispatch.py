@@ -0,0 +1,164 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ai_services.hub_core import MetricsCollector
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+from app.services import PostDispatchPipeline
+
+AGENT = {"id": "agent-1", "name": "booking", "endpoint": "http://booking-agent"}
+
+
+async def test_work_keeps_per_key_order_and_counts_failures():
+    metrics = MetricsCollector(registry=None)
+    pipeline = PostDispatchPipeline(workers=2, max_queue=4, metrics=metrics)
+    await pipeline.start()
+    done = []
+
+    def job(key, index, delay):
+        async def work():
+            await asyncio.sleep(delay)
+            if index == 1 and key == "b":
+                raise RuntimeError("redis down")
+            done.append((key, index))
+
+        return work
+
+    for index, delay in enumerate((0.03, 0.01, 0.0)):
+        for key in ("a", "b"):
+            await pipeline.submit(key, "session", job(key, index, delay))
+    await pipeline.stop()
+
+    assert [index for key, index in done if key == "a"] == [0, 1, 2]
+    assert [index for key, index in done if key == "b"] == [0, 2]
+    assert (
+        metrics.post_dispatch_tasks_total.labels(
+            step="session", result="failed"
+        )._value.get()
+        == 1
+    )
+    assert pipeline.depth() == 0
+
+
+async def test_agent_result_returns_before_side_effects_unless_sync_session(
+    make_app, make_event
+):
+    hub = await make_app(agents=[AGENT])
+    app = hub.app
+    await hub.use_agents(
+        lambda request: httpx.Response(
+            200, json={"session": {"step": request.url.path}}
+        )
+    )
+
+    executor = app.state.agent_executor
+    await executor.post_dispatch.start()
+
+    release = asyncio.Event()
+    emitted = []
+    emit = app.state.event_bus.emit_agent_response
+
+    async def blocked_emit(**kwargs):
+        await release.wait()
+        emitted.append(kwargs["correlation_id"])
+        await emit(**kwargs)
+
+    app.state.event_bus.emit_agent_response = blocked_emit
+    tenant_context = app.state.tenant_context
+    agent = AgentSchema.model_validate(AGENT)
+
+    async def run(session_id, metadata):
+        event = make_event(sessionId=session_id, metadata=metadata)
+        return await asyncio.wait_for(
+            executor.execute(
+                agent=agent, tenant_id=event.tenant_id, payload={}, event=event
+            ),
+            timeout=1,
+        )
+
+    await run("s-async", {})
+    # A session on another shard than s-async, whose response is still blocked.
+    await run("s-inline", {"syncSession": True})
+    assert await tenant_context.get_session_state("bench-tenant-0", "s-inline") == {
+        "step": "/run"
+    }
+    assert emitted == []
+
+    release.set()
+    await executor.post_dispatch.drain()
+    assert await tenant_context.get_session_state("bench-tenant-0", "s-async") == {
+        "step": "/run"
+    }
+    assert emitted == ["evt-0", "evt-0"]
+    await executor.close()
+
+
+async def test_run_waits_behind_queued_work_for_the_key_and_raises_failures():
+    pipeline = PostDispatchPipeline(workers=2, max_queue=4)
+    await pipeline.start()
+    release = asyncio.Event()
+    writes = []
+
+    async def older():
+        await release.wait()
+        writes.append("older")
+
+    async def sync():
+        writes.append("sync")
+
+    async def broken():
+        raise RuntimeError("redis down")
+
+    await pipeline.submit("s-1", "session", older)
+    waiting = asyncio.create_task(pipeline.run("s-1", "session", sync))
+    await asyncio.sleep(0.01)
+    assert not waiting.done() and writes == []
+
+    release.set()
+    await asyncio.wait_for(waiting, timeout=1)
+    assert writes == ["older", "sync"]
+
+    with pytest.raises(RuntimeError, match="redis down"):
+        await pipeline.run("s-1", "session", broken)
+    await pipeline.stop()
+
+
+async def test_sync_session_write_lands_after_writes_already_queued(
+    make_app, make_event
+):
+    hub = await make_app(agents=[AGENT])
+    app = hub.app
+    await hub.use_agents(
+        lambda request: httpx.Response(200, json={"session": {"step": "sync"}})
+    )
+    executor = app.state.agent_executor
+    await executor.post_dispatch.start()
+    tenant_context = app.state.tenant_context
+    release = asyncio.Event()
+
+    async def older_write():
+        await release.wait()
+        await tenant_context.update_session_state(
+            "bench-tenant-0", "s-1", {"step": "older"}
+        )
+
+    await executor.post_dispatch.submit("bench-tenant-0:s-1", "session", older_write)
+    event = make_event(sessionId="s-1", metadata={"syncSession": True})
+    running = asyncio.create_task(
+        executor.execute(
+            agent=AgentSchema.model_validate(AGENT),
+            tenant_id=event.tenant_id,
+            payload={},
+            event=event,
+        )
+    )
+    await asyncio.sleep(0.05)
+    assert not running.done()
+
+    release.set()
+    await asyncio.wait_for(running, timeout=1)
+    assert await tenant_context.get_session_state("bench-tenant-0", "s-1") == {
+        "step": "sync"
+    }
+    await executor.close()
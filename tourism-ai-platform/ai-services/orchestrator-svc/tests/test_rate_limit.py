@@ -0,0 +1,91 @@
+from app.services import RateLimit, TenantRateLimiter
+
+DEFAULTS = {
+    "events": RateLimit(rate=1, burst=4),
+    "default": RateLimit(rate=100, burst=100),
+}
+
+
+async def test_tenant_is_limited_with_retry_after_and_registry_overrides(
+    make_app, make_events
+):
+    hub = await make_app(
+        tenants=[
+            {
+                "id": "vip",
+                "metadata": {"rateLimits": {"events": {"rate": 100, "burst": 50}}},
+            }
+        ],
+    )
+    app = hub.app
+    app.state.rate_limiter = TenantRateLimiter(
+        context_manager=app.state.context_manager,
+        defaults=DEFAULTS,
+        tenant_resolver=app.state.tenant_context.get_tenant,
+    )
+    event = make_events(1)[0]
+
+    async with hub.client() as client:
+        statuses = []
+        for _ in range(6):
+            response = await client.post(
+                "/hub/events/publish", json=event, headers={"X-Tenant": "noisy"}
+            )
+            statuses.append(response.status_code)
+        assert statuses == [200] * 4 + [429] * 2
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.headers["X-Tenant"] == "noisy"
+
+        vip = [
+            (
+                await client.post(
+                    "/hub/events/publish", json=event, headers={"X-Tenant": "vip"}
+                )
+            ).status_code
+            for _ in range(10)
+        ]
+        assert vip == [200] * 10
+        assert (
+            await client.get("/health", headers={"X-Tenant": "noisy"})
+        ).status_code == 200
+
+    assert await hub.redis.get("noisy:hub:ratelimit:events") is not None
+
+
+async def test_replicas_share_the_limit_and_lease_locally(make_app):
+    hub = await make_app()
+    app, redis = hub.app, hub.redis
+    limits = {"default": RateLimit(rate=1, burst=16)}
+    replicas = [
+        TenantRateLimiter(
+            context_manager=app.state.context_manager, defaults=limits, lease_size=4
+        )
+        for _ in range(2)
+    ]
+
+    commands = redis.commands
+    allowed = 0
+    for index in range(24):
+        decision = await replicas[index % 2].check("tenant-1", "default")
+        allowed += decision.allowed
+    assert allowed == 16
+    assert redis.commands - commands < 16  # leased tokens are served without Redis
+
+
+async def test_leases_and_policies_stay_bounded(make_context_manager):
+    limiter = TenantRateLimiter(
+        context_manager=make_context_manager(),
+        defaults={"default": RateLimit(rate=100, burst=16)},
+        lease_size=4,
+        max_tenants=3,
+    )
+
+    for index in range(20):
+        assert (await limiter.check(f"tenant-{index}", "default")).allowed
+    assert len(limiter._policies) == 3
+    assert len(limiter._leases) <= 3 * 4
+
+    # Spending the rest of a lease drops it instead of keeping an empty entry.
+    for _ in range(3):
+        await limiter.check("tenant-19", "default")
+    assert limiter._leases.get(("tenant-19", "default")) is None
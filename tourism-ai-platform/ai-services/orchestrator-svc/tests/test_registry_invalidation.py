@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import pytest
+
+from ai_services.hub_core import MetricsCollector
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+from app.services import HubRegistry
+
+BOOKING = {
+    "id": "agent-1",
+    "name": "booking",
+    "version": "1",
+    "endpoint": "http://booking-agent",
+}
+
+
+@pytest.fixture
+def stand_in(make_stand_in_registry):
+    return make_stand_in_registry(agents=[BOOKING])
+
+
+@pytest.fixture
+def replica(stand_in, make_context_manager, make_registry_client):
+    """Hub registries sharing the stand-in registry and the test's Redis."""
+
+    def build(**kwargs) -> HubRegistry:
+        return HubRegistry(
+            client=make_registry_client(stand_in),
+            context_manager=make_context_manager(),
+            **kwargs,
+        )
+
+    return build
+
+
+async def settle() -> None:
+    await asyncio.sleep(0.02)
+
+
+async def test_sync_agent_invalidates_tenant_maps_on_every_replica(replica):
+    metrics = MetricsCollector(registry=None)
+    origin, peer = replica(), replica(metrics=metrics)
+    for registry in (origin, peer):
+        await registry.start()
+        assert (await registry.get_agent("booking", "bench-tenant-0")).version == "1"
+    await settle()
+
+    await origin.sync_agent(AgentSchema.model_validate({**BOOKING, "version": "2"}))
+    await settle()
+
+    assert origin.version == peer.version == 1
+    assert (await peer.get_agent("booking", "bench-tenant-0")).version == "2"
+    assert (await peer.get_agent("booking")).version == "2"
+    assert (
+        metrics.registry_invalidations_total.labels(source="remote")._value.get() == 1
+    )
+    await origin.stop()
+    await peer.stop()
+
+
+async def test_missed_broadcast_triggers_full_revalidation(redis, stand_in, replica):
+    metrics = MetricsCollector(registry=None)
+    peer = replica(metrics=metrics)
+    await peer.start()
+    await peer.refresh(force=True)
+    await settle()
+
+    stand_in.agents[0] = {**BOOKING, "version": "3"}
+    await redis.set("hub:registry:version", 2)
+    await redis.publish(
+        "hub:registry:invalidate",
+        json.dumps(
+            {
+                "origin": "other",
+                "version": 2,
+                "scope": "agents",
+                "tenants": ["unrelated"],
+            }
+        ),
+    )
+    await settle()
+
+    assert metrics.registry_invalidations_total.labels(source="gap")._value.get() == 1
+    assert (await peer.get_agent("booking")).version == "3"
+    await peer.stop()
+
+
+async def test_tenant_maps_expire_after_their_ttl(stand_in, replica):
+    registry = replica(tenant_ttl=0)
+    await registry.get_agent("booking", "bench-tenant-0")
+
+    stand_in.agents[0] = {**BOOKING, "version": "2"}
+    assert (
+        await registry.get_agent("booking", "bench-tenant-0")
+    ).version == "1"  # stale, reloading
+    await settle()
+    assert (await registry.get_agent("booking", "bench-tenant-0")).version == "2"
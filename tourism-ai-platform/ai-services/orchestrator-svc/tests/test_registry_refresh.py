@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ai_services.hub_core import MetricsCollector, RegistryClient
+from app.services import HubRegistry
+
+AGENTS = [
+    {
+        "id": "agent-1",
+        "name": "booking",
+        "version": "1",
+        "endpoint": "http://booking-agent",
+    },
+    {
+        "id": "agent-2",
+        "name": "flights",
+        "version": "1",
+        "endpoint": "http://flights-agent",
+    },
+]
+
+
+@pytest.fixture
+def stand_in(make_stand_in_registry):
+    return make_stand_in_registry(agents=AGENTS, tenants=[{"id": "bench-tenant-0"}])
+
+
+@pytest.fixture
+def registry_client(stand_in, make_registry_client):
+    """Registry clients that wait ``delay["seconds"]`` and record response statuses."""
+
+    def build(delay: dict, statuses: list) -> RegistryClient:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(delay["seconds"])
+            response = stand_in(request)
+            statuses.append(response.status_code)
+            return response
+
+        return make_registry_client(handler)
+
+    return build
+
+
+async def test_stale_lookups_answer_from_cache_while_revalidating(
+    stand_in, registry_client
+):
+    delay = {"seconds": 0}
+    statuses = []
+    registry = HubRegistry(client=registry_client(delay, statuses), refresh_interval=0)
+    assert (await registry.get_agent("booking")).version == "1"
+
+    delay["seconds"] = 1
+    stand_in.agents[0] = {**AGENTS[0], "version": "2"}
+    agent = await asyncio.wait_for(registry.get_agent("booking"), timeout=0.1)
+
+    assert agent.version == "1"
+    await registry.stop()
+
+
+async def test_revalidation_uses_etags_and_notifies_only_changed_agents(
+    stand_in, registry_client
+):
+    statuses = []
+    metrics = MetricsCollector(registry=None)
+    registry = HubRegistry(
+        client=registry_client({"seconds": 0}, statuses), metrics=metrics
+    )
+    notified = []
+
+    async def listener(agents):
+        notified.append([agent.name for agent in agents])
+
+    registry.add_agents_listener(listener)
+    await registry.refresh(force=True)
+    tenant = await registry.get_tenant("bench-tenant-0")
+    flights = await registry.get_agent("flights")
+
+    statuses.clear()
+    await registry.refresh(force=True)
+    assert statuses == [304, 304]
+
+    stand_in.agents[0] = {**AGENTS[0], "version": "2"}
+    await registry.refresh(force=True)
+    await asyncio.sleep(0)
+
+    assert notified == [["booking", "flights"], ["booking"]]
+    assert (await registry.get_agent("booking")).version == "2"
+    assert await registry.get_agent("flights") is flights
+    assert await registry.get_tenant("bench-tenant-0") is tenant
+    assert (
+        metrics.registry_refresh_total.labels(result="not_modified")._value.get() == 1
+    )
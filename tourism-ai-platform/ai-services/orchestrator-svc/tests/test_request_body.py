@@ -0,0 +1,29 @@
+import json
+
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+from app.services.request_body import RequestBodyEncoder
+from benchmarks.request_body import build_inputs, legacy_body
+
+
+def test_encoded_body_matches_the_legacy_body():
+    inputs = build_inputs(capabilities=3)
+    encoder = RequestBodyEncoder()
+
+    assert json.loads(encoder.encode(**inputs)) == json.loads(legacy_body(**inputs))
+    assert json.loads(encoder.encode(**{**inputs, "tenant": None}))["tenant"] == {
+        "id": inputs["tenant_id"]
+    }
+
+
+def test_agent_fragment_is_reused_until_the_version_changes():
+    agent = build_inputs(capabilities=3)["agent"]
+    encoder = RequestBodyEncoder()
+    fragment = encoder.agent_fragment(agent)
+
+    refreshed = AgentSchema.model_validate(agent.model_dump())
+    assert encoder.agent_fragment(refreshed) is fragment
+
+    upgraded = AgentSchema.model_validate(
+        {**agent.model_dump(), "version": "2", "capabilities": []}
+    )
+    assert json.loads(encoder.agent_fragment(upgraded))["capabilities"] == []
@@ -0,0 +1,103 @@
+import asyncio
+
+import httpx
+
+import pytest
+
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+from app.services import AgentResponseCache
+
+AGENT = {
+    "id": "agent-1",
+    "name": "catalog",
+    "version": "1",
+    "endpoint": "http://catalog-agent",
+    "capabilities": [
+        {"name": "lookup", "cacheable": True, "cacheTtl": 60},
+        {"name": "book"},
+    ],
+}
+
+
+@pytest.fixture
+def build_app(make_app):
+    async def build(calls: list):
+        hub = await make_app(agents=[AGENT])
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/run":
+                calls.append(request)
+                await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"answer": len(calls)})
+
+        await hub.use_agents(handler)
+        return hub.app
+
+    return build
+
+
+@pytest.fixture
+def run(make_event):
+    async def execute(app, agent: AgentSchema, capability: str):
+        payload = {"capability": capability, "city": "Lisbon"}
+        event = make_event(payload=payload)
+        return await app.state.agent_executor.execute(
+            agent=agent, tenant_id=event.tenant_id, payload=payload, event=event
+        )
+
+    return execute
+
+
+async def test_cacheable_capability_calls_the_agent_once(build_app, run):
+    calls = []
+    app = await build_app(calls)
+    agent = AgentSchema.model_validate(AGENT)
+
+    results = await asyncio.gather(*(run(app, agent, "lookup") for _ in range(5)))
+    results.append(await run(app, agent, "lookup"))
+    await run(app, agent, "book")
+    await run(app, agent, "book")
+
+    assert len(calls) == 3
+    assert all(result == results[0] for result in results)
+
+
+async def test_new_agent_version_misses_the_cache(build_app, run):
+    calls = []
+    app = await build_app(calls)
+    agent = AgentSchema.model_validate(AGENT)
+    await run(app, agent, "lookup")
+
+    upgraded = AgentSchema.model_validate({**AGENT, "version": "2"})
+    await app.state.response_cache.observe_agents([upgraded])
+    await run(app, upgraded, "lookup")
+
+    assert len(calls) == 2
+
+
+async def test_concurrent_misses_share_one_computation(make_context_manager):
+    cache = AgentResponseCache(context_manager=make_context_manager())
+    agent = AgentSchema.model_validate(AGENT)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"answer": len(calls)}
+
+    lookups = [
+        cache.get_or_compute(
+            agent=agent,
+            tenant_id="tenant-1",
+            capability="lookup",
+            payload={"city": "Lisbon"},
+            ttl=60,
+            compute=compute,
+        )
+        for _ in range(4)
+    ]
+    results = await asyncio.gather(*lookups)
+
+    assert calls == [1]
+    assert sorted(source for _, source in results) == ["agent", *["shared"] * 3]
+    assert all(result == {"answer": 1} for result, _ in results)
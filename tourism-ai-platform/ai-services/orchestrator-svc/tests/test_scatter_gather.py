@@ -0,0 +1,72 @@
+import asyncio
+
+import httpx
+import pytest
+
+AGENTS = [
+    {"id": "agent-1", "name": "booking", "endpoint": "http://booking-agent"},
+    {
+        "id": "agent-2",
+        "name": "flights",
+        "endpoint": "http://flights-agent",
+        "capabilities": [{"name": "travel"}],
+    },
+    {
+        "id": "agent-3",
+        "name": "hotels",
+        "endpoint": "http://hotels-agent",
+        "capabilities": [{"name": "travel"}],
+    },
+]
+
+
+@pytest.fixture
+def build_app(make_app):
+    async def build(delays):
+        hub = await make_app(agents=AGENTS)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            agent = request.headers["X-Agent-Name"]
+            await asyncio.sleep(delays.get(agent, 0))
+            return httpx.Response(200, json={agent: True, "answeredBy": agent})
+
+        await hub.use_agents(handler)
+        return hub.app
+
+    return build
+
+
+async def test_scatter_returns_partial_results_at_the_shared_deadline(
+    build_app, make_event
+):
+    app = await build_app({"hotels": 5})
+    event = make_event(
+        targetAgents=["booking", "missing"],
+        targetCapability="travel",
+        metadata={"scatter": {"timeout": 0.2, "merge": "shallow"}},
+    )
+
+    result = await asyncio.wait_for(app.state.hub_router.route_event(event), timeout=1)
+
+    assert result["status"] == "partial"
+    assert {name: outcome["status"] for name, outcome in result["agents"].items()} == {
+        "booking": "completed",
+        "flights": "completed",
+        "hotels": "timeout",
+        "missing": "unknown",
+    }
+    assert result["result"]["booking"] and result["result"]["flights"]
+    assert "hotels" not in result["result"]
+
+
+async def test_scatter_quorum_returns_the_first_answer(build_app, make_event):
+    app = await build_app({"booking": 5, "hotels": 5})
+    event = make_event(
+        targetAgents=["booking", "flights", "hotels"],
+        metadata={"scatter": {"quorum": 1, "merge": "first"}},
+    )
+
+    result = await asyncio.wait_for(app.state.hub_router.route_event(event), timeout=1)
+
+    assert result["result"]["answeredBy"] == "flights"
+    assert result["agents"]["booking"] == {"status": "cancelled"}
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from ai_services.hub_core import ContextManager
+from ai_services.interfaces.schemas.agent_schema import AgentSchema
+from app.config import get_settings
+
+
+@pytest.fixture
+def build_manager(make_context_manager):
+    def build(**kwargs) -> ContextManager:
+        return make_context_manager(session_storage="hash", **kwargs)
+
+    return build
+
+
+@pytest.fixture
+def hash_sessions(monkeypatch):
+    monkeypatch.setenv("HUB_SESSION_STORAGE", "hash")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+async def test_concurrent_patches_touch_only_their_fields(build_manager):
+    manager = build_manager()
+    await manager.set_session_context("tenant-1", "s-1", {"step": 1, "cart": ["a"]})
+
+    await asyncio.gather(
+        manager.patch_session_context("tenant-1", "s-1", {"step": 2}),
+        manager.patch_session_context(
+            "tenant-1", "s-1", {"locale": "tr", "cart": None}
+        ),
+    )
+
+    assert await manager.get_session_context("tenant-1", "s-1") == {
+        "step": 2,
+        "locale": "tr",
+    }
+
+
+async def test_increment_and_append_are_atomic_helpers(build_manager):
+    manager = build_manager()
+
+    await asyncio.gather(
+        *(manager.increment_session_field("tenant-1", "s-1", "turns") for _ in range(5))
+    )
+    for index in range(4):
+        await manager.append_session_field(
+            "tenant-1", "s-1", "history", {"turn": index}, max_items=3
+        )
+
+    context = await manager.get_session_context("tenant-1", "s-1")
+    assert context["turns"] == 5
+    assert context["history"] == [{"turn": 1}, {"turn": 2}, {"turn": 3}]
+
+
+async def test_sliding_ttl_and_legacy_documents(
+    redis, make_context_manager, build_manager
+):
+    legacy = make_context_manager()
+    await legacy.set_session_context("tenant-1", "s-1", {"step": 1}, ttl=5)
+
+    manager = build_manager(session_sliding_ttl=600)
+    assert await manager.get_session_context("tenant-1", "s-1") == {"step": 1}
+
+    await manager.patch_session_context("tenant-1", "s-2", {"step": 1}, ttl=5)
+    await manager.get_session_context("tenant-1", "s-2")
+    key = manager._session_hash_key("tenant-1", "s-2")
+    assert redis._expiry[key] - time.monotonic() > 500
+    assert await manager.touch_session_context("tenant-1", "missing") is False
+
+
+async def test_first_field_write_moves_legacy_documents_into_the_hash(
+    redis, make_context_manager, build_manager
+):
+    legacy = make_context_manager()
+    for session in ("s-1", "s-2", "s-3"):
+        await legacy.set_session_context("tenant-1", session, {"a": 1, "b": []})
+    manager = build_manager()
+
+    await manager.patch_session_context("tenant-1", "s-1", {"c": 3, "a": None})
+    await manager.increment_session_field("tenant-1", "s-2", "a")
+    await manager.append_session_field("tenant-1", "s-3", "b", "x")
+
+    assert await manager.get_session_context("tenant-1", "s-1") == {"b": [], "c": 3}
+    assert await manager.get_session_context("tenant-1", "s-2") == {"a": 2, "b": []}
+    assert await manager.get_session_context("tenant-1", "s-3") == {"a": 1, "b": ["x"]}
+    assert await redis.get(manager._session_key("tenant-1", "s-1")) is None
+    assert 0 < await redis.pttl(manager._session_hash_key("tenant-1", "s-1"))
+
+
+def test_unknown_session_storage_is_rejected():
+    with pytest.raises(ValueError):
+        ContextManager("redis://unused", session_storage="msgpack")
+
+
+async def test_concurrent_agent_runs_keep_each_others_session_fields(
+    hash_sessions, make_app, make_event
+):
+    agent = {"id": "agent-1", "name": "booking", "endpoint": "http://booking-agent"}
+    hub = await make_app(agents=[agent])
+    tenant_context = hub.state.tenant_context
+    await tenant_context.set_session_state("bench-tenant-0", "s-1", {"step": 1})
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return httpx.Response(
+            200, json={"session": json.loads(request.content)["payload"]}
+        )
+
+    await hub.use_agents(handler)
+    executor = hub.state.agent_executor
+
+    async def run(changes):
+        event = make_event(sessionId="s-1", metadata={"syncSession": True})
+        await executor.execute(
+            agent=AgentSchema.model_validate(agent),
+            tenant_id=event.tenant_id,
+            payload=changes,
+            event=event,
+        )
+
+    await asyncio.gather(run({"locale": "tr"}), run({"budget": 1200}))
+
+    assert await tenant_context.get_session_state("bench-tenant-0", "s-1") == {
+        "step": 1,
+        "locale": "tr",
+        "budget": 1200,
+    }
+    await executor.close()
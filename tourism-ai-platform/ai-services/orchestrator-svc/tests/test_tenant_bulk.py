@@ -0,0 +1,55 @@
+import pytest
+
+from app.services.tenant_context import TenantContextService
+
+TENANTS = [{"id": f"tenant-{index}", "name": f"Tenant {index}"} for index in range(50)]
+
+
+@pytest.fixture
+def stand_in(make_stand_in_registry):
+    return make_stand_in_registry(tenants=TENANTS)
+
+
+@pytest.fixture
+def service(redis, stand_in, make_registry_client):
+    def build() -> TenantContextService:
+        client = make_registry_client(stand_in, redis=redis)
+        return TenantContextService(
+            context_manager=client._context_manager, registry_client=client
+        )
+
+    return build
+
+
+async def test_warm_tenants_batches_registry_and_redis_round_trips(
+    redis, stand_in, service
+):
+    tenants = service()
+    wanted = [tenant["id"] for tenant in TENANTS] + ["tenant-missing"]
+
+    warmed = await tenants.warm_tenants(wanted)
+
+    assert sorted(warmed) == sorted(tenant["id"] for tenant in TENANTS)
+    assert stand_in.requests == 1
+    # context MGET, registry-cache MGET, registry-cache pipeline, context pipeline
+    assert redis.commands == 4
+
+    commands = redis.commands
+    assert (await tenants.get_tenant("tenant-7")).name == "Tenant 7"
+    assert redis.commands == commands
+
+
+async def test_get_tenants_serves_other_replicas_from_one_mget(
+    redis, stand_in, service
+):
+    await service().warm_tenants(tenant["id"] for tenant in TENANTS)
+    requests, commands = stand_in.requests, redis.commands
+
+    found = await service().get_tenants(["tenant-1", "tenant-2", "tenant-1"])
+
+    assert {tenant_id: tenant.name for tenant_id, tenant in found.items()} == {
+        "tenant-1": "Tenant 1",
+        "tenant-2": "Tenant 2",
+    }
+    assert stand_in.requests == requests
+    assert redis.commands == commands + 1
@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+
+from fastapi import FastAPI
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, StreamingResponse
+
+from app.middleware.tenant_context import TenantContextMiddleware
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(TenantContextMiddleware)
+
+    @app.get("/ping")
+    async def ping(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(request.state.tenant_id)
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            for index in range(3):
+                yield f"data: {index}\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
+
+
+async def test_tenant_state_and_header():
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        tagged = await client.get("/ping", headers={"X-Tenant": "tenant-1"})
+        default = await client.get("/ping")
+        streamed = await client.get("/stream", headers={"X-Tenant": "tenant-1"})
+
+    assert tagged.text == "tenant-1"
+    assert tagged.headers["X-Tenant"] == "tenant-1"
+    assert default.text == "system"
+    assert default.headers.get_list("X-Tenant") == ["system"]
+    assert streamed.text.count("data:") == 3
+    assert streamed.headers["X-Tenant"] == "tenant-1"
+
+
+async def test_streaming_chunks_are_forwarded_before_the_body_completes():
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"x-tenant", b"set-by-app")],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": b"data: first\n\n",
+                "more_body": True,
+            }
+        )
+        await release.wait()
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+        if message.get("body") == b"data: first\n\n":
+            release.set()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    scope = {"type": "http", "method": "GET", "path": "/events", "headers": []}
+    await asyncio.wait_for(
+        TenantContextMiddleware(app)(scope, receive, send), timeout=1
+    )
+
+    assert [message["type"] for message in messages] == [
+        "http.response.start",
+        "http.response.body",
+        "http.response.body",
+    ]
+    assert messages[0]["headers"] == [(b"x-tenant", b"set-by-app")]
+    assert scope["state"]["tenant_id"] == "system"
@@ -0,0 +1,167 @@
+import asyncio
+import math
+from time import perf_counter
+
+from ai_services.hub_core import MetricsCollector
+from ai_services.interfaces.schemas.tenant_schema import TenantSchema
+from app.services import TenantPolicy, TenantScheduler
+
+SERVICE_TIME = 0.005
+
+
+def p99(samples):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(0.99 * len(ordered)) - 1)]
+
+
+async def simulate(admit) -> dict:
+    """A noisy tenant floods 200 executions, then three small tenants send 10 each."""
+
+    latencies = {}
+
+    async def request(tenant_id: str) -> None:
+        started = perf_counter()
+        await admit(tenant_id)
+        latencies.setdefault(tenant_id, []).append(perf_counter() - started)
+
+    noisy = [asyncio.create_task(request("noisy")) for _ in range(200)]
+    await asyncio.sleep(0)
+    small = [asyncio.create_task(request(f"small-{n % 3}")) for n in range(30)]
+    await asyncio.gather(*noisy, *small)
+    return latencies
+
+
+async def test_small_tenants_keep_bounded_p99_under_noisy_neighbor():
+    fifo = asyncio.Semaphore(4)
+
+    async def admit_fifo(tenant_id: str) -> None:
+        async with fifo:
+            await asyncio.sleep(SERVICE_TIME)
+
+    scheduler = TenantScheduler(max_concurrency=4, tenant_concurrency=None)
+
+    async def admit_fair(tenant_id: str) -> None:
+        await scheduler.run(tenant_id, lambda: asyncio.sleep(SERVICE_TIME))
+
+    fifo_latencies = await simulate(admit_fifo)
+    fair_latencies = await simulate(admit_fair)
+
+    def small_p99(latencies):
+        return p99(
+            [
+                value
+                for tenant, values in latencies.items()
+                if tenant != "noisy"
+                for value in values
+            ]
+        )
+
+    # Equal weights: 10 requests per small tenant need ~10 rounds of 4 tenants over 4 slots.
+    assert small_p99(fair_latencies) < 25 * SERVICE_TIME
+    assert small_p99(fair_latencies) * 3 < small_p99(fifo_latencies)
+    assert scheduler.inflight == 0
+
+
+async def test_weights_and_caps_come_from_tenant_metadata():
+    tenants = {
+        "gold": TenantSchema(id="gold", metadata={"scheduling": {"weight": 3}}),
+        "capped": TenantSchema(
+            id="capped", metadata={"scheduling": {"maxConcurrency": 1}}
+        ),
+    }
+
+    async def resolve(tenant_id: str):
+        return tenants.get(tenant_id)
+
+    metrics = MetricsCollector()
+    scheduler = TenantScheduler(
+        max_concurrency=1, tenant_resolver=resolve, metrics=metrics
+    )
+    order = []
+
+    async def job(tenant_id: str) -> None:
+        async with scheduler.slot(tenant_id):
+            order.append(tenant_id)
+            await asyncio.sleep(0)
+
+    blocker = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot("bronze"):
+            await blocker.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    jobs = [
+        asyncio.create_task(job(tenant)) for tenant in ["bronze"] * 8 + ["gold"] * 8
+    ]
+    await asyncio.sleep(0)
+    assert metrics.scheduler_queue_depth.labels(tenant_id="gold")._value.get() == 8
+    blocker.set()
+    await asyncio.gather(holder, *jobs)
+
+    first_twelve = order[:12]
+    assert first_twelve.count("gold") >= 2 * first_twelve.count("bronze")
+    assert TenantPolicy.from_tenant(tenants["capped"]).max_concurrency == 1
+    assert TenantPolicy.from_tenant(None) == TenantPolicy()
+
+
+async def test_cancelled_waiters_release_their_place():
+    scheduler = TenantScheduler(max_concurrency=1)
+    gate = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot("a"):
+            await gate.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(scheduler.run("b", lambda: asyncio.sleep(0)))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert scheduler.queue_depth("b") == 0
+    gate.set()
+    await holder
+    assert await scheduler.run("b", lambda: asyncio.sleep(0, result="ok")) == "ok"
+    assert scheduler.inflight == 0
+
+
+async def test_idle_tenants_leave_no_queue_state_and_policies_are_bounded():
+    async def resolve(tenant_id: str):
+        return TenantSchema(id=tenant_id)
+
+    scheduler = TenantScheduler(
+        max_concurrency=2, tenant_resolver=resolve, max_policies=8
+    )
+
+    await asyncio.gather(
+        *(
+            scheduler.run(f"tenant-{index}", lambda: asyncio.sleep(0))
+            for index in range(50)
+        )
+    )
+
+    assert not scheduler._queues and not scheduler._deficits
+    assert not scheduler._inflight and not scheduler._ring
+    assert len(scheduler._policies) == 8
+
+
+async def test_new_tenant_is_admitted_while_a_capped_tenant_waits():
+    scheduler = TenantScheduler(max_concurrency=8, tenant_concurrency=1)
+    release = asyncio.Event()
+
+    async def hold():
+        await release.wait()
+
+    noisy = [asyncio.create_task(scheduler.run("noisy", hold)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert scheduler.inflight == 1
+
+    admitted = await asyncio.wait_for(
+        scheduler.run("new", lambda: asyncio.sleep(0, "done")), timeout=0.1
+    )
+
+    assert admitted == "done"
+    release.set()
+    await asyncio.gather(*noisy)
@@ -1,5 +1,5 @@
 import { ApiProperty, ApiPropertyOptional } from '@nestjs/swagger';
-import { IsArray, IsOptional, IsString, IsUrl, ValidateNested } from 'class-validator';
+import { IsArray, IsBoolean, IsNumber, IsOptional, IsPositive, IsString, IsUrl, ValidateNested } from 'class-validator';
 import { Type } from 'class-transformer';
 
 export class AgentCapabilityDto {
@@ -16,6 +16,17 @@ export class AgentCapabilityDto {
   @IsOptional()
   @IsString()
   version?: string;
+
+  @ApiPropertyOptional({ description: 'Read-only capability whose results the orchestrator may cache per payload' })
+  @IsOptional()
+  @IsBoolean()
+  cacheable?: boolean;
+
+  @ApiPropertyOptional({ description: 'Cache lifetime in seconds for cacheable capabilities', example: 300 })
+  @IsOptional()
+  @IsNumber()
+  @IsPositive()
+  cacheTtl?: number;
 }
 
 export class AgentDto {
@@ -31,6 +42,12 @@ export class AgentDto {
   @IsUrl()
   endpoint!: string;
 
+  @ApiPropertyOptional({ description: 'Additional replica endpoints load-balanced with the primary endpoint' })
+  @IsOptional()
+  @IsArray()
+  @IsUrl({}, { each: true })
+  endpoints?: string[];
+
   @ApiPropertyOptional({ description: 'Display friendly name for UI surfaces' })
   @IsOptional()
   @IsString()
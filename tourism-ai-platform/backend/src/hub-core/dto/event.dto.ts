@@ -1,6 +1,6 @@
 import { ApiProperty, ApiPropertyOptional } from '@nestjs/swagger';
 import { Type } from 'class-transformer';
-import { IsDate, IsObject, IsOptional, IsString } from 'class-validator';
+import { IsArray, IsDate, IsObject, IsOptional, IsString } from 'class-validator';
 
 export class HubEventDto {
   @ApiProperty({ description: 'Unique identifier for the event', example: 'evt-01HY4YAYZ6S9C8' })
@@ -29,6 +29,20 @@ export class HubEventDto {
   @IsString()
   targetAgent?: string;
 
+  @ApiPropertyOptional({
+    description: 'Agents that should all handle the event concurrently (scatter-gather)',
+    example: ['booking-agent', 'flight-tracking-agent'],
+  })
+  @IsOptional()
+  @IsArray()
+  @IsString({ each: true })
+  targetAgents?: string[];
+
+  @ApiPropertyOptional({ description: 'Dispatch to every agent advertising this capability', example: 'travel-planning' })
+  @IsOptional()
+  @IsString()
+  targetCapability?: string;
+
   @ApiPropertyOptional({ description: 'Conversation/interaction channel', example: 'whatsapp' })
   @IsOptional()
   @IsString()